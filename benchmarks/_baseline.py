@@ -0,0 +1,54 @@
+"""Run a benchmark again on another checkout of the repository, as baseline.
+
+Make the checkout with ``git worktree add ../button-plus-baseline <commit>``
+and pass its path as ``--baseline``. The benchmark script runs in a
+subprocess that imports the integration from that checkout and reads the
+fixtures of this one, and prints its results as JSON.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def parse_args(description: str) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=description, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        help="checkout of the repository to compare with",
+    )
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    return parser.parse_args()
+
+
+def run_baseline(script: str, checkout: Optional[Path]) -> Optional[Any]:
+    """Return the JSON results of the script run on the checkout."""
+    if checkout is None:
+        return None
+    # Run as a file, with -m the current directory would come first on the path
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([str(checkout.resolve()), str(ROOT)]),
+    }
+    output = subprocess.run(
+        [sys.executable, script, "--json"],
+        cwd=ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def change(current: float, baseline: float) -> str:
+    return f"{(current - baseline) / baseline:+.0%}"
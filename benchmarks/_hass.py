@@ -0,0 +1,5 @@
+"""Minimal Home Assistant core for benchmarks that need a running event bus."""
+
+from tests.custom_components.button_plus.home_assistant import (  # noqa: F401
+    async_start_hass,
+)
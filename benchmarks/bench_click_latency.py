@@ -0,0 +1,73 @@
+"""Latency from receiving a click over MQTT to the button state being written.
+
+Compares the former ``button.press`` service call round trip with the direct
+``ButtonPlusButton.async_click`` path the coordinator uses now.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_click_latency
+"""
+
+import asyncio
+import statistics
+import time
+from types import SimpleNamespace
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.setup import async_setup_component
+
+from benchmarks._hass import async_start_hass
+from custom_components.button_plus.button import ButtonPlusButton
+from custom_components.button_plus.button_plus_api.model_detection import ModelDetection
+
+CLICKS = 2_000
+
+
+async def measure(hass, entity, press):
+    written = asyncio.Event()
+
+    def state_written(event):
+        if event.data["entity_id"] == entity.entity_id:
+            written.set()
+
+    remove = hass.bus.async_listen(EVENT_STATE_CHANGED, state_written)
+    samples = []
+    for _ in range(CLICKS):
+        written.clear()
+        start = time.perf_counter()
+        await press()
+        await written.wait()
+        samples.append((time.perf_counter() - start) * 1e6)
+    remove()
+
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99)]
+
+
+async def main():
+    hass = await async_start_hass()
+    await async_setup_component(hass, "button", {})
+
+    with open("resource/physicalconfig1.12.1.json") as file:
+        config = ModelDetection.model_for_json(file.read())
+    hub = SimpleNamespace(hub_id=config.identifier(), config=config)
+    entity = ButtonPlusButton(0, hub)
+    await hass.data["button"].async_add_entities([entity])
+
+    async def service_call():
+        await hass.services.async_call(
+            "button", "press", target={"entity_id": entity.entity_id}
+        )
+
+    async def direct():
+        await entity.async_click("single")
+
+    for name, press in (("service", service_call), ("direct", direct)):
+        median, p99 = await measure(hass, entity, press)
+        print(f"{name:>8}: median {median:7.1f} us, p99 {p99:7.1f} us")
+
+    await hass.async_stop(force=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
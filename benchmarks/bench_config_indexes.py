@@ -0,0 +1,86 @@
+"""Connector, button and topic lookups: linear scans vs the indexes.
+
+A synthetic device with 64 connectors, two buttons per connector and 1,000
+topics. The scans are the lookups the platforms and DeviceConfiguration did
+before the indexes.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_config_indexes
+"""
+
+import json
+import timeit
+
+from custom_components.button_plus.button_plus_api.connector_type import (
+    ConnectorType,
+)
+from custom_components.button_plus.button_plus_api.event_type import EventType
+from custom_components.button_plus.button_plus_api.model_v1_12 import (
+    DeviceConfiguration,
+)
+
+CONNECTORS = 64
+TOPICS = 1_000
+NUMBER = 200
+
+
+def build_config():
+    with open("resource/physicalconfig1.12.1.json") as file:
+        data = json.load(file)
+
+    button = data["mqttbuttons"][0]
+    data["info"]["connectors"] = [
+        {"id": connector_id, "type": 2 if connector_id == 0 else 1}
+        for connector_id in range(CONNECTORS)
+    ]
+    data["mqttbuttons"] = [
+        {**button, "id": button_id} for button_id in range(CONNECTORS * 2)
+    ]
+    event_types = [event_type.value for event_type in EventType]
+    data["core"]["topics"] = [
+        {
+            "brokerid": "ha-button-plus",
+            "topic": f"buttonplus/btn_4584b8/topic/{index}",
+            "payload": "",
+            "eventtype": event_types[index % len(event_types)],
+        }
+        for index in range(TOPICS)
+    ]
+    return DeviceConfiguration.from_dict(data)
+
+
+def scan(config):
+    # Every button looks up its connector, as the platforms do on setup
+    active = [
+        connector.identifier()
+        for connector in config.info.connectors
+        if connector.connector_type() in (ConnectorType.DISPLAY, ConnectorType.BAR)
+    ]
+    for button in filter(lambda b: b.button_id // 2 in active, config.mqtt_buttons):
+        next(
+            connector
+            for connector in config.info.connectors
+            if connector.identifier() == button.button_id // 2
+        )
+    for event_type in EventType:
+        [topic for topic in config.core.topics if topic.event_type == event_type]
+
+
+def indexed(config):
+    for button in config.buttons_for(ConnectorType.DISPLAY, ConnectorType.BAR):
+        config.connector_for(button.button_id // 2)
+    for event_type in EventType:
+        config.topics_for(event_type)
+
+
+def main():
+    config = build_config()
+
+    for label, lookups in (("scan", scan), ("indexed", indexed)):
+        duration = min(timeit.repeat(lambda: lookups(config), number=NUMBER))
+        print(f"{label:>8}: {duration / NUMBER * 1e6:8.1f}µs per setup")
+
+
+if __name__ == "__main__":
+    main()
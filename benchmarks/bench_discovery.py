@@ -0,0 +1,50 @@
+"""Sweep a /24 for Button+ devices: one probe at a time vs concurrent probes.
+
+Eight stub devices listen on 127.0.0.x and answer after a delay, like the
+ESP32 web server does. The other hosts refuse the connection right away; on a
+real network a silent host costs at most the connect timeout, so a sweep with
+64 probes in flight stays bounded at 4 rounds of 0.5s.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_discovery
+"""
+
+import asyncio
+import time
+
+from custom_components.button_plus.button_plus_api.discovery import LocalDiscovery
+from tests.custom_components.button_plus.button_plus_api.stub_device import (
+    StubDevice,
+)
+
+DEVICES = 8
+DEVICE_DELAY = 0.1
+
+
+async def sweep(port, max_concurrent):
+    discovery = LocalDiscovery(port=port, max_concurrent=max_concurrent)
+    start = time.perf_counter()
+    found = await discovery.async_scan("127.0.0.0/24")
+    return len(found), time.perf_counter() - start
+
+
+async def main():
+    devices = [await StubDevice(host="127.0.0.10").start()]
+    port = devices[0].server.port
+    for index in range(1, DEVICES):
+        devices.append(await StubDevice(host=f"127.0.0.{10 + index}").start(port))
+    for device in devices:
+        device.delay = DEVICE_DELAY
+
+    try:
+        for label, max_concurrent in (("serial", 1), ("concurrent", 64)):
+            found, duration = await sweep(port, max_concurrent)
+            print(f"{label:>10}: {found} devices in {duration * 1000:8.1f}ms")
+    finally:
+        for device in devices:
+            await device.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
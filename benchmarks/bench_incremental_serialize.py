@@ -0,0 +1,84 @@
+"""Serialize a device configuration again after small changes.
+
+Uses the 1.12.1 fixture with 200 extra button topics. Reports the best time
+of to_dict on a configuration that was never serialized, on one that did not
+change since, and after changing one button label or adding a button topic,
+and to_wire_json, which always encodes the whole tree, for reference.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_incremental_serialize
+"""
+
+import json
+import timeit
+from itertools import count
+
+from custom_components.button_plus.button_plus_api.model_fields import invalidate
+
+from custom_components.button_plus.button_plus_api.event_type import EventType
+from custom_components.button_plus.button_plus_api.model_v1_12 import (
+    DeviceConfiguration,
+)
+
+EXTRA_TOPICS = 200
+NUMBER = 2_000
+
+
+def load_data():
+    with open("resource/physicalconfig1.12.1.json") as file:
+        data = json.load(file)
+    config = DeviceConfiguration.from_dict(data)
+    buttons = config.mqtt_buttons
+    for index in range(EXTRA_TOPICS):
+        buttons[index % len(buttons)].add_topic(
+            f"buttonplus/bench/{index}", EventType.CLICK
+        )
+    return config.to_dict()
+
+
+def best(statement, setup=None, number=NUMBER, repeat=5) -> float:
+    kwargs = {"setup": setup} if setup else {}
+    timings = timeit.repeat(statement, number=number, repeat=repeat, **kwargs)
+    return min(timings) / number * 1e6
+
+
+def main():
+    data = load_data()
+    config = DeviceConfiguration.from_dict(data)
+    config.to_dict()
+    button = config.mqtt_buttons[0]
+    labels = count()
+
+    configs = []
+
+    def fresh():
+        configs[:] = [DeviceConfiguration.from_dict(data) for _ in range(NUMBER)]
+
+    def relabel():
+        button.label = f"label {next(labels)}"
+        config.to_dict()
+
+    def add_topic():
+        button.add_topic("buttonplus/bench/extra", EventType.CLICK)
+        config.to_dict()
+        # Back to the same size for the next round
+        button.topics.pop()
+        invalidate(button)
+
+    cold = best(lambda: configs.pop().to_dict(), setup=fresh)
+    warm = best(config.to_dict)
+    changed_label = best(relabel)
+    added_topic = best(add_topic)
+    wire = best(config.to_wire_json)
+
+    assert json.loads(config.to_wire_json()) == config.to_dict()
+    print(f"  to_dict, never serialized: {cold:6.1f}µs")
+    print(f"         to_dict, unchanged: {warm:6.1f}µs")
+    print(f" to_dict, one label changed: {changed_label:6.1f}µs")
+    print(f"   to_dict, one topic added: {added_topic:6.1f}µs")
+    print(f"    to_wire_json, unchanged: {wire:6.1f}µs")
+
+
+if __name__ == "__main__":
+    main()
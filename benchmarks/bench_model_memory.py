@@ -0,0 +1,67 @@
+"""Memory held by parsed device configurations.
+
+Parses 1,000 copies of resource/physicalconfig1.12.1.json and reports the
+bytes traced per device while all of them are alive, next to the bytes of
+the plain dicts json.loads makes of it.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_model_memory
+
+Pass ``--baseline`` with a checkout of another commit to compare with its
+models, e.g. the commit before the models got ``__slots__``.
+"""
+
+import gc
+import json
+import tracemalloc
+
+from benchmarks._baseline import change, parse_args, run_baseline
+from custom_components.button_plus.button_plus_api.model_detection import (
+    ModelDetection,
+)
+
+DEVICES = 1_000
+
+
+def bytes_per_device(parse, json_config: str) -> float:
+    # Warm up, so imports and caches are not counted
+    parse(json_config)
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    configs = [parse(json_config) for _ in range(DEVICES)]
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    assert len(configs) == DEVICES
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return allocated / DEVICES
+
+
+def main():
+    args = parse_args(__doc__)
+    with open("resource/physicalconfig1.12.1.json") as file:
+        json_config = file.read()
+
+    models = bytes_per_device(ModelDetection.model_for_json, json_config)
+    if args.json:
+        print(json.dumps(models))
+        return
+    dicts = bytes_per_device(json.loads, json_config)
+    baseline = run_baseline(__file__, args.baseline)
+
+    print(f"{DEVICES} devices, bytes per device:")
+    print(f"{'json.loads dicts':>18}: {dicts:8,.0f}")
+    print(f"{'models':>18}: {models:8,.0f} ({change(models, dicts)} of the dicts)")
+    if baseline is not None:
+        print(
+            f"{'baseline models':>18}: {baseline:8,.0f}"
+            f" (models {change(models, baseline)})"
+        )
+
+
+if __name__ == "__main__":
+    main()
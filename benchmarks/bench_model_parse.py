@@ -0,0 +1,80 @@
+"""Parse and serialize the device configurations in resource/.
+
+Reports the best time of DeviceConfiguration.from_dict, lazy_from_dict and
+to_dict per fixture and checks that parsing and serializing again gives the
+same JSON. to_dict is timed on an unchanged configuration, so it mostly
+returns cached dicts, see bench_incremental_serialize for the rest.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_model_parse
+
+Pass ``--baseline`` with a checkout of another commit to compare with its
+from_dict and to_dict, e.g. the commit before they were generated from the
+field maps. A baseline from before to_dict cached its dicts serializes in full.
+"""
+
+import json
+import timeit
+
+from benchmarks._baseline import change, parse_args, run_baseline
+from custom_components.button_plus.button_plus_api import model_v1_07, model_v1_12
+
+FIXTURES = {
+    "physicalconfig.json": model_v1_07,
+    "physicalconfig1.07.json": model_v1_07,
+    "physicalconfig1.12.1.json": model_v1_12,
+}
+NUMBER = 2_000
+
+
+def best(function) -> float:
+    return min(timeit.repeat(function, number=NUMBER)) / NUMBER * 1e6
+
+
+def measure():
+    results = {}
+    for fixture, model in FIXTURES.items():
+        with open(f"resource/{fixture}") as file:
+            data = json.load(file)
+
+        config = model.DeviceConfiguration.from_dict(data)
+        assert json.loads(config.to_json()) == data, f"{fixture} does not round trip"
+
+        results[fixture] = {
+            "from_dict": best(lambda: model.DeviceConfiguration.from_dict(data)),
+            "to_dict": best(config.to_dict),
+        }
+        # Not in every baseline
+        lazy_from_dict = getattr(model.DeviceConfiguration, "lazy_from_dict", None)
+        if lazy_from_dict is not None:
+            results[fixture]["lazy_from_dict"] = best(lambda: lazy_from_dict(data))
+    return results
+
+
+def main():
+    args = parse_args(__doc__)
+    results = measure()
+    if args.json:
+        print(json.dumps(results))
+        return
+    baseline = run_baseline(__file__, args.baseline)
+
+    for fixture, times in results.items():
+        print(
+            f"{fixture:>26}: from_dict {times['from_dict']:6.1f}µs,"
+            f" lazy_from_dict {times['lazy_from_dict']:6.1f}µs,"
+            f" to_dict {times['to_dict']:6.1f}µs"
+        )
+        if baseline is not None:
+            before = baseline[fixture]
+            print(
+                f"{'baseline':>26}: from_dict {before['from_dict']:6.1f}µs"
+                f" ({change(times['from_dict'], before['from_dict'])}),"
+                f" to_dict {before['to_dict']:6.1f}µs"
+                f" ({change(times['to_dict'], before['to_dict'])})"
+            )
+
+
+if __name__ == "__main__":
+    main()
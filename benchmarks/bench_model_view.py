@@ -0,0 +1,53 @@
+"""Parse, edit and serialize a configuration with the model and with the view.
+
+For each fixture in resource/ reports the best time of going from the JSON
+dict to the compact JSON for the device, as LocalApiClient.edit does, with
+the model of the firmware version and with model_view, which wraps the dict.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_model_view
+"""
+
+import json
+import timeit
+
+from custom_components.button_plus.button_plus_api.event_type import EventType
+from custom_components.button_plus.button_plus_api.model_detection import (
+    ModelDetection,
+)
+
+FIXTURES = [
+    "physicalconfig.json",
+    "physicalconfig1.07.json",
+    "physicalconfig1.12.1.json",
+]
+NUMBER = 2_000
+
+
+def round_trip(data, view: bool) -> bytes:
+    config = ModelDetection.model_for(data, view=view)
+    config.remove_topic_for(EventType.SET_PAGE)
+    config.add_topic("buttonplus/bench/page/set", EventType.SET_PAGE)
+    return config.to_wire_json()
+
+
+def main():
+    for fixture in FIXTURES:
+        with open(f"resource/{fixture}") as file:
+            data = json.load(file)
+
+        assert json.loads(round_trip(data, False)) == json.loads(
+            round_trip(data, True)
+        ), f"{fixture} differs"
+
+        model = min(timeit.repeat(lambda: round_trip(data, False), number=NUMBER))
+        view = min(timeit.repeat(lambda: round_trip(data, True), number=NUMBER))
+        print(
+            f"{fixture:>26}: model {model / NUMBER * 1e6:6.1f}µs,"
+            f" view {view / NUMBER * 1e6:6.1f}µs"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Measure the cost of getting a message to its hub at 1, 10 and 200 hubs.
+
+Before, every hub had four wildcard subscriptions that the MQTT integration
+matched each message against. Now a single ``buttonplus/#`` subscription hands
+the message to the MqttDispatcher, which picks the hub by its id.
+
+The MQTT integration keeps a small LRU of matched topics, so the legacy column
+is the cost of a topic that is not (or no longer) in that cache.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_mqtt_dispatcher
+"""
+
+import timeit
+
+from homeassistant.components.mqtt.client import _matcher_for_topic
+
+from custom_components.button_plus.mqtt_dispatcher import MqttDispatcher
+from custom_components.button_plus.topic_router import RouteAction, TopicRouter
+
+BUTTONS = 8
+MESSAGES = 2_000
+
+
+def build_hubs(count):
+    hubs = {}
+    for index in range(count):
+        hub_id = f"btn_{index:06x}"
+        router = TopicRouter(hub_id)
+        for button_id in range(BUTTONS):
+            router.add_route(RouteAction.CLICK, button_id, "button", button_id, "click")
+        hubs[hub_id] = router
+    return hubs
+
+
+def legacy_subscriptions(hubs):
+    subscriptions = []
+    for hub_id, router in hubs.items():
+        for topic in (
+            f"buttonplus/{hub_id}/button/+/click",
+            f"buttonplus/{hub_id}/button/+/long_press",
+            f"buttonplus/{hub_id}/brightness/+",
+            f"buttonplus/{hub_id}/page/+",
+        ):
+            subscriptions.append((_matcher_for_topic(topic), router))
+    return subscriptions
+
+
+def shared_dispatcher(hubs):
+    dispatcher = MqttDispatcher(None)
+    for hub_id, router in hubs.items():
+        dispatcher._handlers[hub_id] = router.resolve
+    return dispatcher
+
+
+def measure(count):
+    hubs = build_hubs(count)
+    hub_ids = list(hubs)
+    topics = [
+        f"buttonplus/{hub_ids[index % count]}/button/{index % BUTTONS}/click"
+        for index in range(MESSAGES)
+    ]
+
+    subscriptions = legacy_subscriptions(hubs)
+
+    def legacy():
+        for topic in topics:
+            for matcher, router in subscriptions:
+                if matcher(topic):
+                    router.resolve(topic)
+
+    dispatcher = shared_dispatcher(hubs)
+
+    def shared():
+        for topic in topics:
+            dispatcher.handler_for(topic)(topic)
+
+    legacy_ns = min(timeit.repeat(legacy, number=1, repeat=3)) / MESSAGES * 1e9
+    shared_ns = min(timeit.repeat(shared, number=1, repeat=3)) / MESSAGES * 1e9
+    print(
+        f"{count:>4} hubs: {legacy_ns:10.1f} ns/message with {len(subscriptions)} "
+        f"subscriptions, {shared_ns:6.1f} ns/message shared"
+    )
+
+
+if __name__ == "__main__":
+    for hub_count in (1, 10, 200):
+        measure(hub_count)
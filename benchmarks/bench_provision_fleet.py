@@ -0,0 +1,57 @@
+"""Provision a fleet of 40 panels: one device at a time vs 8 in parallel.
+
+Every stub device answers after a delay in the range measured on an ESP32,
+the configsave is slower as the device writes its flash.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_provision_fleet
+"""
+
+import asyncio
+import time
+
+from custom_components.button_plus.provisioning import BrokerSettings, FleetProvisioner
+from tests.custom_components.button_plus.button_plus_api.stub_device import (
+    StubDevice,
+)
+
+DEVICES = 40
+FETCH_LATENCY = 0.15
+SAVE_LATENCY = 0.4
+BROKER = BrokerSettings("192.168.1.2", 1883, "user", "password")
+
+
+class SlowStubDevice(StubDevice):
+    async def get_config(self, request):
+        await asyncio.sleep(FETCH_LATENCY)
+        return await super().get_config(request)
+
+    async def save_config(self, request):
+        await asyncio.sleep(SAVE_LATENCY)
+        return await super().save_config(request)
+
+
+async def main():
+    devices = [await SlowStubDevice().start() for _ in range(DEVICES)]
+    ip_addresses = [device.ip_address for device in devices]
+
+    try:
+        for max_concurrent in (1, 8, 16):
+            provisioner = FleetProvisioner(BROKER)
+            start = time.perf_counter()
+            results = await provisioner.async_provision(
+                ip_addresses, max_concurrent=max_concurrent
+            )
+            duration = time.perf_counter() - start
+            done = sum(result.status == "done" for result in results)
+            print(
+                f"max_concurrent={max_concurrent:>2}: {done}/{DEVICES} devices in {duration:6.2f}s"
+            )
+    finally:
+        for device in devices:
+            await device.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
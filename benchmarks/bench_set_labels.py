@@ -0,0 +1,97 @@
+"""Update the labels of a full panel: text.set_value per entity vs set_labels.
+
+A panel with 16 buttons has 32 labels (label and top_label). The broker round
+trip of every publish is simulated with a short sleep.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_set_labels
+"""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+from homeassistant.setup import async_setup_component
+
+from benchmarks._hass import async_start_hass
+from custom_components.button_plus.button_plus_api.model_v1_12 import (
+    DeviceConfiguration,
+)
+from custom_components.button_plus.const import DOMAIN
+from custom_components.button_plus.services import async_setup_services
+from custom_components.button_plus.text import ButtonPlusLabel, ButtonPlusTopLabel
+
+BUTTONS = 16
+PUBLISH_LATENCY = 0.002
+ROUNDS = 20
+
+
+def build_config():
+    with open("resource/physicalconfig1.12.1.json") as file:
+        data = json.load(file)
+    data["info"]["connectors"] = [
+        {"id": connector_id, "type": 1} for connector_id in range(BUTTONS // 2)
+    ]
+    return DeviceConfiguration.from_dict(data)
+
+
+async def main():
+    hass = await async_start_hass()
+    await async_setup_component(hass, "text", {})
+    async_setup_services(hass)
+
+    async def async_publish(topic, payload):
+        await asyncio.sleep(PUBLISH_LATENCY)
+
+    config = build_config()
+    hub = SimpleNamespace(
+        hub_id=config.identifier(),
+        config=config,
+        label_entities={},
+        top_label_entities={},
+        async_publish=async_publish,
+    )
+    hass.data[DOMAIN] = {"entry": hub}
+
+    entities = []
+    for button_id in range(BUTTONS):
+        hub.label_entities[str(button_id)] = ButtonPlusLabel(button_id, hub, "")
+        hub.top_label_entities[str(button_id)] = ButtonPlusTopLabel(button_id, hub, "")
+        entities += [
+            hub.label_entities[str(button_id)],
+            hub.top_label_entities[str(button_id)],
+        ]
+    await hass.data["text"].async_add_entities(entities)
+
+    async def per_entity(round_id):
+        for entity in entities:
+            await hass.services.async_call(
+                "text",
+                "set_value",
+                {"entity_id": entity.entity_id, "value": f"{round_id}"},
+                blocking=True,
+            )
+
+    async def bulk(round_id):
+        labels = {
+            button_id: {"label": f"{round_id}", "top_label": f"{round_id}"}
+            for button_id in range(BUTTONS)
+        }
+        await hass.services.async_call(
+            DOMAIN, "set_labels", {"hubs": {hub.hub_id: labels}}, blocking=True
+        )
+
+    for name, update in (("text.set_value", per_entity), ("set_labels", bulk)):
+        start = time.perf_counter()
+        for round_id in range(ROUNDS):
+            await update(round_id)
+        per_panel = (time.perf_counter() - start) / ROUNDS * 1000
+        print(f"{name:>15}: {per_panel:7.2f} ms per panel ({len(entities)} labels)")
+
+    await hass.async_stop(force=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
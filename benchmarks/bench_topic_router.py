@@ -0,0 +1,69 @@
+"""Compare the regex based topic parsing with the precompiled TopicRouter.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_topic_router
+"""
+
+import re
+import timeit
+
+from custom_components.button_plus.topic_router import RouteAction, TopicRouter
+
+HUB_ID = "btn_4584b8"
+BUTTONS = 16
+ROUNDS = 200_000
+
+button_entities = {str(button_id): object() for button_id in range(BUTTONS)}
+brightness_entities = {"mini": object(), "large": object()}
+
+router = TopicRouter(HUB_ID)
+for button_id, entity in button_entities.items():
+    router.add_route(RouteAction.CLICK, entity, "button", button_id, "click")
+    router.add_route(RouteAction.LONG_PRESS, entity, "button", button_id, "long_press")
+for identifier, entity in brightness_entities.items():
+    router.add_route(RouteAction.BRIGHTNESS, entity, "brightness", identifier)
+
+topics = [
+    f"buttonplus/{HUB_ID}/button/{button_id}/click" for button_id in range(BUTTONS)
+]
+topics += [
+    f"buttonplus/{HUB_ID}/button/{button_id}/long_press" for button_id in range(BUTTONS)
+]
+topics += [f"buttonplus/{HUB_ID}/brightness/{name}" for name in brightness_entities]
+
+
+# What the coordinator callbacks did before the router existed
+def legacy(topic):
+    if topic.endswith("/click"):
+        match = re.search(r"/(\d+)/click", topic)
+        btn_id = int(match.group(1)) if match else None
+        return button_entities[str(btn_id)]
+    if topic.endswith("/long_press"):
+        match = re.search(r"/(\d+)/long_press", topic)
+        btn_id = int(match.group(1)) if match else None
+        return button_entities[str(btn_id)]
+    match = re.search(r"/brightness/(\w+)", topic)
+    return brightness_entities[match.group(1)]
+
+
+def routed(topic):
+    return router.resolve(topic).target
+
+
+def run(name, fn):
+    seconds = timeit.timeit(
+        lambda: [fn(topic) for topic in topics], number=ROUNDS // len(topics)
+    )
+    per_message = seconds / ((ROUNDS // len(topics)) * len(topics)) * 1e9
+    print(f"{name:>8}: {per_message:8.1f} ns/message")
+    return per_message
+
+
+if __name__ == "__main__":
+    for topic in topics:
+        assert legacy(topic) is routed(topic)
+
+    before = run("regex", legacy)
+    after = run("router", routed)
+    print(f" speedup: {before / after:8.1f}x")
@@ -0,0 +1,58 @@
+"""Serialize the device configurations in resource/ for the device.
+
+Compares the size and the best encode time of the indented to_json with the
+compact to_wire_json, with orjson and with the standard library fallback.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_wire_json
+"""
+
+import json
+import timeit
+
+from custom_components.button_plus.button_plus_api import wire_json
+from custom_components.button_plus.button_plus_api.model_detection import (
+    ModelDetection,
+)
+
+FIXTURES = [
+    "physicalconfig.json",
+    "physicalconfig1.07.json",
+    "physicalconfig1.12.1.json",
+]
+NUMBER = 2_000
+
+
+def best(function) -> float:
+    return min(timeit.repeat(function, number=NUMBER)) / NUMBER * 1e6
+
+
+def main():
+    orjson = wire_json.orjson
+    for fixture in FIXTURES:
+        with open(f"resource/{fixture}") as file:
+            data = json.load(file)
+        config = ModelDetection.model_for(data)
+
+        indented = config.to_json().encode()
+        wire = config.to_wire_json()
+        assert json.loads(wire) == json.loads(indented) == data
+
+        indented_time = best(config.to_json)
+        wire_time = best(config.to_wire_json)
+        wire_json.orjson = None
+        try:
+            stdlib_time = best(config.to_wire_json)
+        finally:
+            wire_json.orjson = orjson
+
+        print(
+            f"{fixture:>26}: to_json {len(indented):6} bytes {indented_time:6.1f}µs,"
+            f" to_wire_json {len(wire):6} bytes {wire_time:6.1f}µs"
+            f" ({stdlib_time:6.1f}µs without orjson)"
+        )
+
+
+if __name__ == "__main__":
+    main()
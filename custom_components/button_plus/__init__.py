@@ -4,35 +4,89 @@ from __future__ import annotations
 
 import logging
 
+from homeassistant.components.mqtt import async_subscribe_connection_status
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
 from custom_components.button_plus.button_plus_api.model_interface import (
     DeviceConfiguration,
 )
 from custom_components.button_plus.button_plus_api.model_detection import ModelDetection
 from custom_components.button_plus.buttonplushub import ButtonPlusHub
-from custom_components.button_plus.const import DOMAIN
+from custom_components.button_plus.const import (
+    CONF_DRIFT_INTERVAL,
+    DEFAULT_DRIFT_INTERVAL,
+    DOMAIN,
+)
 from custom_components.button_plus.coordinator import ButtonPlusCoordinator
+from custom_components.button_plus.drift_monitor import DriftMonitor
+from custom_components.button_plus.latency import LatencyWatcher
+from custom_components.button_plus.mqtt_dispatcher import MqttDispatcher
+from custom_components.button_plus.services import async_setup_services
+from custom_components.button_plus.template_cache import TemplateCache
 
 
 _LOGGER = logging.getLogger(__name__)
 
 # List of platforms to support. There should be a matching .py file for each,
 # eg <cover.py> and <sensor.py>
-PLATFORMS: list[str] = ["button", "text", "number"]
+PLATFORMS: list[str] = ["button", "text", "number", "sensor"]
+
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Button+ services."""
+    async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Button+ from a config entry."""
     _LOGGER.debug(f"Button+ init got new device entry! {entry.entry_id.title}")
+    # Sections are parsed when the platforms first use them
     device_configuration: DeviceConfiguration = ModelDetection.model_for_json(
-        entry.data.get("config")
+        entry.data.get("config"), lazy=True
     )
 
     hub = ButtonPlusHub(hass, device_configuration, entry)
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = hub
-
+    entry.async_on_unload(
+        async_subscribe_connection_status(hass, hub.async_mqtt_connection_changed)
+    )
+    entry.async_on_unload(hub.scheduler.async_stop)
+    entry.async_on_unload(hub.client.close)
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
+    drift_interval = entry.options.get(CONF_DRIFT_INTERVAL, DEFAULT_DRIFT_INTERVAL)
+    if drift_interval > 0:
+
+        async def async_config_drifted(json_config: str) -> None:
+            # Parse it in full first, the entry should only get a usable config
+            changed_config = ModelDetection.model_for_json(json_config)
+            _LOGGER.info(
+                f"Configuration of {changed_config.name()} changed on the device, reloading"
+            )
+            # The update listener reloads the entry with the new config
+            hass.config_entries.async_update_entry(
+                entry, data={**entry.data, "config": json_config}
+            )
+
+        entry.async_on_unload(
+            DriftMonitor.async_get(hass).async_track(
+                hub.client,
+                entry.data.get("config"),
+                drift_interval,
+                async_config_drifted,
+                # The device has no last will, its API answering is the best sign
+                hub.async_set_online,
+            )
+        )
+
+    LatencyWatcher.async_get(hass).async_start()
     buttonplus_coordinator = ButtonPlusCoordinator(hass, hub)
 
     await buttonplus_coordinator.async_config_entry_first_refresh()
@@ -44,6 +98,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload a config entry after its options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     # This is called when an entry/configured device is to be removed. The class
@@ -52,6 +111,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     _LOGGER.debug("Removing async_unload_entry")
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        hub: ButtonPlusHub = hass.data[DOMAIN].pop(entry.entry_id)
+        await MqttDispatcher.async_get(hass).async_unregister(hub.hub_id)
+        if not hass.data[DOMAIN]:
+            LatencyWatcher.async_get(hass).async_stop()
+            TemplateCache.async_get(hass).clear()
 
     return unload_ok
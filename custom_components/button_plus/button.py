@@ -9,7 +9,7 @@ from typing import Any
 
 from homeassistant.components.button import ButtonEntity, ButtonDeviceClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Context, HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import (
     AddEntitiesCallback,
@@ -17,7 +17,7 @@ from homeassistant.helpers.entity_platform import (
 )
 
 from .button_plus_api.model_interface import Connector, ConnectorType
-from .const import DOMAIN
+from .const import DOMAIN, EVENT_BUTTON_PLUS
 from . import ButtonPlusHub
 
 _LOGGER = logging.getLogger(__name__)
@@ -37,16 +37,7 @@ async def async_setup_entry(
     button_entities: list[ButtonPlusButton] = []
     hub: ButtonPlusHub = hass.data[DOMAIN][config_entry.entry_id]
 
-    active_connectors = [
-        connector.identifier()
-        for connector in hub.config.connectors_for(
-            ConnectorType.DISPLAY, ConnectorType.BAR
-        )
-    ]
-
-    buttons = filter(
-        lambda b: b.button_id // 2 in active_connectors, hub.config.buttons()
-    )
+    buttons = hub.config.buttons_for(ConnectorType.DISPLAY, ConnectorType.BAR)
 
     for button in buttons:
         _LOGGER.info(
@@ -142,6 +133,29 @@ class ButtonPlusButton(ButtonEntity):
         self._attr_click_type = "single"
         await super()._async_press_action()
 
+    async def async_click(
+        self, click_type: str, context: Context | None = None
+    ) -> None:
+        """Handle a click reported by the device over MQTT.
+
+        Called directly by the coordinator, so a physical click does not go
+        through a service call before the state is written.
+        """
+        if context is not None:
+            self.async_set_context(context)
+        self._attr_click_type = click_type
+        await super()._async_press_action()
+        self.hass.bus.async_fire(
+            EVENT_BUTTON_PLUS,
+            {
+                "entity_id": self.entity_id,
+                "hub_id": self._hub_id,
+                "button_id": self._btn_id,
+                "click_type": click_type,
+            },
+            context=context,
+        )
+
     async def _async_release_action(self) -> None:
         # Not implemented
         pass
@@ -1 +1,5 @@
 """Initialize Button+ Api module"""
+
+# Import the models up front, so they are registered with ModelDetection and
+# no module is imported on the event loop when the first device is parsed
+from . import model_v1_07, model_v1_12  # noqa: F401
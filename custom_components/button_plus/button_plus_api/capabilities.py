@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from enum import Enum
+from functools import lru_cache
+from typing import FrozenSet, Iterator, List, Optional, Tuple
+
+from packaging.version import Version, parse as parseVersion
+
+
+class Capability(str, Enum):
+    # Brightness of the large and mini displays over MQTT
+    BRIGHTNESS = "brightness"
+    # Display items spread over pages, with page status and set topics
+    PAGES = "pages"
+
+
+@lru_cache(maxsize=32)
+def parse_version(version: str) -> Version:
+    """Parse a firmware version, each distinct string is only parsed once."""
+    return parseVersion(version)
+
+
+# Capability with the first firmware that has it and, when dropped again,
+# the first firmware that no longer does
+CAPABILITY_MATRIX: Tuple[Tuple[Capability, str, Optional[str]], ...] = (
+    (Capability.BRIGHTNESS, "1.11", None),
+    (Capability.PAGES, "1.12", None),
+)
+
+
+class Capabilities:
+    """What a firmware version supports, shared by all devices on that version."""
+
+    __slots__ = ("version", "features")
+
+    def __init__(self, version: Version, features: FrozenSet[Capability]):
+        self.version = version
+        self.features = features
+
+    def __contains__(self, capability: Capability) -> bool:
+        return capability in self.features
+
+    def __iter__(self) -> Iterator[Capability]:
+        return iter(self.features)
+
+    def as_list(self) -> List[str]:
+        return sorted(capability.value for capability in self.features)
+
+
+@lru_cache(maxsize=32)
+def capabilities_for(firmware: str) -> Capabilities:
+    version = parse_version(firmware)
+    return Capabilities(
+        version,
+        frozenset(
+            capability
+            for capability, since, until in CAPABILITY_MATRIX
+            if parse_version(since) <= version
+            and (until is None or version < parse_version(until))
+        ),
+    )
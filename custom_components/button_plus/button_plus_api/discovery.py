@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import json
+import logging
+from typing import Dict, Iterable, List, NamedTuple, Optional, Union
+
+import aiohttp
+
+from .model_detection import ModelDetection
+from .model_interface import DeviceConfiguration
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+# A /22 has 1022 hosts, a wider network takes too long to probe host by host
+MIN_PREFIX_LENGTH = 22
+
+
+class DiscoveredDevice(NamedTuple):
+    ip_address: str
+    identifier: str
+    name: str
+    firmware: str
+    config: DeviceConfiguration
+    json_config: str
+
+
+class LocalDiscovery:
+    """Find Button+ devices on the local network.
+
+    Every host of a subnet is asked for its ``/config``. Hosts that do not
+    answer within a short timeout are dropped. A bounded pool of workers takes
+    the hosts one by one, so only that many probes are in flight at once, and
+    no connection is kept alive, as each host is visited only once. A host is a Button+ device when it answers with a JSON
+    object that has the ``info`` and ``core`` sections of a device config.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession | None = None,
+        port: int = 80,
+        timeout: float = 2,
+        connect_timeout: float = 0.5,
+        max_concurrent: int = 64,
+    ) -> None:
+        self._session = session
+        self._port = port
+        self._timeout = aiohttp.ClientTimeout(total=timeout, connect=connect_timeout)
+        self._max_concurrent = max_concurrent
+        self.probed = 0
+        self.found = 0
+
+    def _host(self, ip_address: str) -> str:
+        return ip_address if self._port == 80 else f"{ip_address}:{self._port}"
+
+    @staticmethod
+    def is_device_config(data) -> bool:
+        return (
+            isinstance(data, dict)
+            and isinstance(data.get("info"), dict)
+            and isinstance(data.get("core"), dict)
+            and "id" in data["info"]
+            and "firmware" in data["info"]
+        )
+
+    async def async_probe(
+        self, session: aiohttp.ClientSession, ip_address: str
+    ) -> Optional[DiscoveredDevice]:
+        """Return the device on the address, None when it is no Button+."""
+        host = self._host(ip_address)
+        self.probed += 1
+        try:
+            async with session.get(
+                f"http://{host}/config", timeout=self._timeout
+            ) as response:
+                if response.status != 200:
+                    return None
+                json_config = await response.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeDecodeError):
+            return None
+
+        try:
+            data = json.loads(json_config)
+            if not self.is_device_config(data):
+                return None
+            config = ModelDetection.model_for(data)
+        except Exception as ex:  # pylint: disable=broad-except
+            _LOGGER.debug(f"Host {host} answers, but is no Button+ device: {ex!r}")
+            return None
+
+        _LOGGER.debug(f"Found Button+ device {config.identifier()} at {host}")
+        self.found += 1
+        return DiscoveredDevice(
+            ip_address=host,
+            identifier=config.identifier(),
+            name=config.name(),
+            firmware=str(config.firmware_version()),
+            config=config,
+            json_config=json_config,
+        )
+
+    async def async_scan(
+        self,
+        network: Union[str, ipaddress.IPv4Network],
+        exclude: Iterable[str] = (),
+    ) -> List[DiscoveredDevice]:
+        """Probe every host of the network, e.g. ``192.168.1.0/24``.
+
+        Raises ValueError for an invalid network or one wider than
+        ``MIN_PREFIX_LENGTH``. The devices are returned in address order.
+        """
+        network = ipaddress.IPv4Network(network, strict=False)
+        if network.prefixlen < MIN_PREFIX_LENGTH:
+            raise ValueError(f"{network} is wider than /{MIN_PREFIX_LENGTH}")
+        excluded = set(exclude)
+        hosts = enumerate(str(ip) for ip in network.hosts() if str(ip) not in excluded)
+        _LOGGER.debug(f"Scanning the hosts of {network} for Button+ devices")
+
+        found: Dict[int, DiscoveredDevice] = {}
+
+        async def worker(session: aiohttp.ClientSession) -> None:
+            for index, host in hosts:
+                device = await self.async_probe(session, host)
+                if device is not None:
+                    found[index] = device
+
+        session = self._session or aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=0, force_close=True)
+        )
+        try:
+            workers = min(self._max_concurrent, network.num_addresses)
+            await asyncio.gather(*(worker(session) for _ in range(workers)))
+        finally:
+            if self._session is None:
+                await session.close()
+
+        return [found[index] for index in sorted(found)]
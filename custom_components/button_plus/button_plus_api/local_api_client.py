@@ -1,27 +1,202 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import random
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict
+
+import aiohttp
+
+from .model_detection import ModelDetection
+from .model_interface import DeviceConfiguration
 
 _LOGGER: logging.Logger = logging.getLogger(__package__)
 
+# Status codes worth another attempt, the ESP32 answers these while it is busy
+RETRY_STATUSES = {500, 502, 503, 504}
+
+# The config is sent as bytes, with the content type of a text body
+PUSH_HEADERS = {"Content-Type": "text/plain; charset=utf-8"}
+
+
+class PushLog:
+    """The hash of the config pushed last to each device, with push counts.
+
+    Clients are made per operation, so the log is kept apart from them and
+    shared, keyed by the address of the device.
+    """
+
+    def __init__(self) -> None:
+        self._hashes: Dict[str, str] = {}
+        self._pushed: Dict[str, int] = {}
+        self._skipped: Dict[str, int] = {}
+
+    def last_hash(self, device: str) -> str | None:
+        return self._hashes.get(device)
+
+    def record_push(self, device: str, content_hash: str) -> None:
+        self._hashes[device] = content_hash
+        self._pushed[device] = self._pushed.get(device, 0) + 1
+
+    def record_skip(self, device: str) -> None:
+        self._skipped[device] = self._skipped.get(device, 0) + 1
+
+    def pushes(self, device: str) -> int:
+        return self._pushed.get(device, 0)
+
+    def pushes_skipped(self, device: str) -> int:
+        return self._skipped.get(device, 0)
+
 
 class LocalApiClient:
-    """Client to talk to Button+ local devices"""
+    """Client to talk to Button+ local devices
+
+    Without a session the client opens its own, with a small pool of
+    keep-alive connections to the device. Every request has a bounded timeout
+    and the number of requests in flight to the device is capped, the ESP32
+    only handles a few at a time. Reading the config is idempotent and is
+    retried with jittered exponential backoff.
 
-    def __init__(self, ip_address, session) -> None:
+    Pass a shared ``push_log`` to skip saving a config the device already got
+    from another client.
+    """
+
+    def __init__(
+        self,
+        ip_address,
+        session: aiohttp.ClientSession | None = None,
+        timeout: float = 10,
+        connect_timeout: float = 3,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_concurrent: int = 2,
+        keepalive: float = 30,
+        push_log: PushLog | None = None,
+    ) -> None:
+        self._ip_address = ip_address
         self._base = f"http://{ip_address}"
         self._session = session
+        self._owns_session = session is None
+        self._timeout = aiohttp.ClientTimeout(total=timeout, connect=connect_timeout)
+        self._retries = retries
+        self._backoff = backoff
+        self._max_concurrent = max_concurrent
+        self._keepalive = keepalive
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._push_log = push_log if push_log is not None else PushLog()
 
         _LOGGER.debug("Initialize Button+ local API client")
 
+    @property
+    def pushes(self) -> int:
+        return self._push_log.pushes(self._ip_address)
+
+    @property
+    def pushes_skipped(self) -> int:
+        return self._push_log.pushes_skipped(self._ip_address)
+
+    async def __aenter__(self) -> LocalApiClient:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self._max_concurrent, keepalive_timeout=self._keepalive
+                ),
+                timeout=self._timeout,
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the connections of the client, unless the session was passed in."""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _get(self, url: str) -> str:
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    async with self._get_session().get(
+                        url, timeout=self._timeout
+                    ) as response:
+                        response.raise_for_status()
+                        return await response.text()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as ex:
+                retry = not isinstance(ex, aiohttp.ClientResponseError) or (
+                    ex.status in RETRY_STATUSES
+                )
+                if not retry or attempt >= self._retries:
+                    raise
+
+                delay = self._backoff * 2**attempt * random.uniform(0.5, 1.5)
+                attempt += 1
+                _LOGGER.debug(
+                    f"GET {url} failed ({ex!r}), retry {attempt} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+
     async def fetch_config(self):
         url = f"{self._base}/config"
         _LOGGER.debug(f"fetch_config {url}")
-        async with self._session.get(url) as response:
-            return await response.text()
+        return await self._get(url)
+
+    @asynccontextmanager
+    async def edit(
+        self, config: DeviceConfiguration | None = None
+    ) -> AsyncIterator[DeviceConfiguration]:
+        """Collect any number of edits and save them with a single configsave.
+
+        Without a config the current one is fetched from the device first, as
+        a view over its JSON, so the keys the model does not know are saved
+        back unchanged. Nothing is saved when the block left the configuration
+        as it was. When the block raises or the push fails, the configuration
+        is rolled back to how it was when the edit started.
+        """
+        if config is None:
+            config = ModelDetection.model_for(await self.fetch_config(), view=True)
 
-    async def push_config(self, config):
+        snapshot = config.snapshot()
+        snapshot_hash = config.content_hash()
+        try:
+            yield config
+            if config.content_hash() == snapshot_hash:
+                self._push_log.record_skip(self._ip_address)
+                _LOGGER.debug(f"Edit of {self._base} changed nothing, not saved")
+            else:
+                await self.push_config(config)
+        except BaseException:
+            _LOGGER.debug(f"Edit of {self._base} failed, roll back the configuration")
+            config.restore(snapshot)
+            raise
+
+    async def push_config(self, config, force: bool = False):
+        """Save the config on the device, unless it is the config pushed last.
+
+        Saving makes the device write its flash and restart its services, so
+        an unchanged configuration is skipped unless ``force`` is set.
+        """
         url = f"{self._base}/configsave"
+        content_hash = config.content_hash()
+        if not force and content_hash == self._push_log.last_hash(self._ip_address):
+            self._push_log.record_skip(self._ip_address)
+            _LOGGER.debug(f"push_config {url} skipped, config is unchanged")
+            return None
+
         _LOGGER.debug(f"push_config {url}")
-        async with self._session.post(url, data=config.to_json()) as response:
-            return await response.text()
+        async with self._semaphore:
+            async with self._get_session().post(
+                url,
+                data=config.to_wire_json(),
+                headers=PUSH_HEADERS,
+                timeout=self._timeout,
+            ) as response:
+                response.raise_for_status()
+                self._push_log.record_push(self._ip_address, content_hash)
+                return await response.text()
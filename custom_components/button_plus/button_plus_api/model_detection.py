@@ -1,19 +1,75 @@
 import json
-from packaging.version import parse as parseSemver
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Any, Dict, List, Type, Union
+
+from packaging.version import Version
+
+from .capabilities import parse_version
 from .model_interface import DeviceConfiguration as DeviceConfigurationInterface
+from .model_view import DeviceConfiguration as ConfigurationView
+
+ConfigData = Union[str, bytes, bytearray, Dict[str, Any]]
 
 
 class ModelDetection:
+    """Pick the model of a device configuration by its firmware version.
+
+    Models register the first firmware version they handle; a configuration
+    gets the model with the highest such version at or below its firmware.
+    The models of this package are registered when the package is imported.
+    """
+
+    _versions: List[Version] = []
+    _models: List[Type[DeviceConfigurationInterface]] = []
+
+    @classmethod
+    def register(cls, since: str):
+        """Class decorator registering a model for firmware ``since`` and up."""
+
+        def decorator(model: Type[DeviceConfigurationInterface]):
+            version = parse_version(since)
+            index = bisect_right(cls._versions, version)
+            if index > 0 and cls._versions[index - 1] == version:
+                # Registering a version again replaces its model
+                cls._models[index - 1] = model
+            else:
+                cls._versions.insert(index, version)
+                cls._models.insert(index, model)
+            cls.model_for_firmware.cache_clear()
+            return model
+
+        return decorator
+
     @staticmethod
-    def model_for_json(json_data: str) -> "DeviceConfigurationInterface":
-        data = json.loads(json_data)
-        device_version = parseSemver(data["info"]["firmware"])
+    @lru_cache(maxsize=32)
+    def model_for_firmware(firmware: str) -> Type[DeviceConfigurationInterface]:
+        index = bisect_right(ModelDetection._versions, parse_version(firmware))
+        if index == 0:
+            raise ValueError(f"No model for Button+ firmware {firmware}")
+        return ModelDetection._models[index - 1]
 
-        if device_version >= parseSemver("1.12.0"):
-            from .model_v1_12 import DeviceConfiguration
+    @staticmethod
+    def model_for(
+        data: ConfigData, lazy: bool = False, view: bool = False
+    ) -> DeviceConfigurationInterface:
+        """Parse a configuration given as JSON text, JSON bytes or parsed dict.
+
+        With ``view`` the result wraps the dict instead, for any firmware, see
+        model_view.
+        """
+        if not isinstance(data, dict):
+            data = json.loads(data)
+        if view:
+            return ConfigurationView(data)
 
-            return DeviceConfiguration.from_dict(data)
-        else:
-            from .model_v1_07 import DeviceConfiguration
+        model = ModelDetection.model_for_firmware(data["info"]["firmware"])
+        if lazy:
+            return model.lazy_from_dict(data)
+        return model.from_dict(data)
 
-            return DeviceConfiguration.from_dict(data)
+    @staticmethod
+    def model_for_json(
+        json_data: ConfigData, lazy: bool = False
+    ) -> DeviceConfigurationInterface:
+        return ModelDetection.model_for(json_data, lazy)
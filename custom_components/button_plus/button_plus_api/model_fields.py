@@ -0,0 +1,368 @@
+"""Declarative field maps for the configuration model.
+
+Each model class lists its fields once, as the attribute and the JSON key it
+maps to. ``dict_model`` compiles a ``from_dict`` and ``to_dict`` for the class
+from that list when the module is imported, so parsing does no keyword
+argument binding, no ``__init__`` call and no generic per-field dispatch.
+
+Fields marked ``lazy`` get a ``lazy_from_dict`` as well, which keeps their
+raw JSON and only parses it when the attribute is first read.
+
+``to_dict`` keeps the dict it built and returns it again until the object
+changes, so serializing a configuration again only rebuilds the objects that
+changed and the objects containing them. The cached dict and the object
+containing this one are kept in a single ``_cache`` slot, which stays None
+until the first ``to_dict``, so an object that is never serialized pays for
+one slot only. Assigning a field drops the cached dicts, the fields are
+properties over slots named ``_field_<attribute>`` for that. Changing a list in place is not noticed, call ``invalidate``
+after it. The cached dicts are shared, callers must not change what
+``to_dict`` returns.
+"""
+
+from enum import Enum
+from operator import attrgetter
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple, Type
+
+_MISSING = object()
+
+
+class Field(NamedTuple):
+    attribute: str
+    key: str
+    # Enum the JSON value is converted to
+    enum: Optional[Type[Enum]] = None
+    # dict_model class the JSON value is parsed with
+    model: Optional[type] = None
+    # The JSON value is a list of ``model``
+    many: bool = False
+    # Value used when the key is absent from the JSON
+    default: Any = _MISSING
+    # Value used, both ways, when the value is empty
+    fallback: Any = None
+    # Leave the key out of the JSON when the value is empty
+    omit_empty: bool = False
+    # Leave the key out of the JSON when the value is None, for keys only
+    # some firmware has, whose values may be empty
+    omit_none: bool = False
+    # Parsed on first access when the object is made with lazy_from_dict
+    lazy: bool = False
+
+
+def _storage(attribute: str) -> str:
+    return f"_field_{attribute}"
+
+
+def slots(fields: Tuple[Field, ...]) -> Tuple[str, ...]:
+    """Slots of a cached model: its fields and its cache.
+
+    The cache is None or a ``[dict, parent]`` list, the cached dict and the
+    object containing this one, both None when unknown.
+    """
+    return (*(_storage(field.attribute) for field in fields), "_cache")
+
+
+def invalidate(model) -> None:
+    """Drop the cached dict of the object and of the objects containing it.
+
+    A cached object only contains cached objects, so the walk up stops at the
+    first object that has none.
+    """
+    while (cache := getattr(model, "_cache", None)) is not None and cache[
+        0
+    ] is not None:
+        cache[0] = None
+        model = cache[1]
+
+
+def _adopt(child, parent) -> Dict[str, Any]:
+    # Children learn their parent when it caches their dict, which is the
+    # moment the parent has to hear about their changes
+    try:
+        cache = child._cache
+    except AttributeError:
+        cache = None
+    if cache is None:
+        child._cache = [None, parent]
+    else:
+        cache[1] = parent
+    return child.to_dict()
+
+
+def _field_property(attribute: str) -> property:
+    storage = _storage(attribute)
+
+    def set_field(self, value) -> None:
+        setattr(self, storage, value)
+        invalidate(self)
+
+    return property(attrgetter(storage), set_field)
+
+
+class LazySection:
+    """Parse a section from the raw JSON the first time it is read.
+
+    Until then the object only holds the raw value, under ``_raw_<attribute>``.
+    As a non-data descriptor it is only consulted while the attribute is not
+    in the instance dict, so once parsed, or assigned, reading it costs
+    nothing extra. Needs a class with an instance dict, not one with slots.
+    """
+
+    def __init__(
+        self,
+        attribute: str,
+        parse: Callable[[Any], Any],
+        serialize: Callable[[Any], Any],
+    ):
+        self._attribute = attribute
+        self._raw_attribute = f"_raw_{attribute}"
+        self._normal_attribute = f"_normal_{attribute}"
+        self._parse = parse
+        self._serialize = serialize
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            raw = instance.__dict__.pop(self._raw_attribute)
+        except KeyError:
+            raise AttributeError(self._attribute) from None
+        instance.__dict__.pop(self._normal_attribute, None)
+        value = instance.__dict__[self._attribute] = self._parse(raw)
+        return value
+
+    def normal(self, instance) -> Any:
+        """Return the unread section as it serializes once read, without reading it.
+
+        The raw JSON does not change until the section is read, so the result
+        is kept until then.
+        """
+        try:
+            return instance.__dict__[self._normal_attribute]
+        except KeyError:
+            pass
+        normal = instance.__dict__[self._normal_attribute] = self._serialize(
+            self._parse(instance.__dict__[self._raw_attribute])
+        )
+        return normal
+
+
+def canonical_dict(model) -> Dict[str, Any]:
+    """Return ``to_dict`` of the object, its unread lazy sections as if read.
+
+    An unread section goes out as it came in and a read one as the model has
+    it, which differ when the JSON has keys the model does not know.
+    """
+    data = result = model.to_dict()
+    for field in model.FIELDS:
+        if field.lazy and field.attribute not in model.__dict__:
+            if result is data:
+                result = dict(data)
+            result[field.key] = getattr(type(model), field.attribute).normal(model)
+    return result
+
+
+def _value_expression(field: Field, index: int, namespace: Dict[str, Any]) -> str:
+    if field.default is _MISSING:
+        return f"data[{field.key!r}]"
+    namespace[f"_default_{index}"] = field.default
+    return f"data.get({field.key!r}, _default_{index})"
+
+
+def _parse_expression(
+    field: Field, index: int, namespace: Dict[str, Any], value: str
+) -> str:
+    if field.model is not None:
+        namespace[f"_from_dict_{index}"] = field.model.from_dict
+        if field.many:
+            return f"[_from_dict_{index}(item) for item in {value}]"
+        return f"_from_dict_{index}({value})"
+
+    if field.enum is not None:
+        # A dict lookup is a lot cheaper than calling the enum, which remains
+        # the path for values that are not a member so it raises the same way
+        namespace[f"_enum_{index}"] = field.enum
+        namespace[f"_members_{index}"] = field.enum._value2member_map_
+        return (
+            f"(_members_{index}[value] if (value := {value}) in _members_{index}"
+            f" else _enum_{index}(value))"
+        )
+
+    if field.fallback is not None:
+        namespace[f"_fallback_{index}"] = field.fallback
+        return f"({value} or _fallback_{index})"
+
+    return value
+
+
+def _serialize_expression(field: Field, index: int, cache: bool) -> str:
+    value = f"self.{_storage(field.attribute) if cache else field.attribute}"
+    if field.lazy:
+        # An untouched section goes out as it came in
+        return (
+            f"({_serialize_expression(field._replace(lazy=False), index, cache)}"
+            f" if {field.attribute!r} in self.__dict__"
+            f" else self.__dict__[{('_raw_' + field.attribute)!r}])"
+        )
+
+    if field.model is not None:
+        if cache:
+            if field.many:
+                return f"[_adopt(item, self) for item in {value}]"
+            return f"_adopt({value}, self)"
+        if field.many:
+            return f"[item.to_dict() for item in {value}]"
+        return f"{value}.to_dict()"
+
+    if field.fallback is not None:
+        return f"({value} or _fallback_{index})"
+
+    return value
+
+
+def _compile(source: str, name: str, namespace: Dict[str, Any]) -> Callable:
+    exec(compile(source, f"<{name}>", "exec"), namespace)  # noqa: S102
+    return namespace[name]
+
+
+def dict_model(cls=None, *, cache: bool = True):
+    """Generate ``from_dict`` and ``to_dict`` from the ``FIELDS`` of the class.
+
+    The class lists ``slots(FIELDS)`` as its ``__slots__``. With ``cache`` off
+    the fields are plain attributes and ``to_dict`` builds a new dict on every
+    call, for the root of the model, whose lists are changed in place all over
+    and which has lazy fields.
+    """
+    if cls is None:
+        return lambda cls: _dict_model(cls, cache)
+    return _dict_model(cls, cache)
+
+
+def _dict_model(cls, cache: bool):
+    fields: Tuple[Field, ...] = cls.FIELDS
+    namespace: Dict[str, Any] = {
+        "_cls": cls,
+        "_new": object.__new__,
+        "_adopt": _adopt,
+    }
+    if cache and any(field.lazy for field in fields):
+        raise TypeError(f"{cls.__name__} has lazy fields, these need cache=False")
+
+    parse_lines = [
+        f"    self.{_storage(field.attribute) if cache else field.attribute} = "
+        + _parse_expression(
+            field, index, namespace, _value_expression(field, index, namespace)
+        )
+        for index, field in enumerate(fields)
+    ]
+    from_dict_source = "\n".join(
+        [
+            "def from_dict(data):",
+            "    self = _new(_cls)",
+            # Set, so the first to_dict does not pay for an AttributeError
+            *(["    self._cache = None"] if cache else []),
+            *parse_lines,
+            "    return self",
+        ]
+    )
+
+    lazy_fields = [field for field in fields if field.lazy]
+    if lazy_fields:
+        lazy_lines = [
+            f"    self.__dict__[{('_raw_' + field.attribute)!r}] = "
+            + _value_expression(field, index, namespace)
+            if field.lazy
+            else line
+            for (index, field), line in zip(enumerate(fields), parse_lines)
+        ]
+        lazy_from_dict_source = "\n".join(
+            [
+                "def lazy_from_dict(data):",
+                "    self = _new(_cls)",
+                *lazy_lines,
+                "    return self",
+            ]
+        )
+
+    serialize_lines = [
+        f"        {field.key!r}: {_serialize_expression(field, index, cache)},"
+        for index, field in enumerate(fields)
+        if not (field.omit_empty or field.omit_none)
+    ]
+    omitted_lines = [
+        line
+        for index, field in enumerate(fields)
+        if field.omit_empty or field.omit_none
+        for line in (
+            f"    if self.{_storage(field.attribute) if cache else field.attribute}"
+            + (" is not None:" if field.omit_none else ":"),
+            f"        result[{field.key!r}] = "
+            + _serialize_expression(field, index, cache),
+        )
+    ]
+    cache_lines = (
+        [
+            "    try:",
+            "        cache = self._cache",
+            "    except AttributeError:",
+            "        cache = None",
+            "    if cache is not None and cache[0] is not None:",
+            "        return cache[0]",
+        ]
+        if cache
+        else []
+    )
+    to_dict_source = "\n".join(
+        [
+            "def to_dict(self):",
+            *cache_lines,
+            "    result = {",
+            *serialize_lines,
+            "    }",
+            *omitted_lines,
+            *(
+                [
+                    "    if cache is None:",
+                    "        self._cache = [result, None]",
+                    "    else:",
+                    "        cache[0] = result",
+                ]
+                if cache
+                else []
+            ),
+            "    return result",
+        ]
+    )
+
+    namespace["__name__"] = cls.__module__
+    cls.from_dict = staticmethod(_compile(from_dict_source, "from_dict", namespace))
+    cls.to_dict = _compile(to_dict_source, "to_dict", namespace)
+    if cache:
+        for field in fields:
+            setattr(cls, field.attribute, _field_property(field.attribute))
+    if lazy_fields:
+        cls.lazy_from_dict = staticmethod(
+            _compile(lazy_from_dict_source, "lazy_from_dict", namespace)
+        )
+        for index, field in enumerate(fields):
+            if field.lazy:
+                parse = _compile(
+                    "def parse(raw):\n    return "
+                    + _parse_expression(field, index, namespace, "raw"),
+                    "parse",
+                    dict(namespace),
+                )
+                # Sections are serialized as a root model does, without caching
+                serialize = _compile(
+                    "def serialize(self):\n    return "
+                    + _serialize_expression(
+                        field._replace(lazy=False), index, False
+                    ).replace(f"self.{field.attribute}", "self"),
+                    "serialize",
+                    dict(namespace),
+                )
+                setattr(
+                    cls,
+                    field.attribute,
+                    LazySection(field.attribute, parse, serialize),
+                )
+    return cls
@@ -1,12 +1,15 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from packaging.version import Version
 
+from custom_components.button_plus.button_plus_api.capabilities import Capabilities
 from custom_components.button_plus.button_plus_api.event_type import EventType
 from custom_components.button_plus.button_plus_api.connector_type import ConnectorType
 
 
 class Connector:
+    __slots__ = ()
+
     def identifier(self) -> int:
         """Return the identifier of the connector."""
         pass
@@ -17,21 +20,42 @@ class Connector:
 
 
 class Button:
+    __slots__ = ()
+
     button_id: int
     top_label: str
     label: str
+    # Only set by firmware that spreads buttons over pages, None when the
+    # button is shown whatever the page
+    page: Optional[int] = None
 
     def add_topic(self, topic: str, event_type: EventType, payload: str = "") -> None:
-        """Set the MQTT topic."""
+        """Set the MQTT topic, updating it when the button already has it."""
         pass
 
 
 class Topic:
+    __slots__ = ()
+
     topic: str
     event_type: EventType
 
 
+class Display:
+    __slots__ = ()
+
+    label: str
+    topics: List[Topic]
+    # Only set by firmware that spreads display items over pages
+    page: Optional[int] = None
+
+
 class DeviceConfiguration:
+    @property
+    def capabilities(self) -> Capabilities:
+        """Return what the firmware of the device supports."""
+        pass
+
     def firmware_version(self) -> Version:
         """Return the firmware version of the device."""
         pass
@@ -64,8 +88,8 @@ class DeviceConfiguration:
         """Return the connectors of the given type."""
         pass
 
-    def connector_for(self, identifier: int) -> Connector:
-        """Return the connectors of the given type."""
+    def connector_for(self, identifier: int) -> Optional[Connector]:
+        """Return the connector with the identifier."""
         pass
 
     def connectors(self) -> List[Connector]:
@@ -76,12 +100,20 @@ class DeviceConfiguration:
         """Return the available buttons."""
         pass
 
+    def buttons_for(self, *connector_type: ConnectorType) -> List[Button]:
+        """Return the buttons on connectors of the given type."""
+        pass
+
+    def displays(self) -> List[Display]:
+        """Return the items shown on the display."""
+        pass
+
     def set_broker(self, url: str, port: int, username: str, password: str) -> None:
-        """Set the MQTT broker."""
+        """Set the MQTT broker, replacing the one set before."""
         pass
 
     def add_topic(self, topic: str, event_type: EventType) -> None:
-        """Set the MQTT topic."""
+        """Set the MQTT topic, updating it when the device already has it."""
         pass
 
     def remove_topic_for(self, event_type: EventType) -> None:
@@ -94,11 +126,37 @@ class DeviceConfiguration:
         """
         pass
 
+    def topics_for(self, event_type: EventType) -> List[Topic]:
+        """Return the topics of the device for the event type."""
+        pass
+
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> "DeviceConfiguration":
         """Deserialize the DeviceConfiguration from a dictionary."""
         pass
 
+    @staticmethod
+    def lazy_from_dict(data: Dict[str, Any]) -> "DeviceConfiguration":
+        """Deserialize the DeviceConfiguration, parsing the button, display, broker
+        and sensor sections only when they are first used."""
+        pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a dictionary that later edits leave alone, for restore."""
+        pass
+
+    def restore(self, data: Dict[str, Any]) -> None:
+        """Reset the DeviceConfiguration to a dictionary taken with snapshot."""
+        pass
+
     def to_json(self) -> str:
-        """Serialize the DeviceConfiguration to a JSON string."""
+        """Serialize the DeviceConfiguration to an indented JSON string."""
+        pass
+
+    def to_wire_json(self) -> bytes:
+        """Serialize the DeviceConfiguration to compact JSON for the device."""
+        pass
+
+    def content_hash(self) -> str:
+        """Return a hash of the configuration that ignores key order and whitespace."""
         pass
@@ -1,18 +1,30 @@
+import hashlib
 import json
 import logging
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List, Optional
 
-from packaging.version import parse as parseVersion, Version
+from packaging.version import Version
 
 from .JSONCustomEncoder import CustomEncoder
+from .capabilities import Capabilities, Capability, capabilities_for
 from .connector_type import ConnectorType
 from .event_type import EventType
-from .model_interface import Button
+from .model_detection import ModelDetection
+from .model_fields import Field, canonical_dict, dict_model, invalidate, slots
+from .model_interface import Button, Display
+from . import wire_json
 
 _LOGGER: logging.Logger = logging.getLogger(__package__)
 
 
+@dict_model
 class Connector:
+    FIELDS = (
+        Field("_identifier", "id"),
+        Field("_connector_type", "type", enum=ConnectorType),
+    )
+    __slots__ = slots(FIELDS)
+
     def __init__(self, identifier: int, connector_type: ConnectorType):
         self._identifier = identifier
         self._connector_type = connector_type
@@ -23,30 +35,33 @@ class Connector:
     def connector_type(self) -> ConnectorType:
         return ConnectorType(self._connector_type)
 
-    @staticmethod
-    def from_dict(data: Dict[str, Any]) -> "Connector":
-        return Connector(
-            identifier=data["id"], connector_type=ConnectorType(data["type"])
-        )
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {"id": self._identifier, "type": self._connector_type}
-
 
+@dict_model
 class Sensor:
+    FIELDS = (
+        Field("sensor_id", "sensorid"),
+        Field("description", "description"),
+    )
+    __slots__ = slots(FIELDS)
+
     def __init__(self, sensor_id: int, description: str):
         self.sensor_id = sensor_id
         self.description = description
 
-    @staticmethod
-    def from_dict(data: Dict[str, Any]) -> "Sensor":
-        return Sensor(sensor_id=data["sensorid"], description=data["description"])
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {"sensorid": self.sensor_id, "description": self.description}
-
 
+@dict_model
 class Info:
+    FIELDS = (
+        Field("device_id", "id"),
+        Field("mac", "mac"),
+        Field("ip_address", "ipaddress"),
+        Field("firmware", "firmware"),
+        Field("large_display", "largedisplay"),
+        Field("connectors", "connectors", model=Connector, many=True),
+        Field("sensors", "sensors", model=Sensor, many=True),
+    )
+    __slots__ = slots(FIELDS)
+
     def __init__(
         self,
         device_id: str,
@@ -65,33 +80,17 @@ class Info:
         self.connectors: List[Connector] = connectors
         self.sensors = sensors
 
-    @staticmethod
-    def from_dict(data: Dict[str, Any]) -> "Info":
-        return Info(
-            device_id=data["id"],
-            mac=data["mac"],
-            ip_address=data["ipaddress"],
-            firmware=data["firmware"],
-            large_display=data["largedisplay"],
-            connectors=[
-                Connector.from_dict(connector) for connector in data["connectors"]
-            ],
-            sensors=[Sensor.from_dict(sensor) for sensor in data["sensors"]],
-        )
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "id": self.device_id,
-            "mac": self.mac,
-            "ipaddress": self.ip_address,
-            "firmware": self.firmware,
-            "largedisplay": self.large_display,
-            "connectors": [connector.to_dict() for connector in self.connectors],
-            "sensors": [sensor.to_dict() for sensor in self.sensors],
-        }
-
 
+@dict_model
 class Topic:
+    FIELDS = (
+        Field("broker_id", "brokerid"),
+        Field("topic", "topic"),
+        Field("payload", "payload"),
+        Field("event_type", "eventtype", enum=EventType),
+    )
+    __slots__ = slots(FIELDS)
+
     def __init__(self, broker_id: str, topic: str, payload: str, event_type: EventType):
         self.broker_id = broker_id
         self.topic = topic
@@ -101,25 +100,23 @@ class Topic:
     def connector_type_enum(self) -> EventType:
         return EventType(self.event_type)
 
-    @staticmethod
-    def from_dict(data: Dict[str, Any]) -> "Topic":
-        return Topic(
-            broker_id=data["brokerid"],
-            topic=data["topic"],
-            payload=data["payload"],
-            event_type=EventType(data["eventtype"]),
-        )
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "brokerid": self.broker_id,
-            "topic": self.topic,
-            "payload": self.payload,
-            "eventtype": self.event_type,
-        }
-
 
+@dict_model
 class Core:
+    FIELDS = (
+        Field("name", "name"),
+        Field("location", "location"),
+        Field("auto_backup", "autobackup"),
+        Field("brightness_large_display", "brightnesslargedisplay"),
+        Field("brightness_mini_display", "brightnessminidisplay"),
+        Field("led_color_front", "ledcolorfront"),
+        Field("led_color_wall", "ledcolorwall"),
+        Field("color", "color"),
+        # Only the Core object does not include the key when this list is empty (-:
+        Field("topics", "topics", model=Topic, many=True, default=(), omit_empty=True),
+    )
+    __slots__ = slots(FIELDS)
+
     def __init__(
         self,
         name: str,
@@ -142,40 +139,21 @@ class Core:
         self.color = color
         self.topics = topics
 
-    @staticmethod
-    def from_dict(data: Dict[str, Any]) -> "Core":
-        return Core(
-            name=data["name"],
-            location=data["location"],
-            auto_backup=data["autobackup"],
-            brightness_large_display=data["brightnesslargedisplay"],
-            brightness_mini_display=data["brightnessminidisplay"],
-            led_color_front=data["ledcolorfront"],
-            led_color_wall=data["ledcolorwall"],
-            color=data["color"],
-            topics=[Topic.from_dict(topic) for topic in data.get("topics", [])],
-        )
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "name": self.name,
-            "location": self.location,
-            "autobackup": self.auto_backup,
-            "brightnesslargedisplay": self.brightness_large_display,
-            "brightnessminidisplay": self.brightness_mini_display,
-            "ledcolorfront": self.led_color_front,
-            "ledcolorwall": self.led_color_wall,
-            "color": self.color,
-            # Only the Core object does not include the key when this list is empty (-:
-            **(
-                {"topics": [topic.to_dict() for topic in self.topics]}
-                if len(self.topics) > 0
-                else {}
-            ),
-        }
-
 
+@dict_model
 class MqttButton(Button):
+    FIELDS = (
+        Field("button_id", "id"),
+        Field("label", "label"),
+        Field("top_label", "toplabel"),
+        Field("led_color_front", "ledcolorfront"),
+        Field("led_color_wall", "ledcolorwall"),
+        Field("long_delay", "longdelay"),
+        Field("long_repeat", "longrepeat"),
+        Field("topics", "topics", model=Topic, many=True, default=()),
+    )
+    __slots__ = slots(FIELDS)
+
     def __init__(
         self,
         button_id: int,
@@ -197,35 +175,31 @@ class MqttButton(Button):
         self.topics = topics
 
     def add_topic(self, topic: str, event_type: EventType, payload: str = "") -> None:
-        self.topics.append(Topic("ha-button-plus", topic, payload, event_type))
-
-    @staticmethod
-    def from_dict(data: Dict[str, Any]) -> "MqttButton":
-        return MqttButton(
-            button_id=data["id"],
-            label=data["label"],
-            top_label=data["toplabel"],
-            led_color_front=data["ledcolorfront"],
-            led_color_wall=data["ledcolorwall"],
-            long_delay=data["longdelay"],
-            long_repeat=data["longrepeat"],
-            topics=[Topic.from_dict(topic) for topic in data.get("topics", [])],
-        )
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "id": self.button_id,
-            "label": self.label,
-            "toplabel": self.top_label,
-            "ledcolorfront": self.led_color_front,
-            "ledcolorwall": self.led_color_wall,
-            "longdelay": self.long_delay,
-            "longrepeat": self.long_repeat,
-            "topics": [topic.to_dict() for topic in self.topics],
-        }
+        for existing in self.topics:
+            if existing.topic == topic and existing.event_type == event_type:
+                existing.broker_id = "ha-button-plus"
+                existing.payload = payload
+                return
 
+        self.topics.append(Topic("ha-button-plus", topic, payload, event_type))
+        invalidate(self)
+
+
+@dict_model
+class MqttDisplay(Display):
+    FIELDS = (
+        Field("x", "x"),
+        Field("y", "y"),
+        Field("font_size", "fontsize"),
+        Field("align", "align"),
+        Field("width", "width"),
+        Field("label", "label"),
+        Field("unit", "unit"),
+        Field("round", "round"),
+        Field("topics", "topics", model=Topic, many=True, default=()),
+    )
+    __slots__ = slots(FIELDS)
 
-class MqttDisplay:
     def __init__(
         self,
         x: int,
@@ -248,35 +222,19 @@ class MqttDisplay:
         self.round = round
         self.topics = topics
 
-    @staticmethod
-    def from_dict(data: Dict[str, Any]) -> "MqttDisplay":
-        return MqttDisplay(
-            x=data["x"],
-            y=data["y"],
-            font_size=data["fontsize"],
-            align=data["align"],
-            width=data["width"],
-            label=data["label"],
-            unit=data["unit"],
-            round=data["round"],
-            topics=[Topic.from_dict(topic) for topic in data.get("topics", [])],
-        )
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "x": self.x,
-            "y": self.y,
-            "fontsize": self.font_size,
-            "align": self.align,
-            "width": self.width,
-            "label": self.label,
-            "unit": self.unit,
-            "round": self.round,
-            "topics": [topic.to_dict() for topic in self.topics],
-        }
-
 
+@dict_model
 class MqttBroker:
+    FIELDS = (
+        Field("broker_id", "brokerid", fallback="ha-button-plus"),
+        Field("url", "url"),
+        Field("port", "port"),
+        Field("ws_port", "wsport"),
+        Field("username", "username"),
+        Field("password", "password"),
+    )
+    __slots__ = slots(FIELDS)
+
     def __init__(
         self,
         url: str,
@@ -293,51 +251,35 @@ class MqttBroker:
         self.broker_id = broker_id
         self.ws_port = ws_port
 
-    @staticmethod
-    def from_dict(data: Dict[str, Any]) -> "MqttBroker":
-        return MqttBroker(
-            broker_id=data["brokerid"] or "ha-button-plus",
-            url=data["url"],
-            port=data["port"],
-            ws_port=data["wsport"],
-            username=data["username"],
-            password=data["password"],
-        )
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "brokerid": self.broker_id or "ha-button-plus",
-            "url": self.url,
-            "port": self.port,
-            "wsport": self.ws_port,
-            "username": self.username,
-            "password": self.password,
-        }
-
 
+@dict_model
 class MqttSensor:
+    FIELDS = (
+        Field("sensor_id", "sensorid"),
+        Field("topic", "topic", model=Topic),
+        Field("interval", "interval"),
+    )
+    __slots__ = slots(FIELDS)
+
     def __init__(self, sensor_id: int, topic: Topic, interval: int):
         self.sensor_id = sensor_id
         self.topic = topic
         self.interval = interval
 
-    @staticmethod
-    def from_dict(data: Dict[str, Any]) -> "MqttSensor":
-        return MqttSensor(
-            sensor_id=data["sensorid"],
-            topic=Topic.from_dict(data["topic"]),
-            interval=data["interval"],
-        )
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "sensorid": self.sensor_id,
-            "topic": self.topic.to_dict(),
-            "interval": self.interval,
-        }
-
 
+# Also handles the firmware before 1.07
+@ModelDetection.register("0")
+@dict_model(cache=False)
 class DeviceConfiguration:
+    FIELDS = (
+        Field("info", "info", model=Info),
+        Field("core", "core", model=Core),
+        Field("mqtt_buttons", "mqttbuttons", model=MqttButton, many=True, lazy=True),
+        Field("mqtt_displays", "mqttdisplays", model=MqttDisplay, many=True, lazy=True),
+        Field("mqtt_brokers", "mqttbrokers", model=MqttBroker, many=True, lazy=True),
+        Field("mqtt_sensors", "mqttsensors", model=MqttSensor, many=True, lazy=True),
+    )
+
     def __init__(
         self,
         info: Info,
@@ -354,11 +296,15 @@ class DeviceConfiguration:
         self.mqtt_brokers = mqtt_brokers
         self.mqtt_sensors = mqtt_sensors
 
+    @property
+    def capabilities(self) -> Capabilities:
+        return capabilities_for(self.info.firmware)
+
     def firmware_version(self) -> Version:
-        return parseVersion(self.info.firmware)
+        return self.capabilities.version
 
     def supports_brightness(self) -> bool:
-        return self.firmware_version() >= parseVersion("1.11")
+        return Capability.BRIGHTNESS in self.capabilities
 
     def name(self) -> str:
         return self.core.name or self.info.device_id
@@ -375,25 +321,67 @@ class DeviceConfiguration:
     def location(self) -> str:
         return self.core.location
 
-    def connector_for(self, identifier: int) -> Connector:
-        return next(
-            (
-                connector
-                for connector in self.info.connectors
-                if connector.identifier() == identifier
-            ),
-            None,
+    # The indexes below are built on first use and kept on the instance, so a
+    # restore(), which resets the instance, drops them as well. Each is kept
+    # with the list it was built from and its length, and is rebuilt when the
+    # list was replaced or changed behind our back
+
+    def _indexed(self, name: str, source: List[Any], build: Callable[[], Any]) -> Any:
+        indexed = self.__dict__.get(name)
+        if indexed is not None and indexed[0] is source and indexed[1] == len(source):
+            return indexed[2]
+
+        index = build()
+        self.__dict__[name] = (source, len(source), index)
+        return index
+
+    def _connectors_by_id(self) -> Dict[int, Connector]:
+        connectors = self.info.connectors
+        return self._indexed(
+            "_connectors_by_id_index",
+            connectors,
+            lambda: {connector.identifier(): connector for connector in connectors},
         )
 
+    def _buttons_by_connector(self) -> Dict[int, List[Button]]:
+        def build() -> Dict[int, List[Button]]:
+            index: Dict[int, List[Button]] = {}
+            for button in self.mqtt_buttons:
+                # Each connector has two buttons, see add_topics_to_buttons
+                index.setdefault(button.button_id // 2, []).append(button)
+            return index
+
+        return self._indexed("_buttons_by_connector_index", self.mqtt_buttons, build)
+
+    def _index_topics(self) -> Dict[EventType, List[Topic]]:
+        def build() -> Dict[EventType, List[Topic]]:
+            index: Dict[EventType, List[Topic]] = {}
+            for topic in self.core.topics:
+                index.setdefault(topic.event_type, []).append(topic)
+            return index
+
+        return self._indexed("_topics_index", self.core.topics, build)
+
+    def connector_for(self, identifier: int) -> Optional[Connector]:
+        return self._connectors_by_id().get(identifier)
+
     def connectors_for(self, *connector_type: ConnectorType) -> List[Connector]:
-        _LOGGER.debug(
-            f"Filter all {len(self.info.connectors)} connectors by type {connector_type}"
+        """Return the connectors of the types, in the order of the device.
+
+        The list is shared by all callers, do not change it. It is a new list
+        once the connectors changed.
+        """
+        by_types = self._indexed(
+            "_connectors_by_types_index", self.info.connectors, dict
         )
-        return [
-            connector
-            for connector in self.info.connectors
-            if connector.connector_type() in connector_type
-        ]
+        connectors = by_types.get(connector_type)
+        if connectors is None:
+            connectors = by_types[connector_type] = [
+                connector
+                for connector in self.info.connectors
+                if connector.connector_type() in connector_type
+            ]
+        return connectors
 
     def connectors(self) -> List[Connector]:
         return self.info.connectors
@@ -401,56 +389,86 @@ class DeviceConfiguration:
     def buttons(self) -> List[Button]:
         return [button for button in self.mqtt_buttons]
 
+    def buttons_for(self, *connector_type: ConnectorType) -> List[Button]:
+        """Return the buttons on connectors of the types, in the order of the device.
+
+        The list is shared by all callers, do not change it.
+        """
+        connectors = self.connectors_for(*connector_type)
+        by_types = self._indexed("_buttons_by_types_index", self.mqtt_buttons, dict)
+        indexed = by_types.get(connector_type)
+        # Built for other connectors when connectors_for returned another list
+        if indexed is None or indexed[0] is not connectors:
+            by_connector = self._buttons_by_connector()
+            indexed = by_types[connector_type] = (
+                connectors,
+                [
+                    button
+                    for connector in connectors
+                    for button in by_connector.get(connector.identifier(), ())
+                ],
+            )
+        return indexed[1]
+
+    def displays(self) -> List[Display]:
+        return self.mqtt_displays
+
     def set_broker(self, url: str, port: int, username: str, password: str) -> None:
-        self.mqtt_brokers.append(MqttBroker(url, port, username, password))
+        broker = MqttBroker(url, port, username, password)
+        for index, existing in enumerate(self.mqtt_brokers):
+            if existing.broker_id == broker.broker_id:
+                self.mqtt_brokers[index] = broker
+                return
+
+        self.mqtt_brokers.append(broker)
 
     def add_topic(self, topic: str, event_type: EventType) -> None:
-        self.core.topics.append(
-            Topic(
-                broker_id="ha-button-plus",
-                topic=topic,
-                payload="",
-                event_type=event_type,
-            )
+        index = self._index_topics()
+        for existing in index.get(event_type, ()):
+            if existing.topic == topic:
+                existing.broker_id = "ha-button-plus"
+                existing.payload = ""
+                return
+
+        new_topic = Topic(
+            broker_id="ha-button-plus",
+            topic=topic,
+            payload="",
+            event_type=event_type,
         )
+        self.core.topics.append(new_topic)
+        invalidate(self.core)
+        index.setdefault(new_topic.event_type, []).append(new_topic)
+        self._topics_index = (self.core.topics, len(self.core.topics), index)
 
     def remove_topic_for(self, event_type: EventType) -> None:
+        index = self._index_topics()
+        if event_type not in index:
+            return
+
         # Remove the topic with EventType event_type
+        del index[event_type]
         self.core.topics = [
             topic for topic in self.core.topics if topic.event_type != event_type
         ]
+        self._topics_index = (self.core.topics, len(self.core.topics), index)
 
     def topics(self) -> List[Topic]:
         return self.core.topics
 
-    @staticmethod
-    def from_dict(data: Dict[str, Any]) -> "DeviceConfiguration":
-        return DeviceConfiguration(
-            info=Info.from_dict(data["info"]),
-            core=Core.from_dict(data["core"]),
-            mqtt_buttons=[
-                MqttButton.from_dict(button) for button in data["mqttbuttons"]
-            ],
-            mqtt_displays=[
-                MqttDisplay.from_dict(display) for display in data["mqttdisplays"]
-            ],
-            mqtt_brokers=[
-                MqttBroker.from_dict(broker) for broker in data["mqttbrokers"]
-            ],
-            mqtt_sensors=[
-                MqttSensor.from_dict(sensor) for sensor in data["mqttsensors"]
-            ],
-        )
+    def topics_for(self, event_type: EventType) -> List[Topic]:
+        return self._index_topics().get(event_type, [])
 
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "info": self.info.to_dict(),
-            "core": self.core.to_dict(),
-            "mqttbuttons": [button.to_dict() for button in self.mqtt_buttons],
-            "mqttdisplays": [display.to_dict() for display in self.mqtt_displays],
-            "mqttbrokers": [broker.to_dict() for broker in self.mqtt_brokers],
-            "mqttsensors": [sensor.to_dict() for sensor in self.mqtt_sensors],
-        }
+    def snapshot(self) -> Dict[str, Any]:
+        # The dicts to_dict returns are never changed, edits build new ones
+        return self.to_dict()
+
+    def restore(self, data: Dict[str, Any]) -> None:
+        # from_dict of the instance, so v1.12 restores v1.12 objects
+        restored = self.from_dict(data)
+        # Also drops the raw sections of a lazily parsed configuration
+        self.__dict__.clear()
+        self.__dict__.update(restored.__dict__)
 
     def to_json(self) -> str:
         return json.dumps(
@@ -459,3 +477,11 @@ class DeviceConfiguration:
             cls=CustomEncoder,
             indent=4,
         )
+
+    def to_wire_json(self) -> bytes:
+        return wire_json.dumps(self.to_dict())
+
+    def content_hash(self) -> str:
+        # The same hash whatever sections were read
+        canonical = wire_json.dumps(canonical_dict(self), sort_keys=True)
+        return hashlib.sha256(canonical).hexdigest()
@@ -1,16 +1,24 @@
-from typing import List, Dict, Any
+from typing import List, Optional
+from .model_detection import ModelDetection
+from .model_fields import Field, dict_model, slots
 from .model_v1_07 import (
     Connector,
     Sensor,
+    Info as Info_v1_07,
     Topic,
-    MqttButton,
+    MqttButton as MqttButton_v1_07,
     MqttBroker,
     MqttSensor,
     DeviceConfiguration as DeviceConfiguration_v1_07,
 )
+from .model_interface import Display
 
 
+@dict_model
 class Info:
+    FIELDS = Info_v1_07.FIELDS
+    __slots__ = slots(FIELDS)
+
     def __init__(
         self,
         device_id: str,
@@ -29,33 +37,20 @@ class Info:
         self.connectors = connectors
         self.sensors = sensors
 
-    @staticmethod
-    def from_dict(data: Dict[str, Any]) -> "Info":
-        return Info(
-            device_id=data["id"],
-            mac=data["mac"],
-            ip_address=data["ipaddress"],
-            firmware=data["firmware"],
-            large_display=data["largedisplay"],
-            connectors=[
-                Connector.from_dict(connector) for connector in data["connectors"]
-            ],
-            sensors=[Sensor.from_dict(sensor) for sensor in data["sensors"]],
-        )
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "id": self.device_id,
-            "mac": self.mac,
-            "ipaddress": self.ip_address,
-            "firmware": self.firmware,
-            "largedisplay": self.large_display,
-            "connectors": [connector.to_dict() for connector in self.connectors],
-            "sensors": [sensor.to_dict() for sensor in self.sensors],
-        }
-
 
+@dict_model
 class Core:
+    FIELDS = (
+        Field("name", "name"),
+        Field("location", "location"),
+        Field("auto_backup", "autobackup"),
+        Field("brightness", "brightness"),
+        Field("color", "color"),
+        Field("statusbar", "statusbar"),
+        Field("topics", "topics", model=Topic, many=True),
+    )
+    __slots__ = slots(FIELDS)
+
     def __init__(
         self,
         name: str,
@@ -74,31 +69,38 @@ class Core:
         self.statusbar = statusbar
         self.topics = topics
 
-    @staticmethod
-    def from_dict(data: Dict[str, Any]) -> "Core":
-        return Core(
-            name=data["name"],
-            location=data["location"],
-            auto_backup=data["autobackup"],
-            brightness=data["brightness"],
-            color=data["color"],
-            statusbar=data["statusbar"],
-            topics=[Topic.from_dict(topic) for topic in data["topics"]],
-        )
 
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "name": self.name,
-            "location": self.location,
-            "autobackup": self.auto_backup,
-            "brightness": self.brightness,
-            "color": self.color,
-            "statusbar": self.statusbar,
-            "topics": [topic.to_dict() for topic in self.topics],
-        }
+@dict_model
+class MqttButton(MqttButton_v1_07):
+    FIELDS = (
+        *MqttButton_v1_07.FIELDS,
+        Field("page", "page", default=None, omit_none=True),
+    )
+    # The other slots are those of MqttButton_v1_07
+    __slots__ = ("_field_page",)
+
+    def __init__(self, *args, page: Optional[int] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.page = page
 
 
-class MqttDisplay:
+@dict_model
+class MqttDisplay(Display):
+    FIELDS = (
+        Field("x", "x"),
+        Field("y", "y"),
+        Field("box_type", "boxtype"),
+        Field("font_size", "fontsize"),
+        Field("align", "align"),
+        Field("width", "width"),
+        Field("label", "label"),
+        Field("unit", "unit"),
+        Field("round", "round"),
+        Field("page", "page"),
+        Field("topics", "topics", model=Topic, many=True),
+    )
+    __slots__ = slots(FIELDS)
+
     def __init__(
         self,
         align: int,
@@ -125,40 +127,20 @@ class MqttDisplay:
         self.page = page
         self.topics = topics
 
-    @staticmethod
-    def from_dict(data: Dict[str, Any]) -> "MqttDisplay":
-        return MqttDisplay(
-            x=data["x"],
-            y=data["y"],
-            box_type=data["boxtype"],
-            font_size=data["fontsize"],
-            align=data["align"],
-            width=data["width"],
-            label=data["label"],
-            unit=data["unit"],
-            round=data["round"],
-            page=data["page"],
-            topics=[Topic.from_dict(topic) for topic in data["topics"]],
-        )
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "x": self.x,
-            "y": self.y,
-            "boxtype": self.box_type,
-            "fontsize": self.font_size,
-            "align": self.align,
-            "width": self.width,
-            "label": self.label,
-            "unit": self.unit,
-            "round": self.round,
-            "page": self.page,
-            "topics": [topic.to_dict() for topic in self.topics],
-        }
-
 
+@ModelDetection.register("1.12.0")
+@dict_model(cache=False)
 class DeviceConfiguration(DeviceConfiguration_v1_07):
-    # Info, Core and MqttDisplay are different, so we need to redefine those
+    FIELDS = (
+        Field("info", "info", model=Info),
+        Field("core", "core", model=Core),
+        Field("mqtt_buttons", "mqttbuttons", model=MqttButton, many=True, lazy=True),
+        Field("mqtt_displays", "mqttdisplays", model=MqttDisplay, many=True, lazy=True),
+        Field("mqtt_brokers", "mqttbrokers", model=MqttBroker, many=True, lazy=True),
+        Field("mqtt_sensors", "mqttsensors", model=MqttSensor, many=True, lazy=True),
+    )
+
+    # Info, Core, MqttButton and MqttDisplay are different, so we need to redefine those
     def __init__(
         self,
         info: Info,
@@ -174,23 +156,3 @@ class DeviceConfiguration(DeviceConfiguration_v1_07):
         self.mqtt_displays = mqtt_displays
         self.mqtt_brokers = mqtt_brokers
         self.mqtt_sensors = mqtt_sensors
-
-    # Same here, use the new classes for Info, Core and MqttDisplay
-    @staticmethod
-    def from_dict(data: Dict[str, Any]) -> "DeviceConfiguration":
-        return DeviceConfiguration(
-            info=Info.from_dict(data["info"]),
-            core=Core.from_dict(data["core"]),
-            mqtt_buttons=[
-                MqttButton.from_dict(button) for button in data["mqttbuttons"]
-            ],
-            mqtt_displays=[
-                MqttDisplay.from_dict(display) for display in data["mqttdisplays"]
-            ],
-            mqtt_brokers=[
-                MqttBroker.from_dict(broker) for broker in data["mqttbrokers"]
-            ],
-            mqtt_sensors=[
-                MqttSensor.from_dict(sensor) for sensor in data["mqttsensors"]
-            ],
-        )
@@ -0,0 +1,274 @@
+"""Configuration model reading and writing straight through the device JSON.
+
+Where the models of model_v1_07 and model_v1_12 copy every field into
+attributes and back, the objects here only wrap the dicts of the JSON as
+the device sent it. Nothing is copied on parsing, ``to_dict`` returns the
+wrapped dict itself and keys this integration does not know, like ``i2cs``
+or ``invert``, are sent back to the device as they came. The same classes
+serve every firmware version.
+
+Views are made on every access, they are cheap and hold no state of their
+own. Lists returned by the views are new lists, changes go through methods.
+"""
+
+import copy
+import hashlib
+import json
+from enum import Enum
+from typing import Any, Dict, List, Optional, Type
+
+from packaging.version import Version
+
+from . import wire_json
+from .capabilities import Capabilities, Capability, capabilities_for
+from .connector_type import ConnectorType
+from .event_type import EventType
+from .model_interface import (
+    Button,
+    Connector as ConnectorInterface,
+    DeviceConfiguration as DeviceConfigurationInterface,
+    Display,
+    Topic as TopicInterface,
+)
+
+
+def _key(key: str, default: Any = None) -> property:
+    def get(self):
+        return self._data.get(key, default)
+
+    def set_key(self, value) -> None:
+        self._data[key] = value
+
+    return property(get, set_key)
+
+
+def _enum_key(key: str, enum: Type[Enum]) -> property:
+    members = enum._value2member_map_
+
+    def get(self):
+        # Values of newer firmware that are not a member stay plain ints
+        value = self._data[key]
+        return members.get(value, value)
+
+    def set_key(self, value) -> None:
+        self._data[key] = int(value)
+
+    return property(get, set_key)
+
+
+class View:
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._data
+
+
+class Connector(View, ConnectorInterface):
+    __slots__ = ()
+
+    def identifier(self) -> int:
+        return self._data["id"]
+
+    def connector_type(self) -> ConnectorType:
+        return ConnectorType(self._data["type"])
+
+
+class Topic(View, TopicInterface):
+    __slots__ = ()
+
+    broker_id = _key("brokerid")
+    topic = _key("topic")
+    payload = _key("payload")
+    event_type = _enum_key("eventtype", EventType)
+
+
+def _set_topic(
+    topics: List[Dict[str, Any]], topic: str, event_type: EventType, payload: str
+) -> None:
+    values = {
+        "brokerid": "ha-button-plus",
+        "topic": topic,
+        "payload": payload,
+        "eventtype": int(event_type),
+    }
+    for existing in topics:
+        if existing.get("topic") == topic and existing.get("eventtype") == event_type:
+            existing.update(values)
+            return
+    topics.append(values)
+
+
+class MqttButton(View, Button):
+    __slots__ = ()
+
+    button_id = _key("id")
+    label = _key("label")
+    top_label = _key("toplabel")
+    # Absent on firmware that does not spread buttons over pages
+    page = _key("page")
+
+    @property
+    def topics(self) -> List[Topic]:
+        return [Topic(topic) for topic in self._data.get("topics", ())]
+
+    def add_topic(self, topic: str, event_type: EventType, payload: str = "") -> None:
+        _set_topic(self._data.setdefault("topics", []), topic, event_type, payload)
+
+
+class MqttDisplay(View, Display):
+    __slots__ = ()
+
+    label = _key("label")
+    # Absent on firmware before 1.12
+    page = _key("page")
+
+    @property
+    def topics(self) -> List[Topic]:
+        return [Topic(topic) for topic in self._data.get("topics", ())]
+
+
+class DeviceConfiguration(DeviceConfigurationInterface):
+    """DeviceConfiguration over the dict of the device JSON, for any firmware.
+
+    The dict is changed in place by the edits. Lookups scan the JSON, the
+    lists they go over hold a few dozen items at most.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+
+    @property
+    def _info(self) -> Dict[str, Any]:
+        return self._data["info"]
+
+    @property
+    def _core(self) -> Dict[str, Any]:
+        return self._data["core"]
+
+    @property
+    def capabilities(self) -> Capabilities:
+        return capabilities_for(self._info["firmware"])
+
+    def firmware_version(self) -> Version:
+        return self.capabilities.version
+
+    def supports_brightness(self) -> bool:
+        return Capability.BRIGHTNESS in self.capabilities
+
+    def name(self) -> str:
+        return self._core.get("name") or self.identifier()
+
+    def identifier(self) -> str:
+        return self._info["id"]
+
+    def ip_address(self) -> str:
+        return self._info["ipaddress"]
+
+    def mac_address(self) -> str:
+        return self._info["mac"]
+
+    def location(self) -> str:
+        return self._core.get("location")
+
+    def connectors(self) -> List[Connector]:
+        return [Connector(connector) for connector in self._info["connectors"]]
+
+    def connector_for(self, identifier: int) -> Optional[Connector]:
+        for connector in self._info["connectors"]:
+            if connector["id"] == identifier:
+                return Connector(connector)
+        return None
+
+    def connectors_for(self, *connector_type: ConnectorType) -> List[Connector]:
+        return [
+            Connector(connector)
+            for connector in self._info["connectors"]
+            if connector["type"] in connector_type
+        ]
+
+    def buttons(self) -> List[MqttButton]:
+        return [MqttButton(button) for button in self._data.get("mqttbuttons", ())]
+
+    def buttons_for(self, *connector_type: ConnectorType) -> List[MqttButton]:
+        # Each connector has two buttons, see add_topics_to_buttons
+        by_connector: Dict[int, List[MqttButton]] = {}
+        for button in self._data.get("mqttbuttons", ()):
+            by_connector.setdefault(button["id"] // 2, []).append(MqttButton(button))
+        return [
+            button
+            for connector in self.connectors_for(*connector_type)
+            for button in by_connector.get(connector.identifier(), ())
+        ]
+
+    def displays(self) -> List[MqttDisplay]:
+        return [MqttDisplay(display) for display in self._data.get("mqttdisplays", ())]
+
+    def set_broker(self, url: str, port: int, username: str, password: str) -> None:
+        values = {
+            "brokerid": "ha-button-plus",
+            "url": url,
+            "port": port,
+            "wsport": 9001,
+            "username": username,
+            "password": password,
+        }
+        brokers = self._data.setdefault("mqttbrokers", [])
+        for existing in brokers:
+            if existing.get("brokerid") == values["brokerid"]:
+                existing.update(values)
+                return
+        brokers.append(values)
+
+    def add_topic(self, topic: str, event_type: EventType) -> None:
+        _set_topic(self._core.setdefault("topics", []), topic, event_type, "")
+
+    def remove_topic_for(self, event_type: EventType) -> None:
+        topics = self._core.get("topics")
+        if topics:
+            self._core["topics"] = [
+                topic for topic in topics if topic["eventtype"] != event_type
+            ]
+
+    def topics(self) -> List[Topic]:
+        return [Topic(topic) for topic in self._core.get("topics", ())]
+
+    def topics_for(self, event_type: EventType) -> List[Topic]:
+        return [
+            Topic(topic)
+            for topic in self._core.get("topics", ())
+            if topic["eventtype"] == event_type
+        ]
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> "DeviceConfiguration":
+        return DeviceConfiguration(data)
+
+    @staticmethod
+    def lazy_from_dict(data: Dict[str, Any]) -> "DeviceConfiguration":
+        # There is nothing to parse up front either way
+        return DeviceConfiguration(data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._data
+
+    def snapshot(self) -> Dict[str, Any]:
+        # to_dict is the live dict, which the edits change
+        return copy.deepcopy(self._data)
+
+    def restore(self, data: Dict[str, Any]) -> None:
+        self._data.clear()
+        self._data.update(data)
+
+    def to_json(self) -> str:
+        return json.dumps(self._data, sort_keys=True, indent=4)
+
+    def to_wire_json(self) -> bytes:
+        return wire_json.dumps(self._data)
+
+    def content_hash(self) -> str:
+        return hashlib.sha256(wire_json.dumps(self._data, sort_keys=True)).hexdigest()
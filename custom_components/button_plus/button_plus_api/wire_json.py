@@ -0,0 +1,23 @@
+"""Compact JSON for sending configurations to the device.
+
+The device parses what it is sent on a small microcontroller, so the wire
+format has no indentation or spaces after separators. orjson is used when it
+is installed, as it is with Home Assistant, otherwise the standard library.
+"""
+
+import json
+from typing import Any, Dict
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def dumps(data: Dict[str, Any], sort_keys: bool = False) -> bytes:
+    """Serialize the output of ``to_dict`` to compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return json.dumps(
+        data, sort_keys=sort_keys, separators=(",", ":"), ensure_ascii=False
+    ).encode()
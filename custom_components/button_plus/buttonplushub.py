@@ -2,19 +2,34 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import List
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import aiohttp_client
+from homeassistant.components.mqtt import client as mqtt
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import device_registry as DeviceRegistry
 from homeassistant.helpers.device_registry import DeviceEntry
 
 from .button_plus_api.connector_type import ConnectorType
 from .button_plus_api.local_api_client import LocalApiClient
 from .button_plus_api.model_interface import DeviceConfiguration
-from .const import DOMAIN, MANUFACTURER
+from .const import (
+    CONF_PUBLISH_BURST,
+    CONF_PUBLISH_RATE,
+    DEFAULT_PUBLISH_BURST,
+    DEFAULT_PUBLISH_RATE,
+    DOMAIN,
+    MANUFACTURER,
+)
+from .latency import LatencyTracker
+from .local_client import async_get_local_client
+from .offline_queue import OfflineQueue
+from .page_tracker import PageTracker
+from .publish_cache import PublishCache
+from .publish_scheduler import PublishScheduler
+from .topic_router import RouteAction, TopicRouter
 
 _LOGGER: logging.Logger = logging.getLogger(__package__)
 
@@ -30,14 +45,29 @@ class ButtonPlusHub:
         self.config = config
         self._name = config.name()
         self.identifier = config.identifier()
-        self._client = LocalApiClient(
-            config.ip_address(), aiohttp_client.async_get_clientsession(hass)
-        )
+        self._client = async_get_local_client(hass, config.ip_address())
         self.online = True
         self.button_entities = {}
         self.label_entities = {}
         self.top_label_entities = {}
         self.brightness_entities = {}
+        self.router = TopicRouter(self.identifier)
+        self.latency = LatencyTracker()
+        self.publish_cache = PublishCache()
+        self.offline_queue = OfflineQueue()
+        self.pages = PageTracker.from_config(config)
+        self.scheduler = PublishScheduler(
+            hass,
+            self._async_send,
+            entry.options.get(CONF_PUBLISH_RATE, DEFAULT_PUBLISH_RATE),
+            entry.options.get(CONF_PUBLISH_BURST, DEFAULT_PUBLISH_BURST),
+        )
+        self.router.add_route(RouteAction.PAGE, "status", "page", "status")
+        self.router.add_route(RouteAction.PAGE, "set", "page", "set")
+        # The firmware has no last will, this is for a broker or bridge set up to
+        # publish online/offline. Otherwise the drift checks of the device API
+        # take the hub offline and MQTT messages from the device bring it back
+        self.router.add_route(RouteAction.AVAILABILITY, None, "availability")
 
         self.manufacturer = MANUFACTURER
         self.model = "Base Module"
@@ -146,8 +176,90 @@ class ButtonPlusHub:
     def name(self) -> str:
         return self._name
 
+    async def async_publish(self, topic: str, payload) -> None:
+        """Publish a retained payload, unless it is already the retained one."""
+        if not self.online:
+            # Anything still waiting for a token is older than this payload
+            self.scheduler.discard(topic)
+            self.offline_queue.put(topic, payload)
+            return
+
+        if self.pages.defer(topic, payload):
+            _LOGGER.debug(f"Defer publish to {topic} until its page is shown")
+            return
+
+        # A payload waiting in the scheduler replaces the one that is retained now
+        if not self.scheduler.is_pending(topic) and self.publish_cache.is_current(
+            topic, payload
+        ):
+            _LOGGER.debug(f"Skip publish to {topic}, payload is unchanged")
+            return
+
+        await self.scheduler.async_publish(topic, payload)
+
+    async def _async_send(self, topic: str, payload) -> None:
+        if not self.online:
+            # Released by the scheduler just before the device went away, a
+            # payload queued since is newer
+            if topic not in self.offline_queue:
+                self.offline_queue.put(topic, payload)
+            return
+
+        if self.publish_cache.is_current(topic, payload):
+            return
+
+        await mqtt.async_publish(
+            hass=self._hass, topic=topic, payload=payload, qos=0, retain=True
+        )
+        self.publish_cache.record(topic, payload)
+
+    @callback
+    def async_set_online(self, online: bool) -> None:
+        """Track the availability of the device, flush the queue when it returns."""
+        if online == self.online:
+            return
+
+        self.online = online
+        _LOGGER.info(f"Hub {self._name} is {'online' if online else 'offline'}")
+
+        if online:
+            # The device may have lost what it rendered, don't trust the cache
+            self.publish_cache.invalidate()
+            self._hass.async_create_task(self._async_flush_offline_queue())
+        else:
+            # Payloads waiting for a token wait for the device instead
+            for topic, payload in self.scheduler.async_take_pending():
+                self.offline_queue.put(topic, payload)
+
+    async def async_set_page(self, page: int) -> None:
+        """Track the page shown on the display, publish what waited for it."""
+        pending = self.pages.set_page(page)
+        if pending:
+            _LOGGER.debug(f"Hub {self._name} shows page {page}, publish {len(pending)}")
+            await asyncio.gather(
+                *(self.async_publish(topic, payload) for topic, payload in pending)
+            )
+
+    async def _async_flush_offline_queue(self) -> None:
+        pending = self.offline_queue.drain()
+        _LOGGER.debug(f"Hub {self._name} flushes {len(pending)} queued publishes")
+        # Through the rate limit and the page deferral, as any other publish
+        await asyncio.gather(
+            *(self.async_publish(topic, payload) for topic, payload in pending)
+        )
+
+    @callback
+    def async_mqtt_connection_changed(self, connected: bool) -> None:
+        # The broker may have lost its retained messages, publish everything again
+        if connected:
+            self.publish_cache.invalidate()
+
     def add_button(self, button_id, entity):
         self.button_entities[str(button_id)] = entity
+        self.router.add_route(RouteAction.CLICK, entity, "button", button_id, "click")
+        self.router.add_route(
+            RouteAction.LONG_PRESS, entity, "button", button_id, "long_press"
+        )
 
     def add_label(self, button_id, entity):
         self.label_entities[str(button_id)] = entity
@@ -157,3 +269,4 @@ class ButtonPlusHub:
 
     def add_brightness(self, identifier, entity):
         self.brightness_entities[identifier] = entity
+        self.router.add_route(RouteAction.BRIGHTNESS, entity, "brightness", identifier)
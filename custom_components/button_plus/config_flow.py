@@ -11,18 +11,25 @@ from json import JSONDecodeError
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_IP_ADDRESS, CONF_EMAIL, CONF_PASSWORD
+from homeassistant.core import callback
 from homeassistant.helpers import aiohttp_client
 from homeassistant.helpers.network import get_url
 
 from . import ModelDetection
 from .button_plus_api.api_client import ApiClient
-from .button_plus_api.local_api_client import LocalApiClient
-from .button_plus_api.model_interface import (
-    ConnectorType,
-    DeviceConfiguration,
+from .button_plus_api.discovery import MIN_PREFIX_LENGTH, LocalDiscovery
+from .button_plus_api.model_interface import DeviceConfiguration
+from .const import (
+    CONF_DRIFT_INTERVAL,
+    CONF_PUBLISH_BURST,
+    CONF_PUBLISH_RATE,
+    DEFAULT_DRIFT_INTERVAL,
+    DEFAULT_PUBLISH_BURST,
+    DEFAULT_PUBLISH_RATE,
+    DOMAIN,
 )
-from .button_plus_api.event_type import EventType
-from .const import DOMAIN
+from .local_client import async_get_local_client
+from .provisioning import BrokerSettings, mqtt_endpoint, provision
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,15 +37,21 @@ _LOGGER = logging.getLogger(__name__)
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Button+."""
 
-    local_brokers = ["core-mosquitto", "127.0.0.1", "localhost"]
-
     def __init__(self):
         self.mqtt_entry = None
         self.broker_endpoint = None
+        self.discovered_devices = {}
 
     VERSION = 1
     CONNECTION_CLASS = config_entries.CONN_CLASS_LOCAL_PUSH
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlowHandler:
+        return OptionsFlowHandler(config_entry)
+
     async def async_step_user(self, user_input=None):
         """Handle the initial Button+ setup, showing the 2 options and checking the MQTT integration."""
         errors = {}
@@ -53,7 +66,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             )
 
         mqtt_entry = mqtt_entries[0]
-        broker = self.get_mqtt_endpoint(mqtt_entry.data.get("broker"))
+        broker = mqtt_endpoint(self.hass, mqtt_entry.data.get("broker"))
         broker_port = mqtt_entry.data.get("port")
         broker_username = mqtt_entry.data.get("username", "(No authentication)")
         self.mqtt_entry = mqtt_entry
@@ -77,7 +90,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         # if user_input is not None:
         return self.async_show_menu(
             step_id="choose_entry",
-            menu_options=["fetch_website", "manual"],
+            menu_options=["discover", "fetch_website", "manual"],
             description_placeholders={},
         )
 
@@ -91,24 +104,22 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             if valid:
                 try:
                     _LOGGER.debug(f"Fetching button+ device at {ip}")
-                    api_client = LocalApiClient(
-                        ip, aiohttp_client.async_get_clientsession(self.hass)
-                    )
-                    json_config = await api_client.fetch_config()
-                    device_config: DeviceConfiguration = ModelDetection.model_for_json(
-                        json_config
-                    )
-
-                    self.set_broker(device_config)
-                    self.add_topics(device_config)
-                    self.add_topics_to_buttons(device_config)
-
-                    await api_client.push_config(device_config)
+                    async with async_get_local_client(self.hass, ip) as api_client:
+                        # All transforms are saved with a single configsave, on
+                        # the JSON as fetched so keys the model does not know stay
+                        async with api_client.edit() as device_config:
+                            provision(
+                                device_config,
+                                BrokerSettings.from_mqtt_entry(
+                                    self.mqtt_entry.data, self.broker_endpoint
+                                ),
+                            )
 
                     return self.async_create_entry(
                         title=f"{device_config.name()}",
                         description=f"Base module on {ip} with id {device_config.identifier()}",
-                        data={"config": json_config},
+                        # As provisioned, the drift checks compare the device to it
+                        data={"config": device_config.to_json()},
                     )
 
                 except JSONDecodeError as ex:  # pylint: disable=broad-except
@@ -138,6 +149,69 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             description_placeholders={"ip": ip},
         )
 
+    async def async_step_discover(self, user_input=None):
+        """Handle scanning the local network for Button+ devices."""
+        errors = {}
+        network = self.default_network()
+        if user_input is not None:
+            network = user_input.get("network")
+            try:
+                prefix_length = ipaddress.IPv4Network(network, strict=False).prefixlen
+            except ValueError:
+                errors["base"] = "invalid_network"
+            else:
+                if prefix_length < MIN_PREFIX_LENGTH:
+                    errors["base"] = "network_too_large"
+                else:
+                    devices = await LocalDiscovery().async_scan(network)
+                    _LOGGER.info(f"Found {len(devices)} Button+ devices in {network}")
+                    self.discovered_devices = {
+                        device.ip_address: device for device in devices
+                    }
+                    if devices:
+                        return await self.async_step_pick_device()
+                    errors["base"] = "no_devices_found"
+
+        return self.async_show_form(
+            step_id="discover",
+            data_schema=vol.Schema({vol.Required("network", default=network): str}),
+            errors=errors,
+            description_placeholders={
+                "network": network,
+                "prefix_length": str(MIN_PREFIX_LENGTH),
+            },
+        )
+
+    async def async_step_pick_device(self, user_input=None):
+        """Handle picking one of the discovered Button+ devices."""
+        if user_input is not None:
+            return await self.async_step_manual(
+                {CONF_IP_ADDRESS: user_input[CONF_IP_ADDRESS]}
+            )
+
+        devices = {
+            ip: f"{device.name} ({device.identifier} on {ip})"
+            for ip, device in self.discovered_devices.items()
+        }
+        return self.async_show_form(
+            step_id="pick_device",
+            data_schema=vol.Schema({vol.Required(CONF_IP_ADDRESS): vol.In(devices)}),
+        )
+
+    async def async_step_import(self, import_data):
+        """Handle a device provisioned by the provision_fleet service."""
+        device_config: DeviceConfiguration = ModelDetection.model_for_json(
+            import_data["config"]
+        )
+        await self.async_set_unique_id(device_config.identifier())
+        self._abort_if_unique_id_configured(updates={"config": import_data["config"]})
+
+        return self.async_create_entry(
+            title=f"{device_config.name()}",
+            description=f"Base module on {import_data[CONF_IP_ADDRESS]} with id {device_config.identifier()}",
+            data={"config": import_data["config"]},
+        )
+
     async def async_step_fetch_website(self, user_input=None):
         """Handle fetching the Button+ devices from the website."""
         errors = {}
@@ -171,13 +245,12 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         _LOGGER.debug(
                             f"loaded device from website with id: {device_website_id} and ip {device_ip}"
                         )
-                        device_config = json.loads(device.get("Json"))
-                        device_name = device_config.get("core").get("name")
-                        device_id = device_config.get("info").get("id")
+                        json_config = device.get("Json")
+                        device_config = ModelDetection.model_for(json_config)
                         last_entry = self.async_create_entry(
-                            title=f"{device_name}",
-                            description=f"Base module on {device_ip} with local id {device_id} and website id {device_website_id}",
-                            data=device_config,
+                            title=f"{device_config.name()}",
+                            description=f"Base module on {device_ip} with local id {device_config.identifier()} and website id {device_website_id}",
+                            data={"config": json_config},
                         )
 
                     return last_entry
@@ -233,93 +306,47 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         except ValueError:
             return False
 
-    def set_broker(self, device_config: DeviceConfiguration):
-        mqtt_entry = self.mqtt_entry
-        broker_port = mqtt_entry.data.get("port")
-        broker_username = mqtt_entry.data.get("username", "")
-        broker_password = mqtt_entry.data.get("password", "")
-
-        device_config.set_broker(
-            f"mqtt://{self.broker_endpoint}/",
-            broker_port,
-            broker_username,
-            broker_password,
-        )
-
-    @staticmethod
-    def add_topics(device_config: DeviceConfiguration) -> DeviceConfiguration:
-        device_id = device_config.identifier()
-
-        if device_config.supports_brightness() is False:
-            _LOGGER.info(
-                "Current firmware version doesn't support brightness settings, it must be at least firmware version 1.11"
+    def default_network(self) -> str:
+        # Scan the /24 Home Assistant itself is in
+        try:
+            return str(
+                ipaddress.IPv4Network(f"{self.hass.config.api.host}/24", strict=False)
             )
-            return
+        except (AttributeError, ValueError):
+            return "192.168.1.0/24"
 
-        device_config.add_topic(
-            f"buttonplus/{device_id}/brightness/large",
-            EventType.BRIGHTNESS_LARGE_DISPLAY,
-        )
-        device_config.add_topic(
-            f"buttonplus/{device_id}/brightness/mini", EventType.BRIGHTNESS_MINI_DISPLAY
-        )
-        device_config.add_topic(
-            f"buttonplus/{device_id}/page/status", EventType.PAGE_STATUS
-        )
-        device_config.add_topic(f"buttonplus/{device_id}/page/set", EventType.SET_PAGE)
 
-    @staticmethod
-    def add_topics_to_buttons(device_config: DeviceConfiguration):
-        device_id = device_config.identifier()
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle the options of a Button+ device."""
 
-        active_connectors = [
-            connector.identifier()
-            for connector in device_config.connectors_for(
-                ConnectorType.DISPLAY, ConnectorType.BAR
-            )
-        ]
-
-        # Each button should have a connector, so check if the buttons connector is present, else skip it
-        # Each connector has two buttons, and the *implicit API contract* is that connectors create buttons in
-        # ascending (and sorted) order. So connector 0 has buttons 0 and 1, connector 1 has buttons 2 and 3, etc.
-        #
-        # This means the connector ID is equal to floor(button_id / 2). Button ID's start at 0! So:
-        # button 0 and 1 are on connector 0, button 2 and 3 are on connector 1
-        for button in filter(
-            lambda btn: btn.button_id // 2 in active_connectors,
-            device_config.buttons(),
-        ):
-            # Create topics for button main label
-            button.add_topic(
-                f"buttonplus/{device_id}/button/{button.button_id}/label",
-                EventType.LABEL,
-            )
-
-            # Create topics for button top label
-            button.add_topic(
-                f"buttonplus/{device_id}/button/{button.button_id}/top_label",
-                EventType.TOPLABEL,
-            )
+    def __init__(self, config_entry: config_entries.ConfigEntry):
+        self.config_entry = config_entry
 
-            # Create topics for button click
-            button.add_topic(
-                f"buttonplus/{device_id}/button/{button.button_id}/click",
-                EventType.CLICK,
-                "press",
-            )
+    async def async_step_init(self, user_input=None):
+        """Manage the publish limits and drift checks of the device."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
 
-            # Create topics for button click
-            button.add_topic(
-                f"buttonplus/{device_id}/button/{button.button_id}/long_press",
-                EventType.LONG_PRESS,
-                "press",
-            )
+        options = self.config_entry.options
 
-    def get_mqtt_endpoint(self, endpoint: str) -> str:
-        # Internal add-on is not reachable from the Button+ device, so we use the hass ip
-        if endpoint in self.local_brokers:
-            _LOGGER.debug(
-                f"mqtt host is internal so use {self.hass.config.api.host} instead of {endpoint}"
-            )
-            return self.hass.config.api.host
-        return endpoint
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_PUBLISH_RATE,
+                        default=options.get(CONF_PUBLISH_RATE, DEFAULT_PUBLISH_RATE),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=100)),
+                    vol.Required(
+                        CONF_PUBLISH_BURST,
+                        default=options.get(CONF_PUBLISH_BURST, DEFAULT_PUBLISH_BURST),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=500)),
+                    vol.Required(
+                        CONF_DRIFT_INTERVAL,
+                        default=options.get(
+                            CONF_DRIFT_INTERVAL, DEFAULT_DRIFT_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400)),
+                }
+            ),
+        )
@@ -4,4 +4,13 @@
 # name for the integration.
 DOMAIN = "button_plus"
 MANUFACTURER = "Button+"
+EVENT_BUTTON_PLUS = f"{DOMAIN}_event"
+EVENT_PROVISION_PROGRESS = f"{DOMAIN}_provision_progress"
 SUPPORT_URL = "https://github.com/koenhendriks/ha-button-plus"
+
+CONF_PUBLISH_RATE = "publish_rate"
+CONF_PUBLISH_BURST = "publish_burst"
+DEFAULT_PUBLISH_RATE = 10.0
+DEFAULT_PUBLISH_BURST = 20
+CONF_DRIFT_INTERVAL = "drift_interval"
+DEFAULT_DRIFT_INTERVAL = 300
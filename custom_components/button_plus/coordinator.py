@@ -1,14 +1,23 @@
 import logging
-import re
+import time
 
 from homeassistant.components.button import ButtonEntity
-from homeassistant.components.mqtt import client as mqtt, ReceiveMessage
+from homeassistant.components.mqtt import ReceiveMessage
 from homeassistant.components.number import NumberEntity
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import Context, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .buttonplushub import ButtonPlusHub
 from .const import DOMAIN
+from .latency import (
+    LatencyWatcher,
+    STAGE_DISPATCH,
+    STAGE_MQTT,
+    STAGE_STATE_WRITE,
+)
+from .mqtt_dispatcher import MqttDispatcher
+from .publish_cache import number_payload
+from .topic_router import RouteAction
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,72 +36,99 @@ class ButtonPlusCoordinator(DataUpdateCoordinator):
         )
         self.hub = hub
         self._hass = hass
-        self._mqtt_subscribed_buttons = False
-        self._mqtt_topics = [
-            (f"buttonplus/{hub.hub_id}/button/+/click", self.mqtt_button_callback),
-            (
-                f"buttonplus/{hub.hub_id}/button/+/long_press",
-                self.mqtt_button_long_press_callback,
-            ),
-            (f"buttonplus/{hub.hub_id}/brightness/+", self.mqtt_brightness_callback),
-            (f"buttonplus/{hub.hub_id}/page/+", self.mqtt_page_callback),
-        ]
+        self._handlers = {
+            RouteAction.CLICK: self.mqtt_button_callback,
+            RouteAction.LONG_PRESS: self.mqtt_button_long_press_callback,
+            RouteAction.BRIGHTNESS: self.mqtt_brightness_callback,
+            RouteAction.PAGE: self.mqtt_page_callback,
+            RouteAction.AVAILABILITY: self.mqtt_availability_callback,
+        }
+        self._latency_watcher = LatencyWatcher.async_get(hass)
 
     async def _async_update_data(self):
-        """Create MQTT subscriptions for buttonplus"""
+        """Register this hub with the shared buttonplus MQTT subscription"""
         _LOGGER.debug("Initial data fetch from coordinator")
-        if not self._mqtt_subscribed_buttons:
-            for topic, cb in self._mqtt_topics:
-                self.unsubscribe_mqtt = await mqtt.async_subscribe(
-                    self._hass, topic, cb, 0
-                )
-                _LOGGER.debug(f"MQTT subscribed to {topic}")
+        await MqttDispatcher.async_get(self._hass).async_register(
+            self.hub.hub_id, self.mqtt_message_callback
+        )
 
     @callback
-    async def mqtt_page_callback(self, message: ReceiveMessage):
-        # Handle the message here
-        _LOGGER.debug(f"Received message on topic {message.topic}: {message.payload}")
-        # match = re.search(r"/page/(\w+)", message.topic)
-        # is 'status' or 'set'
-        # page_type = match.group(1)
-
-        # TODO: implement page control
+    async def mqtt_message_callback(self, message: ReceiveMessage):
+        """Route a message of this hub to the handler of its action."""
+        start = time.perf_counter()
+        if message.retain:
+            self.hub.publish_cache.seed(message.topic, message.payload)
+
+        route = self.hub.router.resolve(message.topic)
+        if route is None:
+            _LOGGER.debug("No route for topic %s", message.topic)
+            return
+
+        latency = self.hub.latency
+        latency.record_since(STAGE_MQTT, message.timestamp)
+        latency.record(STAGE_DISPATCH, start)
+        await self._handlers[route.action](route.target, message)
+
+    async def mqtt_availability_callback(self, target, message: ReceiveMessage):
+        _LOGGER.debug(
+            "Received message on topic %s: %s", message.topic, message.payload
+        )
+        self.hub.async_set_online(str(message.payload).lower() == "online")
 
-    @callback
-    async def mqtt_brightness_callback(self, message: ReceiveMessage):
+    async def mqtt_page_callback(self, page_type: str, message: ReceiveMessage):
         # Handle the message here
-        _LOGGER.debug(f"Received message on topic {message.topic}: {message.payload}")
-        match = re.search(r"/brightness/(\w+)", message.topic)
-        brightness_type = match.group(1)
-
-        entity: NumberEntity = self.hub.brightness_entities[brightness_type]
-
+        _LOGGER.debug(
+            "Received message on topic %s: %s", message.topic, message.payload
+        )
+        # page_type is 'status' or 'set', only the device reports its status
+        if page_type != "status":
+            return
+
+        self.hub.async_set_online(True)
+        try:
+            page = int(message.payload)
+        except ValueError:
+            _LOGGER.warning(f"Invalid page {message.payload} on {message.topic}")
+            return
+
+        await self.hub.async_set_page(page)
+
+    async def mqtt_brightness_callback(
+        self, entity: NumberEntity, message: ReceiveMessage
+    ):
+        # Handle the message here
+        _LOGGER.debug(
+            "Received message on topic %s: %s", message.topic, message.payload
+        )
+        # The device changed its brightness, which is what the broker retains now
+        self.hub.publish_cache.seed(message.topic, number_payload(message.payload))
         value = float(message.payload)
         entity._attr_native_value = value
         entity.schedule_update_ha_state()
 
-    @callback
-    async def mqtt_button_callback(self, message: ReceiveMessage):
+    async def mqtt_button_callback(self, entity: ButtonEntity, message: ReceiveMessage):
         # Handle the message here
-        _LOGGER.debug(f"Received message on topic {message.topic}: {message.payload}")
-        match = re.search(r"/(\d+)/click", message.topic)
-        btn_id = int(match.group(1)) if match else None
-
-        entity: ButtonEntity = self.hub.button_entities[str(btn_id)]
-
-        await self.hass.services.async_call(
-            "button", "press", target={"entity_id": entity.entity_id}
+        _LOGGER.debug(
+            "Received message on topic %s: %s", message.topic, message.payload
         )
+        self.hub.async_set_online(True)
+        # Press the resolved entity directly instead of a button.press service call
+        await self._async_click(entity, "single")
 
-    @callback
-    async def mqtt_button_long_press_callback(self, message: ReceiveMessage):
+    async def mqtt_button_long_press_callback(
+        self, entity: ButtonEntity, message: ReceiveMessage
+    ):
         # Handle the message here
-        _LOGGER.debug(f"Received message on topic {message.topic}: {message.payload}")
-        match = re.search(r"/(\d+)/long_press", message.topic)
-        btn_id = int(match.group(1)) if match else None
-
-        entity: ButtonEntity = self.hub.button_entities[str(btn_id)]
-
-        await self.hass.services.async_call(
-            DOMAIN, "long_press", target={"entity_id": entity.entity_id}
+        _LOGGER.debug(
+            "Received message on topic %s: %s", message.topic, message.payload
         )
+        self.hub.async_set_online(True)
+        await self._async_click(entity, "long")
+
+    async def _async_click(self, entity: ButtonEntity, click_type: str) -> None:
+        # Only clicks write a state, so only they measure the state write
+        start = time.perf_counter()
+        context = Context()
+        await entity.async_click(click_type, context)
+        self.hub.latency.record(STAGE_STATE_WRITE, start)
+        self._latency_watcher.async_watch(context.id, self.hub.latency)
@@ -0,0 +1,42 @@
+"""Diagnostics support for Button+."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from . import ButtonPlusHub
+from .const import DOMAIN
+from .drift_monitor import DriftMonitor
+from .template_cache import TemplateCache
+
+TO_REDACT = {"password", "username"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    hub: ButtonPlusHub = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "hub_id": hub.hub_id,
+        "firmware": str(hub.config.firmware_version()),
+        "capabilities": hub.config.capabilities.as_list(),
+        "config": async_redact_data(hub.config.to_dict(), TO_REDACT),
+        "online": hub.online,
+        "latency": hub.latency.as_dict(),
+        "publish_cache": hub.publish_cache.as_dict(),
+        "publish_scheduler": hub.scheduler.as_dict(),
+        "offline_queue": hub.offline_queue.as_dict(),
+        "pages": hub.pages.as_dict(),
+        "config_pushes": {
+            "pushed": hub.client.pushes,
+            "skipped": hub.client.pushes_skipped,
+        },
+        "template_cache": TemplateCache.async_get(hass).as_dict(),
+        "drift_monitor": DriftMonitor.async_get(hass).as_dict(),
+    }
@@ -0,0 +1,188 @@
+"""Notice changes made to the configuration on the Button+ device itself."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .button_plus_api.local_api_client import LocalApiClient
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_DRIFT_MONITOR = f"{DOMAIN}_drift_monitor"
+
+DriftHandler = Callable[[str], Awaitable[None]]
+ReachableHandler = Callable[[bool], None]
+
+
+def canonical_hash(json_config: str) -> str:
+    """Hash of the config independent of key order and whitespace."""
+    canonical = json.dumps(
+        json.loads(json_config), sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def raw_hash(json_config: str) -> str:
+    return hashlib.sha256(json_config.encode()).hexdigest()
+
+
+class DriftWatch:
+    """Periodic check of one device against the config the entry was set up with.
+
+    A device answers with the same bytes as long as nothing changed, so a poll
+    is settled by hashing the response. Only a response that differs from the
+    previous one is canonicalized, and only when that differs from the known
+    config the handler is called, which parses it in full.
+    """
+
+    def __init__(
+        self,
+        monitor: DriftMonitor,
+        client: LocalApiClient,
+        json_config: str,
+        interval: float,
+        on_drift: DriftHandler,
+        on_reachable: Optional[ReachableHandler] = None,
+    ):
+        self._monitor = monitor
+        self._client = client
+        self._interval = interval
+        self._on_drift = on_drift
+        self._on_reachable = on_reachable
+        self._reference_hash = canonical_hash(json_config)
+        self._raw_hash: Optional[str] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @callback
+    def async_start(self) -> None:
+        # Spread the first polls of all devices over the interval
+        self._schedule(random.uniform(0, self._interval))
+
+    @callback
+    def async_stop(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _schedule(self, delay: float) -> None:
+        self._timer = self._monitor.hass.loop.call_later(delay, self._poll)
+
+    @callback
+    def _poll(self) -> None:
+        self._timer = None
+        self._task = self._monitor.hass.async_create_task(self._async_poll())
+
+    async def _async_poll(self) -> None:
+        try:
+            await self.async_check()
+        except Exception as ex:  # pylint: disable=broad-except
+            _LOGGER.error(f"Handling the drift of a device failed: {ex!r}")
+        self._task = None
+        self._schedule(self._interval * random.uniform(0.9, 1.1))
+
+    def _reachable(self, reachable: bool) -> None:
+        if self._on_reachable is not None:
+            self._on_reachable(reachable)
+
+    async def async_check(self) -> bool:
+        """Fetch the config of the device, return whether it drifted."""
+        monitor = self._monitor
+        monitor.polls += 1
+        try:
+            async with monitor.semaphore:
+                json_config = await self._client.fetch_config()
+        except Exception as ex:  # pylint: disable=broad-except
+            monitor.failures += 1
+            _LOGGER.debug(f"Drift check could not fetch the config: {ex!r}")
+            self._reachable(False)
+            return False
+
+        self._reachable(True)
+        current_raw_hash = raw_hash(json_config)
+        if current_raw_hash == self._raw_hash:
+            monitor.unchanged += 1
+            return False
+        self._raw_hash = current_raw_hash
+
+        try:
+            current_hash = canonical_hash(json_config)
+        except ValueError as ex:
+            monitor.failures += 1
+            _LOGGER.debug(f"Drift check got invalid json: {ex!r}")
+            return False
+
+        if current_hash == self._reference_hash:
+            monitor.unchanged += 1
+            return False
+
+        monitor.drifted += 1
+        try:
+            await self._on_drift(json_config)
+        except BaseException:
+            # Not handled, so the next poll reports the drift again
+            self._raw_hash = None
+            raise
+        self._reference_hash = current_hash
+        return True
+
+
+class DriftMonitor:
+    """Drift checks of all devices, sharing a bound on the fetches in flight.
+
+    With the polls of the devices spread over the interval and at most a few
+    fetches running at once, the load on Home Assistant and the network stays
+    flat as more devices are added.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_concurrent: int = 4):
+        self.hass = hass
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.polls = 0
+        self.unchanged = 0
+        self.drifted = 0
+        self.failures = 0
+
+    @staticmethod
+    def async_get(hass: HomeAssistant) -> DriftMonitor:
+        """Return the drift monitor of this Home Assistant instance."""
+        if DATA_DRIFT_MONITOR not in hass.data:
+            hass.data[DATA_DRIFT_MONITOR] = DriftMonitor(hass)
+        return hass.data[DATA_DRIFT_MONITOR]
+
+    @callback
+    def async_track(
+        self,
+        client: LocalApiClient,
+        json_config: str,
+        interval: float,
+        on_drift: DriftHandler,
+        on_reachable: Optional[ReachableHandler] = None,
+    ) -> CALLBACK_TYPE:
+        """Start checking a device, return the callback that stops it.
+
+        ``on_reachable`` is told after every poll whether the device answered,
+        the client already retried before it reports it did not.
+        """
+        watch = DriftWatch(self, client, json_config, interval, on_drift, on_reachable)
+        watch.async_start()
+        return watch.async_stop
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "polls": self.polls,
+            "unchanged": self.unchanged,
+            "drifted": self.drifted,
+            "failures": self.failures,
+        }
@@ -0,0 +1,168 @@
+"""Click-to-action latency tracking for Button+ hubs."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from homeassistant.const import EVENT_CALL_SERVICE, EVENT_STATE_CHANGED
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+DATA_LATENCY_WATCHER = f"{DOMAIN}_latency_watcher"
+
+# Broker client receipt until the coordinator gets the message
+STAGE_MQTT = "mqtt"
+# Coordinator receipt until the routed entity handler starts
+STAGE_DISPATCH = "dispatch"
+# Entity handler start until its state is written
+STAGE_STATE_WRITE = "state_write"
+# State written until a service called by an automation reacting to it has
+# changed the state of its target
+STAGE_SERVICE_CALL = "service_call"
+
+STAGES = (STAGE_MQTT, STAGE_DISPATCH, STAGE_STATE_WRITE, STAGE_SERVICE_CALL)
+
+
+class LatencyHistogram:
+    """Rolling window of the most recent samples, in milliseconds.
+
+    Recording is an append to a bounded deque, so memory stays constant and the
+    cost per sample is negligible. Percentiles are only computed when read.
+    """
+
+    def __init__(self, size: int = 256):
+        self._samples: deque[float] = deque(maxlen=size)
+        self.count = 0
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds * 1000)
+        self.count += 1
+
+    def percentile(self, percent: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        samples = sorted(self._samples)
+        index = min(len(samples) - 1, int(len(samples) * percent / 100))
+        return round(samples[index], 3)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class LatencyTracker:
+    """Latency histograms of one hub, one per stage of the click path."""
+
+    def __init__(self):
+        self.stages: Dict[str, LatencyHistogram] = {
+            stage: LatencyHistogram() for stage in STAGES
+        }
+
+    def record(self, stage: str, start: float) -> float:
+        """Record the time since a ``time.perf_counter()`` start, return now."""
+        now = time.perf_counter()
+        self.stages[stage].record(now - start)
+        return now
+
+    def record_since(self, stage: str, timestamp: Any) -> None:
+        """Record the time since an aware UTC timestamp, as MQTT messages carry.
+
+        Anything else, or a timestamp ahead of our clock, is not recorded.
+        """
+        if not isinstance(timestamp, datetime) or timestamp.tzinfo is None:
+            return
+        seconds = (dt_util.utcnow() - timestamp).total_seconds()
+        if seconds >= 0:
+            self.stages[stage].record(seconds)
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {stage: histogram.as_dict() for stage, histogram in self.stages.items()}
+
+
+class LatencyWatcher:
+    """Measure how long it takes an automation to act on a click.
+
+    Automations triggered by a state change run in a context whose parent is
+    the context the state was written with. The watcher keeps the most recent
+    click contexts and follows the first service call made in a child context.
+    Home Assistant has no event for a finished service call, the entities it
+    acts on write their new state in the context of the call, so the delay is
+    recorded when the first such state is written. Calls that change no state
+    are never recorded. Only a bounded number of contexts is kept around.
+    """
+
+    def __init__(self, hass: HomeAssistant, size: int = 64):
+        self._hass = hass
+        self._size = size
+        self._pending: OrderedDict[str, Tuple[LatencyTracker, float]] = OrderedDict()
+        self._calls: OrderedDict[str, Tuple[LatencyTracker, float]] = OrderedDict()
+        self._unsubscribe: List[CALLBACK_TYPE] = []
+
+    @staticmethod
+    def async_get(hass: HomeAssistant) -> LatencyWatcher:
+        """Return the latency watcher of this Home Assistant instance."""
+        if DATA_LATENCY_WATCHER not in hass.data:
+            hass.data[DATA_LATENCY_WATCHER] = LatencyWatcher(hass)
+        return hass.data[DATA_LATENCY_WATCHER]
+
+    @callback
+    def async_start(self) -> None:
+        if not self._unsubscribe:
+            self._unsubscribe = [
+                self._hass.bus.async_listen(
+                    EVENT_CALL_SERVICE, self._async_service_called, run_immediately=True
+                ),
+                self._hass.bus.async_listen(
+                    EVENT_STATE_CHANGED, self._async_state_changed, run_immediately=True
+                ),
+            ]
+
+    @callback
+    def async_stop(self) -> None:
+        while self._unsubscribe:
+            self._unsubscribe.pop()()
+        self._pending.clear()
+        self._calls.clear()
+
+    def _keep(
+        self,
+        contexts: OrderedDict[str, Tuple[LatencyTracker, float]],
+        context_id: str,
+        pending: Tuple[LatencyTracker, float],
+    ) -> None:
+        contexts[context_id] = pending
+        if len(contexts) > self._size:
+            contexts.popitem(last=False)
+
+    @callback
+    def async_watch(self, context_id: str, tracker: LatencyTracker) -> None:
+        self._keep(self._pending, context_id, (tracker, time.perf_counter()))
+
+    @callback
+    def _async_service_called(self, event: Event) -> None:
+        if not self._pending or event.context.parent_id is None:
+            return
+
+        pending = self._pending.pop(event.context.parent_id, None)
+        if pending is not None:
+            # The click is timed from when its state was written, not from now
+            self._keep(self._calls, event.context.id, pending)
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        if not self._calls:
+            return
+
+        pending = self._calls.pop(event.context.id, None)
+        if pending is not None:
+            tracker, start = pending
+            tracker.record(STAGE_SERVICE_CALL, start)
@@ -10,7 +10,6 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from . import ButtonPlusHub
-from .button_plus_api.connector_type import ConnectorType
 
 from .const import DOMAIN, MANUFACTURER
 
@@ -39,7 +38,6 @@ async def async_setup_entry(
 
 class ButtonPlusLight(LightEntity):
     def __init__(self, btn_id: int, hub: ButtonPlusHub, light_type: str):
-        connectors = hub.config.connectors_for(ConnectorType.DISPLAY, ConnectorType.BAR)
         self._btn_id = btn_id
         self._hub = hub
         self._hub_id = hub.hub_id
@@ -48,7 +46,8 @@ class ButtonPlusLight(LightEntity):
         self.entity_id = f"light.{light_type}_{self._hub_id}_{btn_id}"
         self._attr_name = f"light-{light_type}-{btn_id}"
         self._state = False
-        self._connector = connectors[btn_id // 2]
+        # Each connector has two buttons, so the connector id is btn_id // 2
+        self._connector = hub.config.connector_for(btn_id // 2)
 
     @property
     def is_on(self) -> bool | None:
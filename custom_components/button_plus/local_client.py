@@ -0,0 +1,27 @@
+"""Local API clients of Home Assistant, sharing one push log."""
+
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .button_plus_api.local_api_client import LocalApiClient, PushLog
+from .const import DOMAIN
+
+DATA_PUSH_LOG = f"{DOMAIN}_push_log"
+
+
+def async_get_push_log(hass: HomeAssistant) -> PushLog:
+    """Return the push log of this Home Assistant instance."""
+    if DATA_PUSH_LOG not in hass.data:
+        hass.data[DATA_PUSH_LOG] = PushLog()
+    return hass.data[DATA_PUSH_LOG]
+
+
+def async_get_local_client(hass: HomeAssistant, ip_address: str) -> LocalApiClient:
+    """Return a client for the device on the shared session and push log."""
+    return LocalApiClient(
+        ip_address,
+        async_get_clientsession(hass),
+        push_log=async_get_push_log(hass),
+    )
@@ -0,0 +1,80 @@
+"""Single MQTT subscription shared by all Button+ hubs."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional
+
+from homeassistant.components.mqtt import client as mqtt, ReceiveMessage
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+from .const import DOMAIN
+from .topic_router import TOPIC_ROOT
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_DISPATCHER = f"{DOMAIN}_dispatcher"
+
+MessageHandler = Callable[[ReceiveMessage], Awaitable[None]]
+
+_HUB_ID_START = len(TOPIC_ROOT) + 1
+
+
+class MqttDispatcher:
+    """Fan out one ``buttonplus/#`` subscription to the hub it is meant for.
+
+    The hub id is always the second topic segment, so every message is matched
+    against a single wildcard subscription and then handed to its hub with a
+    dict lookup, no matter how many hubs are set up.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self._hass = hass
+        self._handlers: Dict[str, MessageHandler] = {}
+        self._unsubscribe: Optional[CALLBACK_TYPE] = None
+        # Hubs set up or unloaded at the same time must see the subscription
+        # as it is after a subscribe in flight, or it is made twice or leaks
+        self._subscribe_lock = asyncio.Lock()
+
+    @staticmethod
+    def async_get(hass: HomeAssistant) -> MqttDispatcher:
+        """Return the dispatcher of this Home Assistant instance."""
+        if DATA_DISPATCHER not in hass.data:
+            hass.data[DATA_DISPATCHER] = MqttDispatcher(hass)
+        return hass.data[DATA_DISPATCHER]
+
+    async def async_register(self, hub_id: str, handler: MessageHandler) -> None:
+        async with self._subscribe_lock:
+            if self._unsubscribe is None:
+                topic = f"{TOPIC_ROOT}/#"
+                self._unsubscribe = await mqtt.async_subscribe(
+                    self._hass, topic, self.async_dispatch, 0
+                )
+                _LOGGER.debug(f"MQTT subscribed to {topic}")
+            self._handlers[hub_id] = handler
+
+    async def async_unregister(self, hub_id: str) -> None:
+        async with self._subscribe_lock:
+            self._handlers.pop(hub_id, None)
+
+            if not self._handlers and self._unsubscribe is not None:
+                self._unsubscribe()
+                self._unsubscribe = None
+                _LOGGER.debug(f"MQTT unsubscribed from {TOPIC_ROOT}/#")
+
+    def handler_for(self, topic: str) -> Optional[MessageHandler]:
+        """Return the handler of the hub the topic belongs to."""
+        end = topic.find("/", _HUB_ID_START)
+        if end < 0:
+            return None
+        return self._handlers.get(topic[_HUB_ID_START:end])
+
+    async def async_dispatch(self, message: ReceiveMessage) -> None:
+        handler = self.handler_for(message.topic)
+        if handler is None:
+            return
+        await handler(message)
+
+    def __len__(self) -> int:
+        return len(self._handlers)
@@ -9,11 +9,12 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.components.mqtt import client as mqtt
+from .button_plus_api.capabilities import Capability
 from .button_plus_api.event_type import EventType
 from . import ButtonPlusHub
 
 from .const import DOMAIN
+from .publish_cache import number_payload
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,7 +30,7 @@ async def async_setup_entry(
 
     hub: ButtonPlusHub = hass.data[DOMAIN][config_entry.entry_id]
 
-    if hub.config.supports_brightness() is False:
+    if Capability.BRIGHTNESS not in hub.config.capabilities:
         _LOGGER.info(
             "Current firmware version doesn't support brightness settings, it must be at least firmware version 1.11"
         )
@@ -55,7 +56,7 @@ class ButtonPlusBrightness(NumberEntity):
         self.entity_id = f"brightness.{brightness_type}_{self._hub_id}"
         self._attr_name = f"brightness-{brightness_type}"
         self.event_type = event_type
-        self._topics = hub.config.topics()
+        self._topics = hub.config.topics_for(event_type)
         self._attr_icon = "mdi:television-ambient-light"
         self._attr_unique_id = f"brightness_{brightness_type}-{self._hub_id}"
 
@@ -107,9 +108,7 @@ class ButtonPlusBrightness(NumberEntity):
         _LOGGER.debug(
             f"ButtonPlus brightness update to {label_topic} with new value: {value}"
         )
-        await mqtt.async_publish(
-            hass=self.hass, topic=label_topic, payload=value, qos=0, retain=True
-        )
+        await self._hub.async_publish(label_topic, number_payload(value))
         self._attr_native_value = value
         self.async_write_ha_state()
 
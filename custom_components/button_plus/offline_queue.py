@@ -0,0 +1,42 @@
+"""Outbound publishes held back while a Button+ device is unavailable."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+
+
+class OfflineQueue:
+    """Latest payload per topic, kept while the device is offline.
+
+    Only the newest payload of a topic is kept, so the queue never holds more
+    entries than the device has topics, however many updates come in.
+    """
+
+    def __init__(self):
+        self._pending: Dict[str, Any] = {}
+        self.queued = 0
+        self.flushed = 0
+
+    def put(self, topic: str, payload: Any) -> None:
+        self._pending[topic] = payload
+        self.queued += 1
+
+    def drain(self) -> List[Tuple[str, Any]]:
+        """Return and forget all waiting payloads."""
+        pending = list(self._pending.items())
+        self._pending.clear()
+        self.flushed += len(pending)
+        return pending
+
+    def __contains__(self, topic: str) -> bool:
+        return topic in self._pending
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "depth": len(self._pending),
+            "queued": self.queued,
+            "flushed": self.flushed,
+        }
@@ -0,0 +1,93 @@
+"""Defer publishes for buttons and display items on pages that are not visible."""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .button_plus_api.capabilities import Capability
+from .button_plus_api.event_type import EventType
+from .button_plus_api.model_interface import DeviceConfiguration
+
+
+class PageTracker:
+    """Follow the page shown by a hub.
+
+    Firmware that spreads buttons and display items over pages only renders
+    those of the visible page. Publishes to the labels of a button or to the
+    topics of a display item on another page are held back, one payload per
+    topic, until their page is shown. A topic that is also shown on another
+    page, or by a button on every page, is never held back.
+
+    The page of each topic is looked up once the device first reports its
+    page, nothing is held back before that. So the sections of a lazily
+    parsed configuration are not read when the hub is set up.
+    """
+
+    def __init__(self, pages_by_topic: Callable[[], Dict[str, int]]):
+        self._get_pages_by_topic = pages_by_topic
+        self._pages_by_topic: Optional[Dict[str, int]] = None
+        self._deferred: Dict[int, Dict[str, Any]] = {}
+        self.current_page: Optional[int] = None
+        self.deferred = 0
+        self.merged = 0
+
+    @staticmethod
+    def from_config(config: DeviceConfiguration) -> PageTracker:
+        return PageTracker(partial(PageTracker.pages_by_topic, config))
+
+    @staticmethod
+    def pages_by_topic(config: DeviceConfiguration) -> Dict[str, int]:
+        """Return the page of each topic shown on one page only."""
+        if Capability.PAGES not in config.capabilities:
+            return {}
+
+        # None stands for every page
+        pages_by_topic: Dict[str, Set[Optional[int]]] = {}
+        for button in config.buttons():
+            for topic in button.topics:
+                if topic.event_type in (EventType.LABEL, EventType.TOPLABEL):
+                    pages_by_topic.setdefault(topic.topic, set()).add(button.page)
+        for display in config.displays():
+            for topic in display.topics:
+                pages_by_topic.setdefault(topic.topic, set()).add(display.page)
+
+        return {
+            topic: next(iter(pages))
+            for topic, pages in pages_by_topic.items()
+            if len(pages) == 1 and None not in pages
+        }
+
+    def defer(self, topic: str, payload: Any) -> bool:
+        """Hold the payload back when its item is not on the visible page."""
+        if self.current_page is None:
+            return False
+        page = self._pages_by_topic.get(topic)
+        if page is None or page == self.current_page:
+            return False
+
+        pending = self._deferred.setdefault(page, {})
+        if topic in pending:
+            self.merged += 1
+        else:
+            self.deferred += 1
+        pending[topic] = payload
+        return True
+
+    def set_page(self, page: int) -> List[Tuple[str, Any]]:
+        """Switch to a page, return the payloads that were held back for it."""
+        if self._pages_by_topic is None:
+            self._pages_by_topic = self._get_pages_by_topic()
+        self.current_page = page
+        return list(self._deferred.pop(page, {}).items())
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "current_page": self.current_page,
+            "paged_topics": None
+            if self._pages_by_topic is None
+            else len(self._pages_by_topic),
+            "waiting": sum(len(pending) for pending in self._deferred.values()),
+            "deferred": self.deferred,
+            "merged": self.merged,
+        }
@@ -0,0 +1,231 @@
+"""Configure Button+ devices to talk to the Home Assistant MQTT broker."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from functools import partial
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from homeassistant.core import HomeAssistant
+
+from .button_plus_api.capabilities import Capability
+from .button_plus_api.event_type import EventType
+from .button_plus_api.local_api_client import LocalApiClient
+from .button_plus_api.model_interface import ConnectorType, DeviceConfiguration
+from .const import DOMAIN
+from .local_client import async_get_local_client
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_FLEET_PROVISIONER = f"{DOMAIN}_fleet_provisioner"
+
+# The add-on broker is not reachable from the device, the Home Assistant host is
+LOCAL_BROKERS = ["core-mosquitto", "127.0.0.1", "localhost"]
+
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_SKIPPED = "skipped"
+
+
+class BrokerSettings(NamedTuple):
+    endpoint: str
+    port: int
+    username: str
+    password: str
+
+    @staticmethod
+    def from_mqtt_entry(data, endpoint: str) -> BrokerSettings:
+        return BrokerSettings(
+            endpoint=endpoint,
+            port=data.get("port"),
+            username=data.get("username", ""),
+            password=data.get("password", ""),
+        )
+
+
+def mqtt_endpoint(hass: HomeAssistant, endpoint: str) -> str:
+    if endpoint in LOCAL_BROKERS:
+        _LOGGER.debug(
+            f"mqtt host is internal so use {hass.config.api.host} instead of {endpoint}"
+        )
+        return hass.config.api.host
+    return endpoint
+
+
+def set_broker(device_config: DeviceConfiguration, broker: BrokerSettings) -> None:
+    device_config.set_broker(
+        f"mqtt://{broker.endpoint}/",
+        broker.port,
+        broker.username,
+        broker.password,
+    )
+
+
+def add_topics(device_config: DeviceConfiguration) -> None:
+    device_id = device_config.identifier()
+
+    if Capability.BRIGHTNESS not in device_config.capabilities:
+        _LOGGER.info(
+            "Current firmware version doesn't support brightness settings, it must be at least firmware version 1.11"
+        )
+        return
+
+    device_config.add_topic(
+        f"buttonplus/{device_id}/brightness/large",
+        EventType.BRIGHTNESS_LARGE_DISPLAY,
+    )
+    device_config.add_topic(
+        f"buttonplus/{device_id}/brightness/mini", EventType.BRIGHTNESS_MINI_DISPLAY
+    )
+    device_config.add_topic(
+        f"buttonplus/{device_id}/page/status", EventType.PAGE_STATUS
+    )
+    device_config.add_topic(f"buttonplus/{device_id}/page/set", EventType.SET_PAGE)
+
+
+def add_topics_to_buttons(device_config: DeviceConfiguration) -> None:
+    device_id = device_config.identifier()
+
+    # Each button should have a connector, so only the buttons on a connector that is present get topics.
+    # Each connector has two buttons, and the *implicit API contract* is that connectors create buttons in
+    # ascending (and sorted) order. So connector 0 has buttons 0 and 1, connector 1 has buttons 2 and 3, etc.
+    #
+    # This means the connector ID is equal to floor(button_id / 2). Button ID's start at 0! So:
+    # button 0 and 1 are on connector 0, button 2 and 3 are on connector 1
+    for button in device_config.buttons_for(ConnectorType.DISPLAY, ConnectorType.BAR):
+        # Create topics for button main label
+        button.add_topic(
+            f"buttonplus/{device_id}/button/{button.button_id}/label",
+            EventType.LABEL,
+        )
+
+        # Create topics for button top label
+        button.add_topic(
+            f"buttonplus/{device_id}/button/{button.button_id}/top_label",
+            EventType.TOPLABEL,
+        )
+
+        # Create topics for button click
+        button.add_topic(
+            f"buttonplus/{device_id}/button/{button.button_id}/click",
+            EventType.CLICK,
+            "press",
+        )
+
+        # Create topics for button click
+        button.add_topic(
+            f"buttonplus/{device_id}/button/{button.button_id}/long_press",
+            EventType.LONG_PRESS,
+            "press",
+        )
+
+
+def provision(device_config: DeviceConfiguration, broker: BrokerSettings) -> None:
+    """Apply every transform needed to use the device with this integration."""
+    set_broker(device_config, broker)
+    add_topics(device_config)
+    add_topics_to_buttons(device_config)
+
+
+class ProvisionResult(NamedTuple):
+    ip_address: str
+    status: str
+    identifier: Optional[str] = None
+    name: Optional[str] = None
+    json_config: Optional[str] = None
+    error: Optional[str] = None
+    duration: float = 0.0
+
+
+class FleetProvisioner:
+    """Provision many devices at once.
+
+    Each device is fetched, transformed and saved with a single configsave,
+    with a bounded number of devices being worked on at the same time. A
+    failing device does not stop the others. The provisioner remembers which
+    devices are done, so running it again with the same list only retries the
+    devices that failed or were not reached.
+    """
+
+    def __init__(
+        self,
+        broker: BrokerSettings,
+        client_factory: Callable[[str], LocalApiClient] = LocalApiClient,
+    ):
+        self.broker = broker
+        self._client_factory = client_factory
+        self.results: Dict[str, ProvisionResult] = {}
+
+    @staticmethod
+    def async_get(hass: HomeAssistant, broker: BrokerSettings) -> FleetProvisioner:
+        """Return the provisioner of this Home Assistant instance for the broker."""
+        provisioner = hass.data.get(DATA_FLEET_PROVISIONER)
+        if provisioner is None or provisioner.broker != broker:
+            provisioner = hass.data[DATA_FLEET_PROVISIONER] = FleetProvisioner(
+                broker, partial(async_get_local_client, hass)
+            )
+        return provisioner
+
+    def is_done(self, ip_address: str) -> bool:
+        result = self.results.get(ip_address)
+        return result is not None and result.status == STATUS_DONE
+
+    async def _async_provision_device(self, ip_address: str) -> ProvisionResult:
+        start = time.perf_counter()
+        try:
+            async with self._client_factory(ip_address) as client:
+                async with client.edit() as device_config:
+                    provision(device_config, self.broker)
+        except Exception as ex:  # pylint: disable=broad-except
+            _LOGGER.warning(
+                f"Provisioning Button+ device at {ip_address} failed: {ex!r}"
+            )
+            return ProvisionResult(
+                ip_address,
+                STATUS_FAILED,
+                error=str(ex) or type(ex).__name__,
+                duration=time.perf_counter() - start,
+            )
+
+        return ProvisionResult(
+            ip_address,
+            STATUS_DONE,
+            identifier=device_config.identifier(),
+            name=device_config.name(),
+            json_config=device_config.to_json(),
+            duration=time.perf_counter() - start,
+        )
+
+    async def async_provision(
+        self,
+        ip_addresses: Iterable[str],
+        max_concurrent: int = 8,
+        progress: Optional[Callable[[ProvisionResult, int, int], None]] = None,
+        force: bool = False,
+    ) -> List[ProvisionResult]:
+        """Provision the devices, ``progress`` is called as each one finishes.
+
+        Devices provisioned by an earlier run are skipped unless ``force`` is set.
+        """
+        ip_addresses = list(dict.fromkeys(ip_addresses))
+        semaphore = asyncio.Semaphore(max_concurrent)
+        total = len(ip_addresses)
+        finished = 0
+
+        async def async_run(ip_address: str) -> ProvisionResult:
+            nonlocal finished
+            if not force and self.is_done(ip_address):
+                result = self.results[ip_address]._replace(status=STATUS_SKIPPED)
+            else:
+                async with semaphore:
+                    result = await self._async_provision_device(ip_address)
+                self.results[ip_address] = result
+
+            finished += 1
+            if progress is not None:
+                progress(result, finished, total)
+            return result
+
+        return await asyncio.gather(*(async_run(ip) for ip in ip_addresses))
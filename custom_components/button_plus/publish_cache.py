@@ -0,0 +1,58 @@
+"""Deduplication of retained MQTT publishes."""
+
+from __future__ import annotations
+
+from typing import Any, Dict
+
+
+def number_payload(value: Any) -> str:
+    """Payload of a number as the device sends it, ``50.0`` and ``"50"`` give ``"50"``.
+
+    Home Assistant hands number entities floats, so without this the payload
+    published would never equal the one the device retains.
+    """
+    number = float(value)
+    if number.is_integer():
+        return str(int(number))
+    return str(number)
+
+
+class PublishCache:
+    """Remember the last payload that is retained on each topic of a hub.
+
+    Publishing a payload that the broker already retains makes the device
+    redraw for nothing, so those publishes are skipped. The cache is seeded
+    from the retained messages received at startup and cleared whenever the
+    retained state can no longer be trusted.
+    """
+
+    def __init__(self):
+        self._payloads: Dict[str, str] = {}
+        self.published = 0
+        self.suppressed = 0
+
+    def is_current(self, topic: str, payload: Any) -> bool:
+        """Return True, and count it, when the payload is already retained."""
+        if self._payloads.get(topic) == str(payload):
+            self.suppressed += 1
+            return True
+        return False
+
+    def record(self, topic: str, payload: Any) -> None:
+        """Record a payload that was just published."""
+        self._payloads[topic] = str(payload)
+        self.published += 1
+
+    def seed(self, topic: str, payload: Any) -> None:
+        """Record a payload retained by the broker that we did not publish."""
+        self._payloads[topic] = str(payload)
+
+    def invalidate(self) -> None:
+        self._payloads.clear()
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "topics": len(self._payloads),
+            "published": self.published,
+            "suppressed": self.suppressed,
+        }
@@ -0,0 +1,113 @@
+"""Rate limited publishing to a Button+ device."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+
+Publisher = Callable[[str, Any], Awaitable[None]]
+
+
+class PublishScheduler:
+    """Token bucket for the publishes to one device, coalescing per topic.
+
+    Publishes go out immediately while tokens are available. After that they
+    wait in a queue that holds one payload per topic: a newer payload for a
+    topic that is still waiting replaces the older one, so the device only
+    ever renders the latest value.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, publish: Publisher, rate: float, burst: int
+    ):
+        self._hass = hass
+        self._publish = publish
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._pending: Dict[str, Any] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.sent = 0
+        self.delayed = 0
+        self.merged = 0
+
+    def is_pending(self, topic: str) -> bool:
+        return topic in self._pending
+
+    def discard(self, topic: str) -> None:
+        """Forget the payload waiting for a topic, if any."""
+        self._pending.pop(topic, None)
+
+    async def async_publish(self, topic: str, payload: Any) -> None:
+        if not self._pending:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self.sent += 1
+                await self._publish(topic, payload)
+                return
+
+        if topic in self._pending:
+            self.merged += 1
+        else:
+            self.delayed += 1
+        self._pending[topic] = payload
+        self._schedule()
+
+    @callback
+    def async_take_pending(self) -> List[Tuple[str, Any]]:
+        """Stop draining, return and forget the payloads waiting for a token."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending = list(self._pending.items())
+        self._pending.clear()
+        return pending
+
+    @callback
+    def async_stop(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._pending.clear()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    def _schedule(self) -> None:
+        if self._timer is None:
+            delay = max(0.0, (1 - self._tokens) / self._rate)
+            self._timer = self._hass.loop.call_later(delay, self._drain)
+
+    @callback
+    def _drain(self) -> None:
+        self._timer = None
+        self._refill()
+
+        while self._pending and self._tokens >= 1:
+            topic = next(iter(self._pending))
+            payload = self._pending.pop(topic)
+            self._tokens -= 1
+            self.sent += 1
+            self._hass.async_create_task(self._publish(topic, payload))
+
+        if self._pending:
+            self._schedule()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "rate": self._rate,
+            "burst": self._burst,
+            "queue_depth": len(self._pending),
+            "sent": self.sent,
+            "delayed": self.delayed,
+            "merged": self.merged,
+        }
@@ -0,0 +1,70 @@
+"""Platform for sensor integration."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from . import ButtonPlusHub
+from .const import DOMAIN
+from .latency import STAGES
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Add a latency sensor for each stage of the click path."""
+
+    hub: ButtonPlusHub = hass.data[DOMAIN][config_entry.entry_id]
+
+    _LOGGER.debug(f"Creating latency sensors for {hub.hub_id}")
+    async_add_entities(ButtonPlusLatency(hub, stage) for stage in STAGES)
+
+
+class ButtonPlusLatency(SensorEntity):
+    """95th percentile latency of one stage, disabled unless enabled by the user"""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:timer-outline"
+
+    def __init__(self, hub: ButtonPlusHub, stage: str):
+        self._hub = hub
+        self._hub_id = hub.hub_id
+        self._stage = stage
+        self._histogram = hub.latency.stages[stage]
+        self.entity_id = f"sensor.latency_{stage}_{self._hub_id}"
+        self._attr_name = f"Latency {stage.replace('_', ' ')}"
+        self._attr_unique_id = f"latency_{stage}-{self._hub_id}"
+
+    @property
+    def should_poll(self) -> bool:
+        return True
+
+    @property
+    def native_value(self) -> float | None:
+        return self._histogram.percentile(95)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        return self._histogram.as_dict()
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return information to link this entity with the correct device."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._hub.hub_id)},
+        )
@@ -0,0 +1,179 @@
+"""Services for the Button+ integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, List, Tuple
+
+import voluptuous as vol
+from homeassistant.config_entries import SOURCE_IMPORT
+from homeassistant.const import CONF_IP_ADDRESS
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import DOMAIN, EVENT_PROVISION_PROGRESS
+from .provisioning import (
+    STATUS_DONE,
+    BrokerSettings,
+    FleetProvisioner,
+    ProvisionResult,
+    mqtt_endpoint,
+)
+from .template_cache import TemplateCache
+from .text import ButtonPlusText
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_SET_LABELS = "set_labels"
+SERVICE_PROVISION_FLEET = "provision_fleet"
+
+SET_LABELS_SCHEMA = vol.Schema(
+    {
+        vol.Required("hubs"): {
+            cv.string: {
+                vol.Coerce(int): vol.Schema(
+                    {
+                        vol.Optional("label"): cv.string,
+                        vol.Optional("top_label"): cv.string,
+                    }
+                )
+            }
+        }
+    }
+)
+
+PROVISION_FLEET_SCHEMA = vol.Schema(
+    {
+        vol.Required("devices"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("broker"): cv.string,
+        vol.Optional("max_concurrent", default=8): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=64)
+        ),
+        vol.Optional("force", default=False): cv.boolean,
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Button+ services."""
+
+    async def async_set_labels(call: ServiceCall) -> None:
+        """Update many labels at once.
+
+        Every value is rendered first, then all of them are published
+        concurrently and only then the entity states are written.
+        """
+        templates = TemplateCache.async_get(hass)
+        hubs = {hub.hub_id: hub for hub in hass.data.get(DOMAIN, {}).values()}
+        updates: List[Tuple[ButtonPlusText, Any]] = []
+
+        for hub_id, buttons in call.data["hubs"].items():
+            hub = hubs.get(hub_id)
+            if hub is None:
+                raise ServiceValidationError(f"Unknown Button+ hub '{hub_id}'")
+
+            for button_id, labels in buttons.items():
+                for text_type, entities in (
+                    ("label", hub.label_entities),
+                    ("top_label", hub.top_label_entities),
+                ):
+                    if text_type not in labels:
+                        continue
+
+                    entity = entities.get(str(button_id))
+                    if entity is None:
+                        raise ServiceValidationError(
+                            f"Hub '{hub_id}' has no {text_type} for button {button_id}"
+                        )
+                    updates.append((entity, templates.async_render(labels[text_type])))
+
+        _LOGGER.debug(f"ButtonPlus set_labels updates {len(updates)} labels")
+        await asyncio.gather(
+            *(entity.async_publish_value(value) for entity, value in updates)
+        )
+
+        for entity, value in updates:
+            entity.async_update_value(value)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_LABELS, async_set_labels, schema=SET_LABELS_SCHEMA
+    )
+
+    async def async_provision_fleet(call: ServiceCall) -> ServiceResponse:
+        """Configure many devices for this integration and add them.
+
+        Progress is reported with an event per device. Devices done by an
+        earlier call are skipped, so after a partial failure the same call can
+        be made again to only retry the failed devices.
+        """
+        mqtt_entries = hass.config_entries.async_entries(domain="mqtt")
+        if not mqtt_entries:
+            raise ServiceValidationError("The MQTT integration is not set up")
+
+        mqtt_data = mqtt_entries[0].data
+        endpoint = call.data.get("broker") or mqtt_endpoint(
+            hass, mqtt_data.get("broker")
+        )
+        provisioner = FleetProvisioner.async_get(
+            hass, BrokerSettings.from_mqtt_entry(mqtt_data, endpoint)
+        )
+
+        def progress(result: ProvisionResult, finished: int, total: int) -> None:
+            _LOGGER.info(
+                f"Provisioned {finished}/{total}, {result.ip_address}: {result.status}"
+            )
+            hass.bus.async_fire(
+                EVENT_PROVISION_PROGRESS,
+                {
+                    "ip_address": result.ip_address,
+                    "status": result.status,
+                    "error": result.error,
+                    "finished": finished,
+                    "total": total,
+                },
+            )
+
+        results = await provisioner.async_provision(
+            call.data["devices"],
+            max_concurrent=call.data["max_concurrent"],
+            progress=progress,
+            force=call.data["force"],
+        )
+
+        for result in results:
+            if result.status == STATUS_DONE:
+                await hass.config_entries.flow.async_init(
+                    DOMAIN,
+                    context={"source": SOURCE_IMPORT},
+                    data={
+                        "config": result.json_config,
+                        CONF_IP_ADDRESS: result.ip_address,
+                    },
+                )
+
+        return {
+            "devices": [
+                {
+                    "ip_address": result.ip_address,
+                    "status": result.status,
+                    "identifier": result.identifier,
+                    "error": result.error,
+                }
+                for result in results
+            ]
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROVISION_FLEET,
+        async_provision_fleet,
+        schema=PROVISION_FLEET_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
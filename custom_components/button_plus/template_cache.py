@@ -0,0 +1,68 @@
+"""Compiled template cache shared by all Button+ text entities."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Dict
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import template
+
+from .const import DOMAIN
+
+DATA_TEMPLATE_CACHE = f"{DOMAIN}_template_cache"
+
+
+class TemplateCache:
+    """Bounded LRU of compiled templates, keyed by their source string.
+
+    Automations tend to push the same template to many labels, so the
+    templates are compiled once and shared by every text entity. Values
+    without any template syntax are returned as is.
+    """
+
+    def __init__(self, hass: HomeAssistant, size: int = 128):
+        self._hass = hass
+        self._size = size
+        self._templates: OrderedDict[str, template.Template] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    @staticmethod
+    def async_get(hass: HomeAssistant) -> TemplateCache:
+        """Return the template cache of this Home Assistant instance."""
+        if DATA_TEMPLATE_CACHE not in hass.data:
+            hass.data[DATA_TEMPLATE_CACHE] = TemplateCache(hass)
+        return hass.data[DATA_TEMPLATE_CACHE]
+
+    def async_render(self, value: str) -> Any:
+        if not template.is_template_string(value):
+            self.bypassed += 1
+            return value
+
+        compiled = self._templates.get(value)
+        if compiled is None:
+            self.misses += 1
+            compiled = template.Template(value, self._hass)
+            self._templates[value] = compiled
+            if len(self._templates) > self._size:
+                self._templates.popitem(last=False)
+        else:
+            self.hits += 1
+            self._templates.move_to_end(value)
+
+        return compiled.async_render(parse_result=False)
+
+    def clear(self) -> None:
+        self._templates.clear()
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._templates),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
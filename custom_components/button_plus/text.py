@@ -7,15 +7,14 @@ from typing import Any, List
 
 from homeassistant.components.text import TextEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.components.mqtt import client as mqtt
-from homeassistant.helpers import template
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.device_registry import DeviceInfo
 
-from . import ButtonPlusHub
+from .buttonplushub import ButtonPlusHub
 from .button_plus_api.model_interface import ConnectorType
 from .const import DOMAIN
+from .template_cache import TemplateCache
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,16 +29,7 @@ async def async_setup_entry(
     text_entities: List[ButtonPlusText] = []
     hub: ButtonPlusHub = hass.data[DOMAIN][config_entry.entry_id]
 
-    active_connectors = [
-        connector.identifier()
-        for connector in hub.config.connectors_for(
-            ConnectorType.DISPLAY, ConnectorType.BAR
-        )
-    ]
-
-    buttons = filter(
-        lambda b: b.button_id // 2 in active_connectors, hub.config.buttons()
-    )
+    buttons = hub.config.buttons_for(ConnectorType.DISPLAY, ConnectorType.BAR)
 
     for button in buttons:
         _LOGGER.info(
@@ -63,6 +53,7 @@ class ButtonPlusText(TextEntity):
         self._hub = hub
         self._btn_id = btn_id
         self._text_type = text_type
+        self.label_topic = f"buttonplus/{self._hub_id}/button/{btn_id}/{text_type}"
         self.entity_id = f"text.{text_type}_{self._hub_id}_{btn_id}"
         self._attr_name = f"text-{text_type}-{btn_id}"
         self._attr_native_value = btn_label
@@ -117,21 +108,23 @@ class ButtonPlusText(TextEntity):
 
     async def async_set_value(self, value: str) -> None:
         """Set the text value and publish to mqtt."""
-        parse_value: Any = template.Template(value, self.hass).async_render(
-            parse_result=False
-        )
+        parse_value: Any = TemplateCache.async_get(self.hass).async_render(value)
 
-        label_topic = (
-            f"buttonplus/{self._hub_id}/button/{self._btn_id}/{self._text_type}"
-        )
+        await self.async_publish_value(parse_value)
+        self.async_update_value(parse_value)
+
+    async def async_publish_value(self, value: Any) -> None:
+        """Publish an already rendered value to mqtt."""
         _LOGGER.debug(f"ButtonPlus label update for {self.entity_id}")
         _LOGGER.debug(
-            f"ButtonPlus label update to {label_topic} with new value: {parse_value}"
-        )
-        await mqtt.async_publish(
-            hass=self.hass, topic=label_topic, payload=parse_value, qos=0, retain=True
+            f"ButtonPlus label update to {self.label_topic} with new value: {value}"
         )
-        self._attr_native_value = parse_value
+        await self._hub.async_publish(self.label_topic, value)
+
+    @callback
+    def async_update_value(self, value: Any) -> None:
+        """Write the published value as the state of this entity."""
+        self._attr_native_value = value
         self.async_write_ha_state()
 
 
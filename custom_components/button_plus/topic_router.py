@@ -0,0 +1,53 @@
+"""Precompiled MQTT topic routing for a Button+ hub."""
+
+from __future__ import annotations
+
+from enum import Enum
+from typing import Any, Dict, NamedTuple, Optional
+
+TOPIC_ROOT = "buttonplus"
+
+
+class RouteAction(str, Enum):
+    CLICK = "click"
+    LONG_PRESS = "long_press"
+    BRIGHTNESS = "brightness"
+    PAGE = "page"
+    AVAILABILITY = "availability"
+
+
+class Route(NamedTuple):
+    action: RouteAction
+    target: Any
+
+
+class TopicRouter:
+    """Resolve the MQTT topics of one hub to the entity and action they target.
+
+    All topics a hub reacts to follow the ``buttonplus/{hub_id}/...`` layout and
+    are known as soon as the entities are created, so they are kept in a table
+    keyed on the full topic. Resolving a message is a single dict lookup; no
+    regex matching or id conversion happens per message.
+    """
+
+    def __init__(self, hub_id: str):
+        self._prefix = f"{TOPIC_ROOT}/{hub_id}/"
+        self._routes: Dict[str, Route] = {}
+
+    def topic_for(self, *segments: Any) -> str:
+        """Return the full topic for the segments below the hub prefix."""
+        return self._prefix + "/".join(str(segment) for segment in segments)
+
+    def add_route(self, action: RouteAction, target: Any, *segments: Any) -> str:
+        topic = self.topic_for(*segments)
+        self._routes[topic] = Route(action, target)
+        return topic
+
+    def remove_route(self, *segments: Any) -> None:
+        self._routes.pop(self.topic_for(*segments), None)
+
+    def resolve(self, topic: str) -> Optional[Route]:
+        return self._routes.get(topic)
+
+    def __len__(self) -> int:
+        return len(self._routes)
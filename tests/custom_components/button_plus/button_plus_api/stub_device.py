@@ -0,0 +1,73 @@
+"""Local HTTP stub that behaves like the web server of a Button+ device."""
+
+import asyncio
+import json
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+
+class StubDevice:
+    def __init__(self, config_path="resource/physicalconfig1.12.1.json", host=None):
+        with open(config_path) as file:
+            self.config = json.loads(file.read())
+        self.host = host
+        # Delay before each response, in seconds
+        self.delay = 0.0
+        # Number of GET /config requests answered with a 503 first
+        self.failures = 0
+        # Status returned by POST /configsave
+        self.push_status = 200
+        self.requests = 0
+        self.pushes = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.server = None
+
+    @property
+    def ip_address(self):
+        return f"{self.server.host}:{self.server.port}"
+
+    async def _respond(self, handler):
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return await handler()
+        finally:
+            self.in_flight -= 1
+
+    async def get_config(self, request):
+        async def handler():
+            if self.failures > 0:
+                self.failures -= 1
+                return web.Response(status=503)
+            return web.json_response(self.config)
+
+        return await self._respond(handler)
+
+    async def save_config(self, request):
+        async def handler():
+            if self.push_status != 200:
+                return web.Response(status=self.push_status)
+            body = await request.text()
+            self.pushes.append(body)
+            self.config = json.loads(body)
+            return web.Response(text="OK")
+
+        return await self._respond(handler)
+
+    async def start(self, port=None):
+        app = web.Application()
+        app.router.add_get("/config", self.get_config)
+        app.router.add_post("/configsave", self.save_config)
+        kwargs = {"port": port} if port else {}
+        if self.host:
+            kwargs["host"] = self.host
+        self.server = TestServer(app, **kwargs)
+        await self.server.start_server()
+        return self
+
+    async def stop(self):
+        await self.server.close()
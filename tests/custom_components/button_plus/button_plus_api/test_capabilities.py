@@ -0,0 +1,36 @@
+import json
+
+from custom_components.button_plus.button_plus_api.capabilities import (
+    Capability,
+    capabilities_for,
+    parse_version,
+)
+from custom_components.button_plus.button_plus_api.model_detection import (
+    ModelDetection,
+)
+
+
+def test_capabilities_by_firmware():
+    assert set(capabilities_for("1.07")) == set()
+    assert Capability.BRIGHTNESS in capabilities_for("1.11")
+    assert Capability.PAGES not in capabilities_for("1.11.3")
+    assert capabilities_for("1.12.2").as_list() == ["brightness", "pages"]
+
+
+def test_capabilities_are_shared_per_firmware():
+    assert capabilities_for("1.12.2") is capabilities_for("1.12.2")
+    assert parse_version("1.12.2") is parse_version("1.12.2")
+
+
+def test_configuration_capabilities():
+    with open("resource/physicalconfig1.07.json") as file:
+        config_v1_07 = ModelDetection.model_for_json(file.read())
+    with open("resource/physicalconfig1.12.1.json") as file:
+        data = json.load(file)
+    config_v1_12 = ModelDetection.model_for_json(json.dumps(data))
+
+    assert not config_v1_07.supports_brightness()
+    assert Capability.PAGES not in config_v1_07.capabilities
+    assert config_v1_12.supports_brightness()
+    assert str(config_v1_12.firmware_version()) == "1.12.2"
+    assert config_v1_12.capabilities is capabilities_for("1.12.2")
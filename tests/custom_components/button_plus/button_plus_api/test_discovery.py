@@ -0,0 +1,100 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from custom_components.button_plus.button_plus_api.discovery import LocalDiscovery
+from tests.custom_components.button_plus.button_plus_api.stub_device import (
+    StubDevice,
+)
+
+
+def test_scan_finds_stub_devices():
+    async def run():
+        first = await StubDevice(host="127.0.0.2").start()
+        port = first.server.port
+        devices = [first]
+        for host in ("127.0.0.5", "127.0.0.9"):
+            devices.append(await StubDevice(host=host).start(port=port))
+        for index, device in enumerate(devices):
+            device.config["info"]["id"] = f"btn_{index}"
+
+        # Another web server on the network, it has a /config but is no Button+
+        async def other_config(request):
+            return web.json_response([1, 2])
+
+        other = web.Application()
+        other.router.add_get("/config", other_config)
+        other_server = TestServer(other, host="127.0.0.3", port=port)
+        await other_server.start_server()
+
+        try:
+            discovery = LocalDiscovery(port=port)
+            start = time.perf_counter()
+            found = await discovery.async_scan("127.0.0.0/28")
+            return found, discovery, time.perf_counter() - start
+        finally:
+            await other_server.close()
+            for device in devices:
+                await device.stop()
+
+    found, discovery, duration = asyncio.run(run())
+
+    assert sorted(device.identifier for device in found) == [
+        "btn_0",
+        "btn_1",
+        "btn_2",
+    ]
+    assert found[0].ip_address.startswith("127.0.0.2:")
+    assert found[0].firmware == "1.12.2"
+    assert found[0].config.identifier() == "btn_0"
+    assert discovery.probed == 14
+    assert duration < 5
+
+
+def test_scan_skips_excluded_and_slow_hosts():
+    async def run():
+        device = await StubDevice(host="127.0.0.2").start()
+        slow = await StubDevice(host="127.0.0.3").start(port=device.server.port)
+        slow.delay = 1
+        try:
+            discovery = LocalDiscovery(port=device.server.port, timeout=0.2)
+            return await discovery.async_scan(
+                "127.0.0.0/29", exclude=["127.0.0.2"]
+            ), discovery
+        finally:
+            await device.stop()
+            await slow.stop()
+
+    found, discovery = asyncio.run(run())
+
+    assert found == []
+    assert discovery.probed == 5
+
+
+def test_scan_streams_hosts_through_a_bounded_pool():
+    class CountingDiscovery(LocalDiscovery):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def async_probe(self, session, ip_address):
+            self.probed += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.001)
+            self.in_flight -= 1
+            return None
+
+    discovery = CountingDiscovery(max_concurrent=8)
+    assert asyncio.run(discovery.async_scan("10.0.0.0/22")) == []
+    assert discovery.probed == 1022
+    assert discovery.max_in_flight == 8
+
+
+def test_scan_rejects_networks_wider_than_a_22():
+    discovery = LocalDiscovery()
+    with pytest.raises(ValueError):
+        asyncio.run(discovery.async_scan("10.0.0.0/21"))
+    assert discovery.probed == 0
@@ -0,0 +1,206 @@
+import asyncio
+import json
+
+import aiohttp
+import pytest
+
+from custom_components.button_plus.button_plus_api.local_api_client import (
+    LocalApiClient,
+    PushLog,
+)
+from custom_components.button_plus.button_plus_api.event_type import EventType
+from custom_components.button_plus.button_plus_api.model_v1_12 import (
+    DeviceConfiguration,
+)
+from tests.custom_components.button_plus.button_plus_api.stub_device import (
+    StubDevice,
+)
+
+
+def run_with_device(test, **device_settings):
+    async def run():
+        device = await StubDevice().start()
+        for name, value in device_settings.items():
+            setattr(device, name, value)
+        try:
+            return await test(device)
+        finally:
+            await device.stop()
+
+    return asyncio.run(run())
+
+
+def test_fetch_and_push_config():
+    async def test(device):
+        async with LocalApiClient(device.ip_address) as client:
+            config = DeviceConfiguration.from_dict(
+                json.loads(await client.fetch_config())
+            )
+            assert await client.push_config(config) == "OK"
+        return device
+
+    device = run_with_device(test)
+    assert len(device.pushes) == 1
+
+
+def test_flaky_device_is_retried():
+    async def test(device):
+        async with LocalApiClient(device.ip_address, backoff=0.01) as client:
+            await client.fetch_config()
+        return device
+
+    device = run_with_device(test, failures=2)
+    assert device.requests == 3
+
+
+def test_gives_up_after_retries():
+    async def test(device):
+        async with LocalApiClient(device.ip_address, retries=2, backoff=0.01) as client:
+            with pytest.raises(aiohttp.ClientResponseError):
+                await client.fetch_config()
+        return device
+
+    device = run_with_device(test, failures=10)
+    assert device.requests == 3
+
+
+def test_slow_device_times_out():
+    async def test(device):
+        async with LocalApiClient(
+            device.ip_address, timeout=0.1, retries=1, backoff=0.01
+        ) as client:
+            with pytest.raises(asyncio.TimeoutError):
+                await client.fetch_config()
+
+    run_with_device(test, delay=1)
+
+
+def test_concurrent_requests_are_capped():
+    async def test(device):
+        async with LocalApiClient(device.ip_address, max_concurrent=2) as client:
+            await asyncio.gather(*(client.fetch_config() for _ in range(8)))
+        return device
+
+    device = run_with_device(test, delay=0.02)
+    assert device.requests == 8
+    assert device.max_in_flight == 2
+
+
+def test_shared_session_is_capped_and_left_open():
+    async def test(device):
+        async with aiohttp.ClientSession() as session:
+            async with LocalApiClient(
+                device.ip_address, session, max_concurrent=2
+            ) as client:
+                await asyncio.gather(*(client.fetch_config() for _ in range(8)))
+            assert not session.closed
+        return device
+
+    device = run_with_device(test, delay=0.02)
+    assert device.requests == 8
+    assert device.max_in_flight == 2
+
+
+def test_unchanged_config_is_not_pushed_again():
+    async def test(device):
+        async with LocalApiClient(device.ip_address) as client:
+            config = DeviceConfiguration.from_dict(
+                json.loads(await client.fetch_config())
+            )
+            await client.push_config(config)
+            assert await client.push_config(config) is None
+
+            config.core.name = "Renamed"
+            await client.push_config(config)
+            await client.push_config(config, force=True)
+            return device, client
+
+    device, client = run_with_device(test)
+    assert len(device.pushes) == 3
+    assert client.pushes == 3
+    assert client.pushes_skipped == 1
+
+
+def test_push_log_is_shared_between_clients():
+    async def test(device):
+        push_log = PushLog()
+        async with LocalApiClient(device.ip_address, push_log=push_log) as client:
+            config = DeviceConfiguration.from_dict(
+                json.loads(await client.fetch_config())
+            )
+            await client.push_config(config)
+        async with LocalApiClient(device.ip_address, push_log=push_log) as client:
+            assert await client.push_config(config) is None
+            return device, client
+
+    device, client = run_with_device(test)
+    assert len(device.pushes) == 1
+    assert client.pushes == 1
+    assert client.pushes_skipped == 1
+
+
+def test_edit_without_changes_is_not_pushed():
+    async def test(device):
+        async with LocalApiClient(device.ip_address) as client:
+            async with client.edit() as config:
+                assert config.name() == "btn_4584b8"
+            return device, client
+
+    device, client = run_with_device(test)
+    assert device.pushes == []
+    assert client.pushes_skipped == 1
+
+
+def test_edit_saves_all_changes_at_once():
+    async def test(device):
+        async with LocalApiClient(device.ip_address) as client:
+            async with client.edit() as config:
+                config.set_broker("mqtt://broker/", 1883, "user", "password")
+                config.add_topic("buttonplus/btn_4584b8/page/goto", EventType.SET_PAGE)
+                config.buttons()[0].add_topic(
+                    "buttonplus/btn_4584b8/button/0/press", EventType.CLICK
+                )
+        return device
+
+    device = run_with_device(test)
+    assert len(device.pushes) == 1
+    # The broker of this integration was already set, it is replaced
+    assert len(device.config["mqttbrokers"]) == 2
+    assert device.config["mqttbrokers"][-1]["url"] == "mqtt://broker/"
+    assert device.config["core"]["topics"][-1]["topic"].endswith("/page/goto")
+    assert device.config["mqttbuttons"][0]["topics"][-1]["eventtype"] == 0
+
+
+def test_edit_rolls_back_when_push_fails():
+    async def test(device):
+        async with LocalApiClient(device.ip_address) as client:
+            config = DeviceConfiguration.from_dict(
+                json.loads(await client.fetch_config())
+            )
+            with pytest.raises(aiohttp.ClientResponseError):
+                async with client.edit(config):
+                    config.set_broker("mqtt://broker/", 1883, "user", "password")
+                    config.core.name = "Renamed"
+            return config
+
+    config = run_with_device(test, push_status=500)
+    assert len(config.mqtt_brokers) == 2
+    assert config.name() == "btn_4584b8"
+
+
+def test_edit_rolls_back_without_push_on_error():
+    async def test(device):
+        async with LocalApiClient(device.ip_address) as client:
+            config = DeviceConfiguration.from_dict(
+                json.loads(await client.fetch_config())
+            )
+            topics = config.to_dict()["core"]["topics"]
+            with pytest.raises(ValueError):
+                async with client.edit(config):
+                    config.remove_topic_for(EventType.SET_PAGE)
+                    raise ValueError("Invalid edit")
+            return device, config, topics
+
+    device, config, topics = run_with_device(test)
+    assert device.pushes == []
+    assert config.to_dict()["core"]["topics"] == topics
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 from custom_components.button_plus.button_plus_api.model_detection import ModelDetection
 from custom_components.button_plus.button_plus_api.model_v1_07 import (
@@ -28,3 +30,37 @@ def test_model_for_json_v1_07(json_data_v1_07):
 def test_model_for_json_v1_12(json_data_v1_12):
     device_config = ModelDetection.model_for_json(json_data_v1_12)
     assert isinstance(device_config, DeviceConfiguration_v1_12)
+
+
+def test_model_for_parsed_dict_and_bytes(json_data_v1_07, json_data_v1_12):
+    assert isinstance(
+        ModelDetection.model_for(json.loads(json_data_v1_12)),
+        DeviceConfiguration_v1_12,
+    )
+    assert isinstance(
+        ModelDetection.model_for(json_data_v1_07.encode()), DeviceConfiguration_v1_07
+    )
+
+
+def test_model_for_firmware_picks_the_closest_lower_registration():
+    assert ModelDetection.model_for_firmware("1.07.2") is DeviceConfiguration_v1_07
+    assert ModelDetection.model_for_firmware("1.11") is DeviceConfiguration_v1_07
+    assert ModelDetection.model_for_firmware("1.12.0") is DeviceConfiguration_v1_12
+    assert ModelDetection.model_for_firmware("2.0") is DeviceConfiguration_v1_12
+
+
+def test_register_model_for_newer_firmware():
+    versions = list(ModelDetection._versions)
+    models = list(ModelDetection._models)
+    try:
+
+        @ModelDetection.register("1.13")
+        class DeviceConfiguration_v1_13(DeviceConfiguration_v1_12):
+            pass
+
+        assert ModelDetection.model_for_firmware("1.12.1") is DeviceConfiguration_v1_12
+        assert ModelDetection.model_for_firmware("1.13.1") is DeviceConfiguration_v1_13
+    finally:
+        ModelDetection._versions[:] = versions
+        ModelDetection._models[:] = models
+        ModelDetection.model_for_firmware.cache_clear()
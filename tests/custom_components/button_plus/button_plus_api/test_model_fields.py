@@ -0,0 +1,89 @@
+import pytest
+
+from custom_components.button_plus.button_plus_api.event_type import EventType
+from custom_components.button_plus.button_plus_api.model_fields import (
+    Field,
+    dict_model,
+    invalidate,
+    slots,
+)
+
+
+@dict_model
+class Item:
+    FIELDS = (
+        Field("item_id", "id"),
+        Field("event_type", "eventtype", enum=EventType),
+    )
+    __slots__ = slots(FIELDS)
+
+
+@dict_model
+class Group:
+    FIELDS = (
+        Field("name", "name", fallback="unnamed"),
+        Field("main", "main", model=Item),
+        Field("items", "items", model=Item, many=True, default=(), omit_empty=True),
+    )
+    __slots__ = slots(FIELDS)
+
+
+def test_generated_round_trip():
+    data = {
+        "name": "group",
+        "main": {"id": 1, "eventtype": 0},
+        "items": [{"id": 2, "eventtype": 1}, {"id": 3, "eventtype": 11}],
+    }
+
+    group = Group.from_dict(data)
+
+    assert isinstance(group.main, Item)
+    assert group.main.event_type is EventType.CLICK
+    assert [item.item_id for item in group.items] == [2, 3]
+    assert group.to_dict() == data
+
+
+def test_defaults_fallbacks_and_omitted_keys():
+    group = Group.from_dict({"name": "", "main": {"id": 1, "eventtype": 0}})
+
+    assert group.name == "unnamed"
+    assert group.items == []
+    assert group.to_dict() == {"name": "unnamed", "main": {"id": 1, "eventtype": 0}}
+
+
+def test_unknown_enum_value_raises():
+    with pytest.raises(ValueError):
+        Item.from_dict({"id": 1, "eventtype": 1000})
+
+
+def test_generated_models_have_no_instance_dict():
+    item = Item.from_dict({"id": 1, "eventtype": 0})
+
+    assert not hasattr(item, "__dict__")
+
+
+def test_to_dict_is_cached_until_a_change():
+    group = Group.from_dict(
+        {
+            "name": "group",
+            "main": {"id": 1, "eventtype": 0},
+            "items": [{"id": 2, "eventtype": 1}],
+        }
+    )
+    data = group.to_dict()
+    main = data["main"]
+
+    assert group.to_dict() is data
+
+    # A change to a nested object rebuilds it and the objects containing it
+    group.items[0].event_type = EventType.LONG_PRESS
+    changed = group.to_dict()
+    assert changed is not data
+    assert changed["main"] is main
+    assert changed["items"] == [{"id": 2, "eventtype": EventType.LONG_PRESS}]
+
+    # Changing a list in place needs an explicit invalidate
+    group.items.append(Item.from_dict({"id": 3, "eventtype": 0}))
+    assert group.to_dict() is changed
+    invalidate(group)
+    assert [item["id"] for item in group.to_dict()["items"]] == [2, 3]
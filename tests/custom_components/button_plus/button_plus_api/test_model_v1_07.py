@@ -1,19 +1,28 @@
 import pytest
 import json
 
+from custom_components.button_plus.button_plus_api.connector_type import ConnectorType
 from custom_components.button_plus.button_plus_api.model_v1_07 import (
+    Connector,
     DeviceConfiguration,
+    MqttButton,
+)
+from custom_components.button_plus.button_plus_api.model_view import (
+    DeviceConfiguration as ConfigurationView,
 )
 
 
-def test_model_v1_07_from_to_json_should_be_same():
+@pytest.mark.parametrize(
+    "model", [DeviceConfiguration, ConfigurationView], ids=["model", "view"]
+)
+def test_model_v1_07_from_to_json_should_be_same(model):
     # Load the JSON file
     with open("resource/physicalconfig1.07.json") as file:
         json_string = file.read()
         json_data = json.loads(json_string)
 
     # Parse the JSON data into a DeviceConfiguration object
-    device_config = DeviceConfiguration.from_dict(json_data)
+    device_config = model.from_dict(json_data)
 
     # Serialize the DeviceConfiguration object back into a JSON string
     new_json_string = device_config.to_json()
@@ -49,6 +58,39 @@ def test_buttons(device_config):
     assert buttons[2].topics[0].event_type == 0
 
 
+def button_data(button_id):
+    return {
+        "id": button_id,
+        "label": f"Btn {button_id}",
+        "toplabel": "",
+        "ledcolorfront": 0,
+        "ledcolorwall": 0,
+        "longdelay": 75,
+        "longrepeat": 15,
+        "topics": [],
+    }
+
+
+def test_lookups_follow_changed_lists(device_config):
+    bar = (ConnectorType.BAR,)
+    buttons = device_config.buttons_for(*bar)
+    assert [button.button_id for button in buttons] == list(range(2, 8))
+    assert device_config.connector_for(4) is None
+
+    # Changed in place
+    device_config.info.connectors.append(Connector(4, ConnectorType.BAR))
+    device_config.mqtt_buttons.append(MqttButton.from_dict(button_data(8)))
+    assert device_config.connector_for(4).identifier() == 4
+    assert [button.button_id for button in device_config.buttons_for(*bar)][-1] == 8
+
+    # Replaced
+    device_config.info.connectors = device_config.info.connectors[:2]
+    assert device_config.connector_for(2) is None
+    assert [button.button_id for button in device_config.buttons_for(*bar)] == [2, 3]
+    device_config.mqtt_buttons = device_config.mqtt_buttons[:3]
+    assert [button.button_id for button in device_config.buttons_for(*bar)] == [2]
+
+
 def test_mqttdisplays(device_config):
     mqttdisplays = device_config.mqtt_displays
     assert len(mqttdisplays) == 2
@@ -1,17 +1,28 @@
 from custom_components.button_plus.button_plus_api.model_v1_12 import (
     DeviceConfiguration,
 )
+from custom_components.button_plus.button_plus_api.model_view import (
+    DeviceConfiguration as ConfigurationView,
+)
 import json
 
+import pytest
+
+# Tests going through the model interface only, run against the view as well
+MODELS = pytest.mark.parametrize(
+    "model", [DeviceConfiguration, ConfigurationView], ids=["model", "view"]
+)
+
 
-def test_model_v1_12_from_to_json_should_be_same():
+@MODELS
+def test_model_v1_12_from_to_json_should_be_same(model):
     # Load the JSON file
     with open("resource/physicalconfig1.12.1.json") as file:
         json_string = file.read()
         json_data = json.loads(json_string)
 
     # Parse the JSON data into a DeviceConfiguration object
-    device_config = DeviceConfiguration.from_dict(json_data)
+    device_config = model.from_dict(json_data)
 
     # Serialize the DeviceConfiguration object back into a JSON string
     new_json_string = device_config.to_json()
@@ -92,3 +103,150 @@ def test_model_v1_12():
     assert device_config.mqtt_sensors[0].topic.topic == "button/btn_4584b8/temperature"
     assert device_config.mqtt_sensors[0].topic.payload == ""
     assert device_config.mqtt_sensors[0].topic.event_type == 18
+
+
+@MODELS
+def test_content_hash_ignores_key_order_and_whitespace(model):
+    with open("resource/physicalconfig1.12.1.json") as file:
+        json_string = file.read()
+
+    def reorder(value):
+        if isinstance(value, dict):
+            return {key: reorder(value[key]) for key in reversed(list(value))}
+        if isinstance(value, list):
+            return [reorder(item) for item in value]
+        return value
+
+    # Other key order at every level, other indentation and separators
+    reordered = json.dumps(reorder(json.loads(json_string)), separators=(",", ":"))
+    assert reordered != json_string
+    assert reordered.replace(" ", "") != json_string.replace(" ", "")
+
+    device_config = model.from_dict(json.loads(json_string))
+    same_config = model.from_dict(json.loads(reordered))
+
+    assert device_config.content_hash() == same_config.content_hash()
+
+    same_config.add_topic("buttonplus/btn_4584b8/page/goto", 20)
+    assert device_config.content_hash() != same_config.content_hash()
+
+
+def test_content_hash_does_not_depend_on_sections_read():
+    with open("resource/physicalconfig1.12.1.json") as file:
+        json_data = json.loads(file.read())
+    # A key the model does not know is not kept by a parsed section
+    json_data["mqttbuttons"][0]["i2cs"] = 1
+
+    device_config = DeviceConfiguration.lazy_from_dict(json_data)
+    before = device_config.content_hash()
+    # Hashing leaves the unread section as it came in
+    assert device_config.to_dict()["mqttbuttons"][0]["i2cs"] == 1
+    assert device_config.mqtt_buttons[0].label == "Btn 0"
+    assert device_config.content_hash() == before
+    assert DeviceConfiguration.from_dict(json_data).content_hash() == before
+
+
+def test_model_v1_12_wire_json(monkeypatch):
+    from custom_components.button_plus.button_plus_api import wire_json
+
+    with open("resource/physicalconfig1.12.1.json") as file:
+        json_data = json.loads(file.read())
+
+    device_config = DeviceConfiguration.from_dict(json_data)
+    wire = device_config.to_wire_json()
+
+    assert json.loads(wire) == json_data
+    assert len(wire) < len(device_config.to_json().encode())
+    assert b", " not in wire and b"\n" not in wire
+
+    # Without orjson the standard library gives the same document
+    monkeypatch.setattr(wire_json, "orjson", None)
+    assert json.loads(device_config.to_wire_json()) == json_data
+
+
+def test_model_v1_12_lazy_sections():
+    with open("resource/physicalconfig1.12.1.json") as file:
+        json_data = json.loads(file.read())
+
+    device_config = DeviceConfiguration.lazy_from_dict(json_data)
+
+    # Only info and core are parsed up front
+    assert device_config.identifier() == "btn_4584b8"
+    assert "mqtt_buttons" not in device_config.__dict__
+    assert device_config.to_dict()["mqttbrokers"] is json_data["mqttbrokers"]
+
+    # Reading a section parses it, changes to it are serialized
+    device_config.mqtt_buttons[0].label = "Changed"
+    assert "mqtt_buttons" in device_config.__dict__
+    assert device_config.to_dict()["mqttbuttons"][0]["label"] == "Changed"
+
+    json_data["mqttbuttons"][0]["label"] = "Changed"
+    assert json.loads(device_config.to_json()) == json_data
+
+
+@MODELS
+def test_model_v1_12_indexes(model):
+    from custom_components.button_plus.button_plus_api.connector_type import (
+        ConnectorType,
+    )
+    from custom_components.button_plus.button_plus_api.event_type import EventType
+
+    with open("resource/physicalconfig1.12.1.json") as file:
+        device_config = model.from_dict(json.loads(file.read()))
+
+    assert device_config.connector_for(2).identifier() == 2
+    assert device_config.connector_for(42) is None
+    assert [
+        connector.identifier()
+        for connector in device_config.connectors_for(
+            ConnectorType.DISPLAY, ConnectorType.BAR
+        )
+    ] == [0, 1, 2, 3]
+    assert [
+        button.button_id for button in device_config.buttons_for(ConnectorType.BAR)
+    ] == [2, 3, 4, 5, 6, 7]
+
+    topic_count = len(device_config.topics())
+    assert len(device_config.topics_for(EventType.SET_PAGE)) == 1
+    device_config.add_topic("buttonplus/btn_4584b8/led", EventType.LED)
+    assert [topic.topic for topic in device_config.topics_for(EventType.LED)] == [
+        "buttonplus/btn_4584b8/led"
+    ]
+
+    device_config.remove_topic_for(EventType.LED)
+    device_config.remove_topic_for(EventType.SET_PAGE)
+    assert device_config.topics_for(EventType.LED) == []
+    assert device_config.topics_for(EventType.SET_PAGE) == []
+    assert len(device_config.topics()) == topic_count - 1
+
+
+def test_model_v1_12_topics_index_follows_the_list():
+    from custom_components.button_plus.button_plus_api.event_type import EventType
+
+    with open("resource/physicalconfig1.12.1.json") as file:
+        device_config = DeviceConfiguration.from_dict(json.loads(file.read()))
+    assert device_config.topics_for(EventType.PAGE_STATUS) != []
+
+    # Changes made to the topic list directly are picked up as well
+    device_config.core.topics = []
+    assert device_config.topics_for(EventType.PAGE_STATUS) == []
+
+
+@MODELS
+def test_model_v1_12_button_pages(model):
+    with open("resource/physicalconfig1.12.1.json") as file:
+        json_data = json.loads(file.read())
+    json_data["mqttbuttons"][2]["page"] = 0
+    json_data["mqttbuttons"][4]["page"] = 1
+
+    device_config = model.from_dict(json.loads(json.dumps(json_data)))
+
+    assert [button.page for button in device_config.buttons()][:5] == [
+        None,
+        None,
+        0,
+        None,
+        1,
+    ]
+    # The key stays absent where the device left it out
+    assert json.loads(device_config.to_json()) == json_data
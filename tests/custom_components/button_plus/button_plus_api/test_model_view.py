@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from custom_components.button_plus.button_plus_api.connector_type import (
+    ConnectorType,
+)
+from custom_components.button_plus.button_plus_api.event_type import EventType
+from custom_components.button_plus.button_plus_api.model_detection import ModelDetection
+from custom_components.button_plus.button_plus_api.model_view import (
+    DeviceConfiguration,
+)
+
+
+@pytest.fixture(params=["physicalconfig1.07.json", "physicalconfig1.12.1.json"])
+def json_data(request):
+    with open(f"resource/{request.param}") as file:
+        return json.loads(file.read())
+
+
+def test_view_matches_the_model(json_data):
+    model = ModelDetection.model_for(json.loads(json.dumps(json_data)))
+    view = DeviceConfiguration.from_dict(json_data)
+
+    assert view.identifier() == model.identifier()
+    assert view.name() == model.name()
+    assert view.firmware_version() == model.firmware_version()
+    assert view.capabilities.as_list() == model.capabilities.as_list()
+    assert [c.identifier() for c in view.connectors()] == [
+        c.identifier() for c in model.connectors()
+    ]
+    assert [
+        (b.button_id, b.label, b.top_label)
+        for b in view.buttons_for(ConnectorType.DISPLAY, ConnectorType.BAR)
+    ] == [
+        (b.button_id, b.label, b.top_label)
+        for b in model.buttons_for(ConnectorType.DISPLAY, ConnectorType.BAR)
+    ]
+    assert [(d.label, d.page) for d in view.displays()] == [
+        (d.label, d.page) for d in model.displays()
+    ]
+    assert view.content_hash() == model.content_hash()
+
+
+def test_unknown_keys_survive_edits(json_data):
+    json_data["info"]["i2cs"] = []
+    json_data["core"]["invert"] = True
+    view = DeviceConfiguration.from_dict(json_data)
+
+    view.set_broker("mqtt://10.0.0.2/", 1883, "user", "secret")
+    view.add_topic("buttonplus/test/page/set", EventType.SET_PAGE)
+    button = view.buttons()[0]
+    button.label = "Changed"
+    button.add_topic("buttonplus/test/click", EventType.CLICK, "press")
+
+    # The edits are made in the wrapped dict itself
+    assert view.to_dict() is json_data
+    assert json_data["mqttbuttons"][0]["label"] == "Changed"
+    assert view.topics_for(EventType.SET_PAGE)[-1].topic == "buttonplus/test/page/set"
+
+    wire = json.loads(view.to_wire_json())
+    assert wire["info"]["i2cs"] == []
+    assert wire["core"]["invert"] is True
+    assert wire["mqttbuttons"][0]["topics"][-1]["eventtype"] == EventType.CLICK
+
+    # Parsed by the class model, the same edits lose the unknown keys
+    assert "invert" not in ModelDetection.model_for(wire).to_dict()["core"]
+
+
+def test_restore_from_snapshot(json_data):
+    view = DeviceConfiguration.from_dict(json_data)
+    snapshot = view.snapshot()
+    before = view.content_hash()
+
+    view.buttons()[0].label = "Changed"
+    view.remove_topic_for(EventType.BRIGHTNESS_LARGE_DISPLAY)
+    assert view.content_hash() != before
+
+    view.restore(snapshot)
+    assert view.content_hash() == before
@@ -0,0 +1,39 @@
+"""Minimal Home Assistant core for tests and benchmarks that need a running event bus."""
+
+import logging
+import tempfile
+
+import homeassistant.core  # noqa: F401 - has to be imported before the loader
+from homeassistant import loader
+from homeassistant.config_entries import ConfigEntries
+from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.helpers import (
+    area_registry,
+    device_registry,
+    entity,
+    entity_registry,
+    floor_registry,
+    label_registry,
+    restore_state,
+    translation,
+)
+
+
+async def async_start_hass() -> HomeAssistant:
+    # Silence the warning about loading a custom integration
+    logging.getLogger("homeassistant.loader").setLevel(logging.ERROR)
+
+    hass = HomeAssistant(tempfile.mkdtemp())
+    loader.async_setup(hass)
+    entity.async_setup(hass)
+    translation.async_setup(hass)
+    await area_registry.async_load(hass)
+    await floor_registry.async_load(hass)
+    await label_registry.async_load(hass)
+    await device_registry.async_load(hass)
+    await entity_registry.async_load(hass)
+    await restore_state.async_load(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    hass.set_state(CoreState.running)
+    return hass
@@ -0,0 +1,84 @@
+import asyncio
+import json
+
+from homeassistant.config_entries import ConfigEntry
+
+from custom_components.button_plus import buttonplushub
+from custom_components.button_plus.button_plus_api.model_detection import ModelDetection
+from custom_components.button_plus.buttonplushub import ButtonPlusHub
+from custom_components.button_plus.const import (
+    CONF_PUBLISH_BURST,
+    CONF_PUBLISH_RATE,
+    DOMAIN,
+)
+from tests.custom_components.button_plus.home_assistant import async_start_hass
+
+LABEL = "buttonplus/btn_4584b8/button/{}/label"
+
+
+def run_with_hub(monkeypatch, test):
+    published = []
+
+    async def async_publish(hass, topic, payload, qos, retain):
+        published.append((topic, payload))
+
+    monkeypatch.setattr(buttonplushub.mqtt, "async_publish", async_publish)
+
+    async def run():
+        hass = await async_start_hass()
+        with open("resource/physicalconfig1.12.1.json") as file:
+            json_config = file.read()
+        entry = ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title="Button+",
+            data={"config": json_config},
+            # A token every 0.2s, well apart from the scheduling of the test
+            options={CONF_PUBLISH_RATE: 5, CONF_PUBLISH_BURST: 1},
+            source="user",
+        )
+        # Known to Home Assistant without being set up, as MockConfigEntry does
+        hass.config_entries._entries[entry.entry_id] = entry
+        hub = ButtonPlusHub(
+            hass, ModelDetection.model_for(json.loads(json_config)), entry
+        )
+        try:
+            await test(hub, published)
+        finally:
+            hub.scheduler.async_stop()
+            await hass.async_stop(force=True)
+
+    asyncio.run(run())
+
+
+def test_offline_hub_holds_back_what_waits_for_a_token(monkeypatch):
+    async def test(hub, published):
+        for button in range(3):
+            await hub.async_publish(LABEL.format(button), "Before")
+        assert published == [(LABEL.format(0), "Before")]
+
+        hub.async_set_online(False)
+        await asyncio.sleep(0.5)
+        assert published == [(LABEL.format(0), "Before")]
+        assert len(hub.offline_queue) == 2
+
+    run_with_hub(monkeypatch, test)
+
+
+def test_replay_goes_through_the_rate_limit(monkeypatch):
+    async def test(hub, published):
+        hub.async_set_online(False)
+        for button in range(4):
+            await hub.async_publish(LABEL.format(button), "Queued")
+
+        hub.async_set_online(True)
+        await hub._hass.async_block_till_done()
+        # One token, the rest follows at the publish rate
+        assert len(published) == 1
+        assert hub.scheduler.as_dict()["queue_depth"] == 3
+
+        await asyncio.sleep(1)
+        assert sorted(published) == [(LABEL.format(n), "Queued") for n in range(4)]
+
+    run_with_hub(monkeypatch, test)
@@ -0,0 +1,80 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from homeassistant.const import CONF_IP_ADDRESS
+
+from custom_components.button_plus.config_flow import ConfigFlow
+from custom_components.button_plus.drift_monitor import canonical_hash
+from tests.custom_components.button_plus.button_plus_api.stub_device import (
+    StubDevice,
+)
+from tests.custom_components.button_plus.home_assistant import async_start_hass
+
+
+def run_manual_step(monkeypatch, device_settings=None):
+    # The stub device listens on a port of its own, next to its address
+    monkeypatch.setattr(ConfigFlow, "validate_ip", staticmethod(lambda ip: True))
+
+    async def run():
+        hass = await async_start_hass()
+        device = await StubDevice().start()
+        for name, value in (device_settings or {}).items():
+            setattr(device, name, value)
+        flow = ConfigFlow()
+        flow.hass = hass
+        flow.mqtt_entry = SimpleNamespace(
+            data={"port": 1883, "username": "user", "password": "password"}
+        )
+        flow.broker_endpoint = "192.168.1.2"
+        try:
+            result = await flow.async_step_manual({CONF_IP_ADDRESS: device.ip_address})
+        finally:
+            await device.stop()
+            await hass.async_stop(force=True)
+        return device, result
+
+    return asyncio.run(run())
+
+
+def test_manual_entry_stores_the_provisioned_config(monkeypatch):
+    device, result = run_manual_step(monkeypatch)
+
+    assert result["type"] == "create_entry"
+    assert len(device.pushes) == 1
+    # Otherwise the first drift check reports the provisioning as drift
+    stored = result["data"]["config"]
+    assert canonical_hash(stored) == canonical_hash(json.dumps(device.config))
+    assert json.loads(stored)["mqttbrokers"][-1]["url"] == "mqtt://192.168.1.2/"
+
+
+def test_manual_entry_keeps_keys_the_model_does_not_know(monkeypatch):
+    with open("resource/physicalconfig1.12.1.json") as file:
+        config = json.loads(file.read())
+    config["info"]["i2cs"] = [{"address": 32}]
+    config["core"]["invert"] = True
+    config["mqttbuttons"][0]["invert"] = True
+
+    device, result = run_manual_step(monkeypatch, {"config": config})
+
+    assert result["type"] == "create_entry"
+    for saved in (device.config, json.loads(result["data"]["config"])):
+        assert saved["info"]["i2cs"] == [{"address": 32}]
+        assert saved["core"]["invert"] is True
+        assert saved["mqttbuttons"][0]["invert"] is True
+
+
+def test_discover_rejects_a_network_too_large_to_scan():
+    async def run():
+        hass = await async_start_hass()
+        flow = ConfigFlow()
+        flow.hass = hass
+        try:
+            return await flow.async_step_discover({"network": "10.0.0.0/16"})
+        finally:
+            await hass.async_stop(force=True)
+
+    result = asyncio.run(run())
+
+    assert result["type"] == "form"
+    assert result["errors"] == {"base": "network_too_large"}
@@ -0,0 +1,70 @@
+import asyncio
+from types import SimpleNamespace
+
+from homeassistant.components.mqtt import ReceiveMessage
+from homeassistant.util import dt as dt_util
+
+from custom_components.button_plus.coordinator import ButtonPlusCoordinator
+from custom_components.button_plus.latency import (
+    LatencyTracker,
+    STAGE_DISPATCH,
+    STAGE_MQTT,
+    STAGE_STATE_WRITE,
+)
+from custom_components.button_plus.publish_cache import PublishCache
+from custom_components.button_plus.topic_router import RouteAction, TopicRouter
+from tests.custom_components.button_plus.home_assistant import async_start_hass
+
+
+class FakeButton:
+    def __init__(self):
+        self.clicks = []
+
+    async def async_click(self, click_type, context=None):
+        self.clicks.append(click_type)
+
+
+class FakeNumber:
+    _attr_native_value = None
+
+    def schedule_update_ha_state(self):
+        pass
+
+
+def message(topic, payload="", timestamp=None):
+    return ReceiveMessage(topic, payload, 0, False, "buttonplus/#", timestamp)
+
+
+def test_state_write_is_only_recorded_for_clicks():
+    async def run():
+        hass = await async_start_hass()
+        hub = SimpleNamespace(
+            hub_id="btn_1",
+            router=TopicRouter("btn_1"),
+            latency=LatencyTracker(),
+            publish_cache=PublishCache(),
+            async_set_online=lambda online: None,
+        )
+        button, number = FakeButton(), FakeNumber()
+        click = hub.router.add_route(RouteAction.CLICK, button, "button", 0, "click")
+        brightness = hub.router.add_route(
+            RouteAction.BRIGHTNESS, number, "brightness", "large"
+        )
+        coordinator = ButtonPlusCoordinator(hass, hub)
+
+        await coordinator.mqtt_message_callback(
+            message(click, "press", dt_util.utcnow())
+        )
+        await coordinator.mqtt_message_callback(message(brightness, "50"))
+        await hass.async_stop(force=True)
+        return hub, button, number
+
+    hub, button, number = asyncio.run(run())
+
+    assert button.clicks == ["single"]
+    assert number._attr_native_value == 50
+    stages = hub.latency.stages
+    assert stages[STAGE_DISPATCH].count == 2
+    assert stages[STAGE_STATE_WRITE].count == 1
+    # The brightness message has no timestamp to measure from
+    assert stages[STAGE_MQTT].count == 1
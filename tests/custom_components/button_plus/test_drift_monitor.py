@@ -0,0 +1,197 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from homeassistant.config_entries import ConfigEntry
+
+from custom_components.button_plus import buttonplushub
+from custom_components.button_plus.button_plus_api.local_api_client import (
+    LocalApiClient,
+)
+from custom_components.button_plus.button_plus_api.model_detection import ModelDetection
+from custom_components.button_plus.buttonplushub import ButtonPlusHub
+from custom_components.button_plus.const import DOMAIN
+from custom_components.button_plus.drift_monitor import (
+    DriftMonitor,
+    DriftWatch,
+    canonical_hash,
+)
+from tests.custom_components.button_plus.button_plus_api.stub_device import (
+    StubDevice,
+)
+from tests.custom_components.button_plus.home_assistant import async_start_hass
+
+
+def test_canonical_hash_ignores_formatting():
+    assert canonical_hash('{"b": 1, "a": [1, 2]}') == canonical_hash(
+        '{"a":[1,2],"b":1}'
+    )
+    assert canonical_hash('{"a": 1}') != canonical_hash('{"a": 2}')
+
+
+def run_watch(test, failing=0):
+    drifts = []
+
+    async def on_drift(json_config):
+        drifts.append(json.loads(json_config))
+        if len(drifts) <= failing:
+            raise RuntimeError("Reload failed")
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        hass = SimpleNamespace(loop=loop, async_create_task=loop.create_task)
+        monitor = DriftMonitor(hass)
+        device = await StubDevice().start()
+        client = LocalApiClient(device.ip_address, retries=0)
+        watch = DriftWatch(
+            monitor, client, json.dumps(device.config, indent=4), 60.0, on_drift
+        )
+        try:
+            await test(watch, device)
+        finally:
+            await client.close()
+            await device.stop()
+        return monitor
+
+    monitor = asyncio.run(run())
+    return monitor, drifts
+
+
+def test_unchanged_config_is_no_drift():
+    async def test(watch, device):
+        for _ in range(3):
+            assert await watch.async_check() is False
+
+    monitor, drifts = run_watch(test)
+
+    assert drifts == []
+    assert monitor.polls == 3
+    assert monitor.unchanged == 3
+    assert monitor.drifted == 0
+
+
+def test_changed_config_is_reported_once():
+    async def test(watch, device):
+        assert await watch.async_check() is False
+        device.config["core"]["name"] = "Renamed"
+        assert await watch.async_check() is True
+        assert await watch.async_check() is False
+
+    monitor, drifts = run_watch(test)
+
+    assert [drift["core"]["name"] for drift in drifts] == ["Renamed"]
+    assert monitor.polls == 3
+    assert monitor.unchanged == 2
+    assert monitor.drifted == 1
+    assert monitor.failures == 0
+
+
+def test_drift_is_reported_again_until_handled():
+    async def test(watch, device):
+        device.config["core"]["name"] = "Renamed"
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await watch.async_check()
+        assert await watch.async_check() is True
+        assert await watch.async_check() is False
+
+    monitor, drifts = run_watch(test, failing=2)
+
+    assert [drift["core"]["name"] for drift in drifts] == ["Renamed"] * 3
+    assert monitor.drifted == 3
+
+
+def test_unreachable_device_is_counted():
+    async def test(watch, device):
+        await device.stop()
+        assert await watch.async_check() is False
+
+    monitor, drifts = run_watch(test)
+
+    assert drifts == []
+    assert monitor.polls == 1
+    assert monitor.failures == 1
+
+
+def test_tracking_polls_until_stopped():
+    async def run():
+        loop = asyncio.get_running_loop()
+        hass = SimpleNamespace(loop=loop, async_create_task=loop.create_task)
+        monitor = DriftMonitor(hass)
+        device = await StubDevice().start()
+        client = LocalApiClient(device.ip_address, retries=0)
+        stop = monitor.async_track(client, json.dumps(device.config), 0.01, None)
+        try:
+            while monitor.unchanged < 2:
+                await asyncio.sleep(0.01)
+        finally:
+            stop()
+        polls = monitor.polls
+        await asyncio.sleep(0.05)
+        await client.close()
+        await device.stop()
+        return monitor, polls
+
+    monitor, polls = asyncio.run(asyncio.wait_for(run(), 5))
+
+    assert monitor.polls == polls
+    assert monitor.drifted == 0
+
+
+def test_hub_goes_offline_and_flushes_when_the_device_returns(monkeypatch):
+    published = []
+
+    async def async_publish(hass, topic, payload, qos, retain):
+        published.append((topic, payload))
+
+    monkeypatch.setattr(buttonplushub.mqtt, "async_publish", async_publish)
+
+    async def run():
+        hass = await async_start_hass()
+        device = await StubDevice().start()
+        port = device.server.port
+        entry = ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title="Button+",
+            data={"config": json.dumps(device.config)},
+            source="user",
+        )
+        # Known to Home Assistant without being set up, as MockConfigEntry does
+        hass.config_entries._entries[entry.entry_id] = entry
+        config = ModelDetection.model_for(device.config)
+        hub = ButtonPlusHub(hass, config, entry)
+        client = LocalApiClient(device.ip_address, retries=0)
+        watch = DriftWatch(
+            DriftMonitor(hass),
+            client,
+            entry.data["config"],
+            60.0,
+            None,
+            hub.async_set_online,
+        )
+        try:
+            await device.stop()
+            await watch.async_check()
+            offline = hub.online
+            await hub.async_publish("buttonplus/btn_4584b8/button/0/label", "Queued")
+            queued = list(published)
+
+            device = await StubDevice().start(port=port)
+            await watch.async_check()
+            await hass.async_block_till_done()
+            return offline, queued, hub.online
+        finally:
+            await client.close()
+            await hub.client.close()
+            await device.stop()
+            await hass.async_stop(force=True)
+
+    offline, queued, online = asyncio.run(run())
+
+    assert offline is False
+    assert queued == []
+    assert online is True
+    assert published == [("buttonplus/btn_4584b8/button/0/label", "Queued")]
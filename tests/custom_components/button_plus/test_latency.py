@@ -0,0 +1,99 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from homeassistant.const import EVENT_CALL_SERVICE
+from homeassistant.core import Context
+from homeassistant.util import dt as dt_util
+
+from custom_components.button_plus.latency import (
+    LatencyHistogram,
+    LatencyTracker,
+    LatencyWatcher,
+    STAGE_DISPATCH,
+    STAGE_SERVICE_CALL,
+    STAGES,
+)
+from tests.custom_components.button_plus.home_assistant import async_start_hass
+
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for milliseconds in range(1, 101):
+        histogram.record(milliseconds / 1000)
+
+    assert histogram.percentile(50) == 51
+    assert histogram.percentile(95) == 96
+    assert histogram.percentile(99) == 100
+    assert histogram.as_dict() == {"count": 100, "p50": 51, "p95": 96, "p99": 100}
+
+
+def test_histogram_keeps_a_bounded_window():
+    histogram = LatencyHistogram(size=10)
+    for milliseconds in range(1000):
+        histogram.record(milliseconds / 1000)
+
+    assert histogram.count == 1000
+    assert len(histogram._samples) == 10
+    assert histogram.percentile(50) == 995
+
+
+def test_empty_histogram():
+    assert LatencyHistogram().as_dict() == {
+        "count": 0,
+        "p50": None,
+        "p95": None,
+        "p99": None,
+    }
+
+
+def test_tracker_records_per_stage():
+    tracker = LatencyTracker()
+    start = time.perf_counter()
+
+    now = tracker.record(STAGE_DISPATCH, start)
+
+    assert now >= start
+    assert tracker.stages[STAGE_DISPATCH].count == 1
+    assert set(tracker.as_dict()) == set(STAGES)
+
+
+def test_tracker_records_since_aware_timestamps_only():
+    tracker = LatencyTracker()
+
+    tracker.record_since(STAGE_DISPATCH, dt_util.utcnow() - timedelta(seconds=1))
+    tracker.record_since(STAGE_DISPATCH, datetime.now())
+    tracker.record_since(STAGE_DISPATCH, time.monotonic())
+    tracker.record_since(STAGE_DISPATCH, dt_util.utcnow() + timedelta(seconds=1))
+
+    assert tracker.stages[STAGE_DISPATCH].count == 1
+
+
+def test_watcher_records_when_the_called_service_changed_a_state():
+    async def run():
+        hass = await async_start_hass()
+        tracker = LatencyTracker()
+        watcher = LatencyWatcher(hass)
+        watcher.async_start()
+
+        click = Context()
+        hass.states.async_set("button.btn_1", "pressed", context=click)
+        watcher.async_watch(click.id, tracker)
+
+        # An automation triggered by the click calls a service
+        call = Context(parent_id=click.id)
+        hass.bus.async_fire(EVENT_CALL_SERVICE, {"domain": "light"}, context=call)
+        hass.states.async_set("light.other", "on", context=Context())
+        await asyncio.sleep(0)
+        started = tracker.stages[STAGE_SERVICE_CALL].count
+
+        # The service is done when its target wrote its state
+        hass.states.async_set("light.kitchen", "on", context=call)
+        hass.states.async_set("light.kitchen", "off", context=call)
+        await asyncio.sleep(0)
+
+        watcher.async_stop()
+        await hass.async_stop(force=True)
+        return started, tracker.stages[STAGE_SERVICE_CALL].count
+
+    assert asyncio.run(run()) == (0, 1)
@@ -0,0 +1,106 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.button_plus import mqtt_dispatcher
+from custom_components.button_plus.mqtt_dispatcher import MqttDispatcher
+
+
+@pytest.fixture
+def subscriptions(monkeypatch):
+    subscribed = []
+
+    async def async_subscribe(hass, topic, msg_callback, qos):
+        # Let other registrations run while the subscribe is in flight
+        await asyncio.sleep(0)
+        subscribed.append(topic)
+        return lambda: subscribed.remove(topic)
+
+    monkeypatch.setattr(mqtt_dispatcher.mqtt, "async_subscribe", async_subscribe)
+    return subscribed
+
+
+def test_single_subscription_for_all_hubs(subscriptions):
+    dispatcher = MqttDispatcher(None)
+    received = []
+
+    async def register():
+        for hub_id in ("btn_1", "btn_2", "btn_3"):
+
+            async def handler(message, hub_id=hub_id):
+                received.append((hub_id, message.topic))
+
+            await dispatcher.async_register(hub_id, handler)
+
+    asyncio.run(register())
+    assert subscriptions == ["buttonplus/#"]
+    assert len(dispatcher) == 3
+
+    message = SimpleNamespace(topic="buttonplus/btn_2/button/3/click")
+    asyncio.run(dispatcher.async_dispatch(message))
+    asyncio.run(
+        dispatcher.async_dispatch(SimpleNamespace(topic="buttonplus/unknown/page/set"))
+    )
+    asyncio.run(dispatcher.async_dispatch(SimpleNamespace(topic="buttonplus/btn_2")))
+    assert received == [("btn_2", "buttonplus/btn_2/button/3/click")]
+
+
+def test_unsubscribe_after_last_hub(subscriptions):
+    dispatcher = MqttDispatcher(None)
+
+    async def handler(message):
+        pass
+
+    asyncio.run(dispatcher.async_register("btn_1", handler))
+    asyncio.run(dispatcher.async_register("btn_2", handler))
+
+    asyncio.run(dispatcher.async_unregister("btn_1"))
+    assert subscriptions == ["buttonplus/#"]
+
+    asyncio.run(dispatcher.async_unregister("btn_2"))
+    assert subscriptions == []
+    assert dispatcher.handler_for("buttonplus/btn_2/page/status") is None
+
+
+def test_concurrent_registrations_subscribe_once(subscriptions):
+    dispatcher = MqttDispatcher(None)
+    received = []
+
+    async def handler(message):
+        received.append(message.topic)
+
+    async def register():
+        await asyncio.gather(
+            dispatcher.async_register("btn_1", handler),
+            dispatcher.async_register("btn_2", handler),
+        )
+        await dispatcher.async_dispatch(
+            SimpleNamespace(topic="buttonplus/btn_1/button/0/click")
+        )
+
+    asyncio.run(register())
+    assert subscriptions == ["buttonplus/#"]
+    assert received == ["buttonplus/btn_1/button/0/click"]
+
+    asyncio.run(dispatcher.async_unregister("btn_1"))
+    asyncio.run(dispatcher.async_unregister("btn_2"))
+    assert subscriptions == []
+
+
+def test_unregister_during_subscribe_does_not_leak(subscriptions):
+    dispatcher = MqttDispatcher(None)
+
+    async def handler(message):
+        pass
+
+    async def register_and_unload():
+        register = asyncio.create_task(dispatcher.async_register("btn_1", handler))
+        # The hub is unloaded while its subscribe is still in flight
+        await asyncio.sleep(0)
+        await dispatcher.async_unregister("btn_1")
+        await register
+
+    asyncio.run(register_and_unload())
+    assert subscriptions == []
+    assert len(dispatcher) == 0
@@ -0,0 +1,16 @@
+from custom_components.button_plus.offline_queue import OfflineQueue
+
+
+def test_keeps_latest_payload_per_topic():
+    queue = OfflineQueue()
+    for value in range(100):
+        queue.put("buttonplus/btn_4584b8/button/0/label", value)
+    queue.put("buttonplus/btn_4584b8/brightness/mini", 50)
+
+    assert len(queue) == 2
+    assert queue.drain() == [
+        ("buttonplus/btn_4584b8/button/0/label", 99),
+        ("buttonplus/btn_4584b8/brightness/mini", 50),
+    ]
+    assert len(queue) == 0
+    assert queue.as_dict() == {"depth": 0, "queued": 101, "flushed": 2}
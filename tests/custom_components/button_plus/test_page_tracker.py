@@ -0,0 +1,130 @@
+import json
+
+from custom_components.button_plus.button_plus_api.model_v1_07 import (
+    DeviceConfiguration as DeviceConfiguration_v1_07,
+)
+from custom_components.button_plus.button_plus_api.model_v1_12 import (
+    DeviceConfiguration as DeviceConfiguration_v1_12,
+)
+from custom_components.button_plus.page_tracker import PageTracker
+
+
+def load(path, model):
+    with open(path) as file:
+        return model.from_dict(json.loads(file.read()))
+
+
+def display_item(page, label, topic):
+    return {
+        "x": 0,
+        "y": 0,
+        "boxtype": 0,
+        "fontsize": 2,
+        "align": 1,
+        "width": 50,
+        "round": 0,
+        "label": label,
+        "unit": "",
+        "page": page,
+        "topics": [
+            {"brokerid": "buttonplus", "topic": topic, "payload": "", "eventtype": 15}
+        ],
+    }
+
+
+def paged_config():
+    """The 1.12 fixture with its bar buttons and display items on three pages."""
+    with open("resource/physicalconfig1.12.1.json") as file:
+        data = json.loads(file.read())
+    # The buttons of the display module are shown on every page
+    for button in data["mqttbuttons"][2:4]:
+        button["page"] = 0
+    for button in data["mqttbuttons"][4:]:
+        button["page"] = 1
+    # The clock and temperature of the fixture are on page 0
+    data["mqttdisplays"] += [
+        display_item(1, "Outside", "weather/outside/temperature"),
+        display_item(2, "Power", "energy/power"),
+        # Also shown on page 0, where button 2 is
+        display_item(2, "Kitchen", "buttonplus/btn_4584b8/button/2/label"),
+    ]
+    return data
+
+
+def test_pages_from_config():
+    tracker = PageTracker.from_config(
+        DeviceConfiguration_v1_12.from_dict(paged_config())
+    )
+    label = "buttonplus/btn_4584b8/button/{}/{}"
+
+    tracker.set_page(0)
+    assert not tracker.defer(label.format(0, "label"), "Home")
+    assert not tracker.defer(label.format(2, "label"), "Kitchen")
+    assert not tracker.defer(label.format(3, "top_label"), "Lights")
+    assert not tracker.defer("system/datetime/amsterdam", "12:00")
+    assert tracker.defer(label.format(4, "label"), "Hall")
+    assert tracker.defer(label.format(7, "top_label"), "Blinds")
+    assert tracker.defer("weather/outside/temperature", "12")
+    assert tracker.defer("energy/power", "800")
+    # Clicks are sent by the device, never published to it
+    assert not tracker.defer(label.format(4, "click"), "press")
+
+    assert tracker.set_page(1) == [
+        (label.format(4, "label"), "Hall"),
+        (label.format(7, "top_label"), "Blinds"),
+        ("weather/outside/temperature", "12"),
+    ]
+    assert tracker.defer("system/datetime/amsterdam", "12:01")
+    assert tracker.set_page(2) == [("energy/power", "800")]
+
+    # The fixture as it is has no paged buttons, only its display items
+    tracker = PageTracker.from_config(
+        load("resource/physicalconfig1.12.1.json", DeviceConfiguration_v1_12)
+    )
+    tracker.set_page(0)
+    assert tracker.as_dict()["paged_topics"] == 2
+
+    # Firmware without pages never defers
+    tracker = PageTracker.from_config(
+        load("resource/physicalconfig1.07.json", DeviceConfiguration_v1_07)
+    )
+    tracker.set_page(0)
+    assert tracker.as_dict()["paged_topics"] == 0
+
+
+def test_sections_are_read_once_a_page_is_known():
+    with open("resource/physicalconfig1.12.1.json") as file:
+        config = DeviceConfiguration_v1_12.lazy_from_dict(json.load(file))
+    tracker = PageTracker.from_config(config)
+
+    assert not tracker.defer("weather/outside/temperature", "12")
+    assert tracker.as_dict()["paged_topics"] is None
+    assert "mqtt_buttons" not in config.__dict__
+    assert "mqtt_displays" not in config.__dict__
+
+    tracker.set_page(0)
+    assert tracker.as_dict()["paged_topics"] == 2
+
+
+def test_defer_until_page_is_shown():
+    tracker = PageTracker(lambda: {"display/a": 0, "display/b": 1, "display/c": 1})
+
+    # Nothing is deferred until the device reported its page
+    assert not tracker.defer("display/b", "1")
+
+    assert tracker.set_page(0) == []
+    assert not tracker.defer("display/a", "1")
+    assert not tracker.defer("buttonplus/btn_4584b8/button/0/label", "1")
+    assert tracker.defer("display/b", "1")
+    assert tracker.defer("display/b", "2")
+    assert tracker.defer("display/c", "1")
+
+    assert tracker.as_dict() == {
+        "current_page": 0,
+        "paged_topics": 3,
+        "waiting": 2,
+        "deferred": 2,
+        "merged": 1,
+    }
+    assert tracker.set_page(1) == [("display/b", "2"), ("display/c", "1")]
+    assert tracker.as_dict()["waiting"] == 0
@@ -0,0 +1,108 @@
+import asyncio
+import json
+
+import pytest
+
+from custom_components.button_plus.button_plus_api.model_detection import (
+    ModelDetection,
+)
+from custom_components.button_plus.button_plus_api.model_v1_12 import (
+    DeviceConfiguration,
+)
+from custom_components.button_plus.provisioning import (
+    STATUS_DONE,
+    STATUS_FAILED,
+    STATUS_SKIPPED,
+    BrokerSettings,
+    FleetProvisioner,
+    provision,
+)
+from tests.custom_components.button_plus.button_plus_api.stub_device import (
+    StubDevice,
+)
+
+BROKER = BrokerSettings("192.168.1.2", 1883, "user", "password")
+
+
+def test_provision_adds_broker_and_topics():
+    with open("resource/physicalconfig1.12.1.json") as file:
+        config = DeviceConfiguration.from_dict(json.load(file))
+
+    provision(config, BROKER)
+
+    broker = config.mqtt_brokers[-1]
+    assert broker.url == "mqtt://192.168.1.2/"
+    assert broker.port == 1883
+    assert "buttonplus/btn_4584b8/page/set" in [
+        topic.topic for topic in config.topics()
+    ]
+    assert "buttonplus/btn_4584b8/button/0/click" in [
+        topic.topic for topic in config.buttons()[0].topics
+    ]
+
+
+@pytest.mark.parametrize("view", [False, True])
+def test_provision_again_changes_nothing(view):
+    with open("resource/physicalconfig1.12.1.json") as file:
+        config = ModelDetection.model_for(file.read(), view=view)
+
+    provision(config, BROKER)
+    provisioned = config.content_hash()
+    brokers = len(config.to_dict()["mqttbrokers"])
+
+    provision(config, BrokerSettings("192.168.1.3", 1883, "user", "password"))
+    assert len(config.to_dict()["mqttbrokers"]) == brokers
+    assert config.to_dict()["mqttbrokers"][-1]["url"] == "mqtt://192.168.1.3/"
+
+    provision(config, BROKER)
+    assert config.content_hash() == provisioned
+    topics = [topic.topic for topic in config.buttons()[0].topics]
+    assert len(topics) == len(set(topics))
+
+
+def test_fleet_is_provisioned_and_resumed():
+    async def run():
+        devices = [await StubDevice().start() for _ in range(5)]
+        devices[3].push_status = 500
+        provisioner = FleetProvisioner(BROKER)
+        progress = []
+        try:
+            ip_addresses = [device.ip_address for device in devices]
+            first = await provisioner.async_provision(
+                ip_addresses,
+                max_concurrent=2,
+                progress=lambda result, finished, total: progress.append(
+                    (result.status, finished, total)
+                ),
+            )
+
+            devices[3].push_status = 200
+            second = await provisioner.async_provision(ip_addresses)
+            return devices, first, second, progress
+        finally:
+            for device in devices:
+                await device.stop()
+
+    devices, first, second, progress = asyncio.run(run())
+
+    assert [result.status for result in first] == [
+        STATUS_DONE,
+        STATUS_DONE,
+        STATUS_DONE,
+        STATUS_FAILED,
+        STATUS_DONE,
+    ]
+    assert first[3].error
+    assert [finished for _, finished, _ in progress] == [1, 2, 3, 4, 5]
+    assert all(total == 5 for _, _, total in progress)
+
+    # Only the failed device is provisioned again
+    assert [result.status for result in second] == [
+        STATUS_SKIPPED,
+        STATUS_SKIPPED,
+        STATUS_SKIPPED,
+        STATUS_DONE,
+        STATUS_SKIPPED,
+    ]
+    assert [len(device.pushes) for device in devices] == [1, 1, 1, 1, 1]
+    assert "mqtt://192.168.1.2/" in json.dumps(devices[3].config)
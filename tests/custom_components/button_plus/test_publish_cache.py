@@ -0,0 +1,43 @@
+from custom_components.button_plus.publish_cache import PublishCache, number_payload
+
+TOPIC = "buttonplus/btn_4584b8/button/0/label"
+
+
+def test_suppresses_identical_payload():
+    cache = PublishCache()
+
+    assert not cache.is_current(TOPIC, "Kitchen")
+    cache.record(TOPIC, "Kitchen")
+
+    assert cache.is_current(TOPIC, "Kitchen")
+    assert not cache.is_current(TOPIC, "Hallway")
+    assert cache.as_dict() == {"topics": 1, "published": 1, "suppressed": 1}
+
+
+def test_compares_payloads_as_published():
+    cache = PublishCache()
+    cache.record("buttonplus/btn_4584b8/brightness/mini", 80.0)
+
+    assert cache.is_current("buttonplus/btn_4584b8/brightness/mini", "80.0")
+
+
+def test_seed_and_invalidate():
+    cache = PublishCache()
+    cache.seed(TOPIC, "Kitchen")
+
+    assert cache.is_current(TOPIC, "Kitchen")
+    assert cache.published == 0
+
+    cache.invalidate()
+    assert not cache.is_current(TOPIC, "Kitchen")
+
+
+def test_brightness_from_the_device_matches_the_entity_value():
+    cache = PublishCache()
+    topic = "buttonplus/btn_4584b8/brightness/large"
+    # Retained by the device as an int string, set by Home Assistant as a float
+    cache.seed(topic, number_payload("50"))
+
+    assert cache.is_current(topic, number_payload(50.0))
+    assert not cache.is_current(topic, number_payload(50.5))
+    assert number_payload(50.5) == "50.5"
@@ -0,0 +1,51 @@
+import asyncio
+from types import SimpleNamespace
+
+from custom_components.button_plus.publish_scheduler import PublishScheduler
+
+
+def run_scheduler(rate, burst, publishes, wait=0.0):
+    sent = []
+
+    async def publish(topic, payload):
+        sent.append((topic, payload))
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        hass = SimpleNamespace(loop=loop, async_create_task=loop.create_task)
+        scheduler = PublishScheduler(hass, publish, rate, burst)
+        for topic, payload in publishes:
+            await scheduler.async_publish(topic, payload)
+        depth = scheduler.as_dict()["queue_depth"]
+        await asyncio.sleep(wait)
+        scheduler.async_stop()
+        return scheduler, depth
+
+    scheduler, depth = asyncio.run(run())
+    return scheduler, depth, sent
+
+
+def test_burst_is_sent_immediately():
+    scheduler, depth, sent = run_scheduler(1, 3, [("a", 1), ("b", 1), ("c", 1)])
+
+    assert sent == [("a", 1), ("b", 1), ("c", 1)]
+    assert depth == 0
+    assert scheduler.sent == 3
+
+
+def test_waiting_payloads_are_coalesced_per_topic():
+    publishes = [("a", 1), ("b", 1), ("b", 2), ("c", 1), ("b", 3)]
+    scheduler, depth, sent = run_scheduler(100, 1, publishes, wait=0.05)
+
+    assert depth == 2
+    assert sent == [("a", 1), ("b", 3), ("c", 1)]
+    assert scheduler.delayed == 2
+    assert scheduler.merged == 2
+
+
+def test_stop_drops_waiting_payloads():
+    scheduler, depth, sent = run_scheduler(0.1, 1, [("a", 1), ("b", 1)], wait=0.01)
+
+    assert depth == 1
+    assert sent == [("a", 1)]
+    assert scheduler.as_dict()["queue_depth"] == 0
@@ -0,0 +1,111 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+import voluptuous as vol
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.setup import async_setup_component
+
+from custom_components.button_plus.button_plus_api.model_detection import ModelDetection
+from custom_components.button_plus.const import DOMAIN
+from custom_components.button_plus.services import async_setup_services
+from custom_components.button_plus.text import ButtonPlusLabel, ButtonPlusTopLabel
+from tests.custom_components.button_plus.home_assistant import async_start_hass
+
+HUB_ID = "btn_4584b8"
+
+
+def run_with_hub(test):
+    """Run the test with the services and a hub with labels for buttons 0 and 1."""
+
+    async def run():
+        hass = await async_start_hass()
+        await async_setup_component(hass, "text", {})
+        async_setup_services(hass)
+
+        log = []
+
+        async def async_publish(topic, payload):
+            log.append(("publish", topic, payload))
+
+        with open("resource/physicalconfig1.12.1.json") as file:
+            config = ModelDetection.model_for(json.load(file))
+        hub = SimpleNamespace(
+            hub_id=HUB_ID, config=config, label_entities={}, top_label_entities={}
+        )
+        hub.async_publish = async_publish
+        hass.data[DOMAIN] = {"entry": hub}
+        for button_id in (0, 1):
+            hub.label_entities[str(button_id)] = ButtonPlusLabel(button_id, hub, "")
+            hub.top_label_entities[str(button_id)] = ButtonPlusTopLabel(
+                button_id, hub, ""
+            )
+        await hass.data["text"].async_add_entities(
+            [*hub.label_entities.values(), *hub.top_label_entities.values()]
+        )
+
+        hass.bus.async_listen(
+            EVENT_STATE_CHANGED,
+            lambda event: log.append(("state", event.data["entity_id"])),
+        )
+        try:
+            return await test(hass, log), log
+        finally:
+            await hass.async_stop(force=True)
+
+    return asyncio.run(run())
+
+
+async def set_labels(hass, hubs):
+    await hass.services.async_call(DOMAIN, "set_labels", {"hubs": hubs}, blocking=True)
+
+
+def test_set_labels_publishes_all_then_writes_each_state_once():
+    async def test(hass, log):
+        await set_labels(
+            hass,
+            {
+                HUB_ID: {
+                    0: {"label": "Kitchen", "top_label": "{{ 20 + 1 }}"},
+                    "1": {"label": "Hallway"},
+                }
+            },
+        )
+        await hass.async_block_till_done()
+
+    _, log = run_with_hub(test)
+
+    publishes = [entry for entry in log if entry[0] == "publish"]
+    states = [entry for entry in log if entry[0] == "state"]
+    assert sorted(payload for _, _, payload in publishes) == [
+        "21",
+        "Hallway",
+        "Kitchen",
+    ]
+    # Every publish went out before the first state was written
+    assert log[: len(publishes)] == publishes
+    assert len(states) == len({entity_id for _, entity_id in states}) == 3
+
+
+@pytest.mark.parametrize(
+    ("hubs", "error"),
+    [
+        ({"btn_unknown": {0: {"label": "Kitchen"}}}, ServiceValidationError),
+        # Nothing is published when a later button is unknown
+        (
+            {HUB_ID: {0: {"label": "Kitchen"}, 7: {"label": "Hallway"}}},
+            ServiceValidationError,
+        ),
+        ({HUB_ID: {"first": {"label": "Kitchen"}}}, vol.Invalid),
+        ({HUB_ID: {0: {"color": "red"}}}, vol.Invalid),
+    ],
+)
+def test_set_labels_rejects_invalid_calls(hubs, error):
+    async def test(hass, log):
+        with pytest.raises(error):
+            await set_labels(hass, hubs)
+
+    _, log = run_with_hub(test)
+    assert log == []
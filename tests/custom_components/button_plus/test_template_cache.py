@@ -0,0 +1,44 @@
+import asyncio
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.button_plus.template_cache import TemplateCache
+
+
+def render_all(tmp_path, values, size=128):
+    async def render():
+        cache = TemplateCache(HomeAssistant(str(tmp_path)), size=size)
+        return cache, [cache.async_render(value) for value in values]
+
+    return asyncio.run(render())
+
+
+def test_compiled_template_is_reused(tmp_path):
+    cache, rendered = render_all(tmp_path, ["{{ 1 + 1 }}", "{{ 1 + 1 }}"])
+
+    assert rendered == ["2", "2"]
+    assert cache.as_dict() == {
+        "size": 1,
+        "hits": 1,
+        "misses": 1,
+        "bypassed": 0,
+        "hit_rate": 0.5,
+    }
+
+
+def test_plain_value_skips_templating(tmp_path):
+    cache, rendered = render_all(tmp_path, ["Kitchen"])
+
+    assert rendered == ["Kitchen"]
+    assert cache.bypassed == 1
+    assert cache.as_dict()["size"] == 0
+
+
+def test_least_recently_used_template_is_evicted(tmp_path):
+    cache, rendered = render_all(
+        tmp_path, ["{{ 1 }}", "{{ 2 }}", "{{ 1 }}", "{{ 3 }}", "{{ 2 }}"], size=2
+    )
+
+    assert rendered == ["1", "2", "1", "3", "2"]
+    assert cache.hits == 1
+    assert cache.misses == 4
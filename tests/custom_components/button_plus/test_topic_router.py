@@ -0,0 +1,39 @@
+from custom_components.button_plus.topic_router import RouteAction, TopicRouter
+
+
+def test_resolve_routes_to_target_and_action():
+    router = TopicRouter("btn_4584b8")
+    router.add_route(RouteAction.CLICK, "button-3", "button", 3, "click")
+    router.add_route(RouteAction.LONG_PRESS, "button-3", "button", 3, "long_press")
+    router.add_route(RouteAction.BRIGHTNESS, "mini", "brightness", "mini")
+
+    route = router.resolve("buttonplus/btn_4584b8/button/3/click")
+    assert route.action == RouteAction.CLICK
+    assert route.target == "button-3"
+
+    route = router.resolve("buttonplus/btn_4584b8/button/3/long_press")
+    assert route.action == RouteAction.LONG_PRESS
+
+    route = router.resolve("buttonplus/btn_4584b8/brightness/mini")
+    assert route.action == RouteAction.BRIGHTNESS
+    assert route.target == "mini"
+
+    assert len(router) == 3
+
+
+def test_resolve_unknown_topic():
+    router = TopicRouter("btn_4584b8")
+    router.add_route(RouteAction.CLICK, "button-3", "button", 3, "click")
+
+    assert router.resolve("buttonplus/btn_4584b8/button/4/click") is None
+    assert router.resolve("buttonplus/other_hub/button/3/click") is None
+    assert router.resolve("buttonplus/btn_4584b8/button/3/label") is None
+
+
+def test_remove_route():
+    router = TopicRouter("btn_4584b8")
+    router.add_route(RouteAction.CLICK, "button-3", "button", 3, "click")
+    router.remove_route("button", 3, "click")
+
+    assert router.resolve("buttonplus/btn_4584b8/button/3/click") is None
+    assert len(router) == 0